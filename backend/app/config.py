@@ -15,12 +15,27 @@ class Settings(BaseSettings):
     stripe_secret_key: str = ""
     stripe_webhook_secret: str = ""
     stripe_price_advisory: str = ""  # Price ID for $300 advisory session
+    stripe_timeout_seconds: float = 10.0  # Per request, on the shared HTTP pool
+    stripe_max_network_retries: int = 2  # Retried with idempotency keys
+
+    # Opt-in webhook outbox: acknowledge Stripe webhooks once stored and run
+    # the handlers in background workers with retries (requires migration 009)
+    webhook_outbox_enabled: bool = False
+    webhook_workers: int = 2
+    webhook_claim_batch_size: int = 10
+    webhook_poll_seconds: float = 5.0  # Idle poll for events stored by other processes
+    webhook_lease_seconds: int = 120  # A claimed event is reclaimable after this
+    webhook_max_attempts: int = 8  # Then the event is marked failed
+    webhook_backoff_base_seconds: float = 10.0  # Doubles per attempt...
+    webhook_backoff_max_seconds: float = 3600.0  # ...up to this
+    webhook_seen_filter_size: int = 10000  # Recent event IDs kept to short-circuit replays
 
     # Frontend URL (environment-specific for Stripe redirects)
     frontend_url: str = "https://taotang.io"
 
     # App settings
     debug: bool = False
+    stage_timing_log: bool = False  # Log per-stage pipeline timings
     cors_origins: list[str] = [
         "http://localhost:3000",
         "http://localhost:5173",
@@ -32,6 +47,13 @@ class Settings(BaseSettings):
     # Gate configuration (can be tuned without code changes)
     gate_min_context_length: int = 100
     gate_min_budget_threshold: str = "10k_25k"  # Minimum budget to pass gate
+    gate_rules_path: str = ""  # Optional JSON rules file; published when its rules_version changes
+    gate_rules_poll_seconds: float = 30.0
+
+    # Rate limiting (sliding windows; backend: "memory" or a registered shared backend)
+    rate_limit_backend: str = "memory"
+    rate_limit_email_per_day: int = 3
+    rate_limit_ip_per_hour: int = 10
 
     # Versioning
     form_version: str = "1.0.0"
@@ -51,11 +73,91 @@ class Settings(BaseSettings):
         "zoho.com",
     ]
 
+    # Operator endpoints (/api/admin/*, X-Admin-Token header); disabled when empty
+    admin_api_token: str = ""
+
+    # Outbound HTTP pool (shared by Supabase, Stripe and Gemini)
+    http2_enabled: bool = True
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 60.0
+    http_max_connections_per_host: int = 20
+    http_timeout_seconds: float = 15.0
+    http_warm_on_startup: bool = True
+
     # AI Assistant (Gemini)
+    llm_provider: str = "gemini"  # "gemini" or "fake" (offline load testing)
     gemini_api_key: str = ""
     gemini_model: str = "gemini-3-flash-preview"  # Latest Gemini 3 Flash model
     ai_max_questions: int = 3
     ai_session_ttl_minutes: int = 30
+    # Opt-in write-through cache of active sessions/turns; single worker only
+    # (with several workers, resume/keepalive reads could see stale state)
+    ai_session_cache_enabled: bool = False
+    ai_session_cache_size: int = 1000
+    ai_llm_timeout_seconds: float = 6.0  # Per-call deadline; on expiry use fallbacks
+    # Opt-in: fire a duplicate request after this many seconds and take the
+    # first answer (up to 2x model spend on slow calls); 0 = no hedging
+    ai_llm_hedge_delay_seconds: float = 0.0
+    ai_speculative_question: bool = True  # Draft first question while the LLM checks triggers
+    ai_combined_analysis: bool = True  # Detect triggers and draft first question in one LLM call
+    # Opt-in: up to ai_prefetch_max_options extra speculative LLM calls per
+    # single_choice turn (lower answer latency at extra model spend)
+    ai_prefetch_enabled: bool = False
+    ai_prefetch_max_options: int = 3
+    # Plan a session's follow-up questions in one background call, stored on
+    # ai_sessions.question_plan (requires migration 005)
+    ai_question_plan: bool = False
+    ai_question_plan_timeout_seconds: float = 20.0
+
+    # Fake LLM provider (llm_provider="fake"); see app/services/llm_provider.py
+    llm_fake_latency: str = "lognormal:800,0.4"  # fixed:MS | uniform:MIN,MAX | lognormal:MEDIAN,SIGMA
+    llm_fake_error_rate: float = 0.0
+    llm_fake_malformed_rate: float = 0.0  # Share of responses that aren't valid JSON
+    llm_fake_responses_path: str = ""  # JSON file of canned responses by request kind
+    llm_fake_seed: int = 0
+
+    # Gemini circuit breaker (rolling window of recent calls)
+    ai_breaker_enabled: bool = True
+    ai_breaker_window: int = 20
+    ai_breaker_min_calls: int = 5
+    ai_breaker_error_rate: float = 0.5  # Open at this error rate...
+    ai_breaker_p95_ratio: float = 0.9  # ...or this p95 latency, as a share of ai_llm_timeout_seconds
+    ai_breaker_open_seconds: float = 30.0  # Cool-down before a probe call
+
+    # Micro-batched trigger detection: forms submitted within the window
+    # share one Gemini call (falls back to single calls if unparseable).
+    # Takes precedence over ai_combined_analysis: with batching on, triggers
+    # and the first question are requested separately
+    ai_trigger_batching: bool = False
+    ai_trigger_batch_window_ms: int = 50
+    ai_trigger_batch_max_size: int = 8
+
+    # LLM response cache (in-process LRU + optional SQLite file that survives restarts)
+    ai_llm_cache_enabled: bool = True
+    ai_llm_cache_size: int = 2000
+    ai_llm_cache_ttl_seconds: int = 7 * 24 * 60 * 60
+    ai_llm_cache_path: str = ""  # e.g. "/var/cache/intake/llm_cache.sqlite3"; empty = memory only
+
+    # Precomputed question bank (built by scripts/build_question_bank.py); empty = disabled
+    ai_question_bank_path: str = ""
+
+    # Opt-in expiry sweeper: closes abandoned sessions past expires_at
+    # (requires migration 007); runs every interval in bounded batches, 0 = disabled
+    ai_session_sweep_interval_seconds: float = 0.0
+    ai_session_sweep_batch_size: int = 500
+    ai_session_sweep_max_batches: int = 20  # Per run; the rest waits for the next run
+
+    # Opt-in: keep keepalives in memory and write expires_at in one batch per
+    # interval (requires migration 008); keep well below the session TTL
+    ai_keepalive_batching: bool = False
+    ai_keepalive_flush_seconds: float = 60.0
+
+    # Async analysis mode: acknowledge /api/intake immediately and run
+    # trigger detection + first question in a bounded background worker
+    ai_async_analysis: bool = False
+    ai_analysis_concurrency: int = 4
+    ai_analysis_queue_size: int = 100
 
     class Config:
         env_file = "../.env.local"  # Relative to backend/
@@ -1,11 +1,27 @@
 """FastAPI application entry point."""
 
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
-from app.routers import ai_clarify, checkout, intake, stripe_webhooks
+from app.routers import admin, ai_clarify, checkout, intake, stripe_webhooks
+from app.services.ai_assistant import get_ai_assistant
+from app.services.analysis_worker import get_analysis_worker
+from app.services.gate import get_gate_engine, watch_gate_rules
+from app.services.http_pool import (
+    STRIPE_API_BASE,
+    close_http_pool,
+    get_http_pool,
+)
+from app.services.rate_limit import get_rate_limiter
+from app.services.seen_events import get_seen_event_filter
+from app.services.session_keepalive import get_session_keepalive
+from app.services.session_sweeper import get_session_sweeper
+from app.services.stripe_client import close_stripe_client, get_stripe_client
+from app.services.supabase import close_supabase_service
+from app.services.webhook_outbox import get_webhook_outbox
 
 
 @asynccontextmanager
@@ -14,9 +30,68 @@ async def lifespan(app: FastAPI):
     # Startup: verify settings are loadable
     settings = get_settings()
     print(f"Starting app with form_version={settings.form_version}")
+
+    # Open the shared outbound HTTP pool and build the Stripe client on it
+    pool = get_http_pool()
+    get_stripe_client()
+
+    # Build the AI assistant (and its Gemini client) now, not on first request
+    get_ai_assistant()
+
+    # Compile the gate rules now; pick up newly published versions at runtime
+    get_gate_engine()
+    rules_watcher = None
+    if settings.gate_rules_path:
+        rules_watcher = asyncio.create_task(
+            watch_gate_rules(settings.gate_rules_path, settings.gate_rules_poll_seconds),
+            name="gate_rules_watcher",
+        )
+
+    # Seed rate-limit counters from recent submissions (cold start only)
+    await get_rate_limiter().ensure_seeded()
+
+    # Background AI analysis workers (async analysis mode)
+    if settings.ai_async_analysis:
+        get_analysis_worker().start()
+
+    # Write coalesced session keepalives in batches
+    if settings.ai_keepalive_batching:
+        get_session_keepalive().start()
+
+    # Expire abandoned AI sessions in the background
+    if settings.ai_session_sweep_interval_seconds > 0:
+        get_session_sweeper().start()
+
+    # Remember recently stored Stripe events so replays skip the database
+    try:
+        await get_seen_event_filter().load_recent()
+    except Exception as e:
+        print(f"Seen-event filter warm-up failed: {e}")
+
+    # Process stored Stripe webhooks in the background
+    if settings.webhook_outbox_enabled:
+        webhook_outbox = get_webhook_outbox()
+        stripe_webhooks.register_handlers(webhook_outbox)
+        webhook_outbox.start()
+
+    if settings.http_warm_on_startup:
+        warm_urls = [f"{settings.supabase_url}/rest/v1/"]
+        if settings.stripe_secret_key:
+            warm_urls.append(STRIPE_API_BASE)
+        await pool.warm(warm_urls)
+
     yield
     # Shutdown
     print("Shutting down...")
+    if rules_watcher is not None:
+        rules_watcher.cancel()
+    await get_webhook_outbox().stop()
+    await get_analysis_worker().stop()
+    await get_session_sweeper().stop()
+    await get_session_keepalive().stop()
+    close_stripe_client()
+    close_supabase_service()
+    await close_http_pool()
 
 
 def create_app() -> FastAPI:
@@ -44,6 +119,7 @@ def create_app() -> FastAPI:
     app.include_router(ai_clarify.router)
     app.include_router(checkout.router)
     app.include_router(stripe_webhooks.router)
+    app.include_router(admin.router)
 
     return app
 
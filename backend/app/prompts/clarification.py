@@ -2,8 +2,9 @@
 
 These prompts are used with Gemini 2.0 Flash for:
 1. Trigger detection (contradictions, budget/scope mismatch)
-2. Question generation (clarifying questions)
-3. Intelligence gathering (optional post-qualification questions)
+2. Question generation (clarifying questions, or a whole-session plan)
+3. Combined analysis (1 + first question of 2 in a single call)
+4. Intelligence gathering (optional post-qualification questions)
 """
 
 # ============================================================================
@@ -68,6 +69,52 @@ Respond with JSON:
 If no issues detected, return: {{"has_issues": false, "issues": []}}"""
 
 
+# Batched variant: several submissions in one call (see Settings.ai_trigger_batching)
+TRIGGER_DETECTION_BATCH_FORM = """### Form {form_id}
+- Name: {name}
+- Role: {role_title}
+- Is Decision Maker: {is_decision_maker}
+- Service Type: {service_type}
+- Timeline: {timeline}
+- Budget Range: {budget_range}
+- Access Model: {access_model}
+
+**Project Description:**
+{context_raw}"""
+
+
+TRIGGER_DETECTION_BATCH_USER = """Analyze each of these {count} intake form submissions for contradictions or budget/scope mismatches.
+Judge every form independently; never compare forms with each other.
+
+{forms}
+
+**Budget Reference:**
+- under_10k: Small tasks, quick fixes, simple audits
+- 10k_25k: Basic features, prototype improvements
+- 25k_50k: Production deployments, comprehensive audits
+- over_50k: Enterprise systems, complex integrations
+
+Respond with JSON containing exactly one result per form:
+{{
+  "results": [
+    {{
+      "form_id": <the form number>,
+      "has_issues": true/false,
+      "issues": [
+        {{
+          "type": "contradiction" or "budget_scope_mismatch",
+          "field": "field_name that needs clarification or null",
+          "description": "Brief explanation of the issue",
+          "confidence": 0.0 to 1.0
+        }}
+      ]
+    }}
+  ]
+}}
+
+For a form with no issues, use: {{"form_id": <n>, "has_issues": false, "issues": []}}"""
+
+
 # ============================================================================
 # QUESTION GENERATION PROMPTS
 # ============================================================================
@@ -133,6 +180,191 @@ Respond with JSON:
 For single_choice, provide 3-5 options. For text, omit options array."""
 
 
+# ============================================================================
+# QUESTION PLAN PROMPTS (whole session planned in one call)
+# ============================================================================
+
+QUESTION_PLAN_SYSTEM = """You are an AI assistant helping qualify consulting leads for a premium MLE/AI practice.
+
+Plan the follow-up clarifying questions for a whole session, branching on the user's answers.
+Every question in the plan follows the same rules:
+
+1. **ONE question per turn** - the most determinative one for that branch
+2. **Direct enum mapping** - options must map to exact form field values
+3. **Neutral framing** - never accuse the user of inconsistency
+4. **Concise** - question text under 100 characters
+5. **Never re-ask** a field that an earlier answer on the same branch already resolved
+
+Question priorities (ask in this order):
+1. Budget clarification (affects qualification directly)
+2. Access model clarification (affects qualification)
+3. Service type clarification (affects routing)
+4. Context clarification (if very sparse)
+
+For budget questions, always use these exact options:
+- "under_10k" → "Under $10,000"
+- "10k_25k" → "$10,000 - $25,000"
+- "25k_50k" → "$25,000 - $50,000"
+- "over_50k" → "Over $50,000"
+- "keep_current" → "Keep my current selection"
+
+Output JSON only."""
+
+
+QUESTION_PLAN_USER = """Plan the rest of this clarification session.
+
+**Current Form State:**
+{form_state}
+
+**Issues to Resolve:**
+{issues}
+
+**First Question (already asked):**
+{first_question}
+
+The session allows {max_questions} questions in total, so any path may add at most {follow_up_depth} more question(s).
+
+For each answer, give the follow-up question to ask if the form would still need clarification after that answer
+(apply the chosen option's maps_to_field/maps_to_value to the form state). Key follow-ups by the option "value";
+for a text or confirmation question use "*" for any answer. Use null when no further question is needed.
+
+Respond with JSON:
+{{
+  "next": {{
+    "<option value or *>": {{
+      "question": {{
+        "question_text": "The question to ask (under 100 chars)",
+        "question_type": "single_choice" or "text" or "confirmation",
+        "question_purpose": "Brief explanation shown to user (optional, under 50 chars)",
+        "options": [
+          {{
+            "value": "unique_id",
+            "label": "Display text",
+            "maps_to_field": "form_field_name or null",
+            "maps_to_value": "the exact enum value to set"
+          }}
+        ],
+        "target_field": "form field this resolves"
+      }},
+      "next": {{ "...follow-ups of this question, same shape..." }}
+    }}
+  }}
+}}"""
+
+
+# ============================================================================
+# COMBINED ANALYSIS PROMPTS (trigger detection + first question in one call)
+# ============================================================================
+
+COMBINED_ANALYSIS_SYSTEM = """You are an AI assistant qualifying client intake forms for a premium MLE/AI consulting practice.
+
+You do two things in one response:
+
+A. Detect issues that need clarification BEFORE routing the lead:
+   1. **CONTRADICTION**: Conflict between structured answers and free-text description
+      - Example: access_model="remote_access" but context mentions "on-premise only"
+      - Example: timeline="urgent" but context says "just exploring options"
+   2. **BUDGET_SCOPE_MISMATCH**: Project complexity exceeds stated budget
+      - Example: Building a production RAG system with budget under $10k
+      - Consider: production deployment, multi-system integration, enterprise scale → typically requires $25k+
+   Only flag issues with confidence >= 0.7. Do NOT flag ambiguity (already detected
+   by rules and listed as known issues). Be conservative: if uncertain, do not flag.
+
+B. If there is anything to clarify (known issues or issues you flagged), write the FIRST
+   clarifying question:
+   1. **ONE question** - the most determinative one
+   2. **Direct enum mapping** - options must map to exact form field values
+   3. **Neutral framing** - never accuse the user of inconsistency
+   4. **Concise** - question text under 100 characters
+   5. **Options when possible** - easier for user than free text
+   Priorities: budget, then access model, then service type, then context.
+   For budget questions, always use these exact options:
+   - "under_10k" → "Under $10,000"
+   - "10k_25k" → "$10,000 - $25,000"
+   - "25k_50k" → "$25,000 - $50,000"
+   - "over_50k" → "Over $50,000"
+   - "keep_current" → "Keep my current selection"
+
+Output JSON only, matching the response schema."""
+
+
+COMBINED_ANALYSIS_USER = """Analyze this intake form submission and, if clarification is needed, write the first question:
+
+**Form Data:**
+- Name: {name}
+- Role: {role_title}
+- Is Decision Maker: {is_decision_maker}
+- Service Type: {service_type}
+- Timeline: {timeline}
+- Budget Range: {budget_range}
+- Access Model: {access_model}
+
+**Project Description:**
+{context_raw}
+
+**Known Issues (from rule-based checks):**
+{known_issues}
+
+**Budget Reference:**
+- under_10k: Small tasks, quick fixes, simple audits
+- 10k_25k: Basic features, prototype improvements
+- 25k_50k: Production deployments, comprehensive audits
+- over_50k: Enterprise systems, complex integrations
+
+The session allows up to {max_questions} questions.
+
+Set "first_question" to null only if there are no known issues and you flagged none."""
+
+
+# Gemini response_schema for COMBINED_ANALYSIS_USER (OpenAPI subset)
+COMBINED_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "has_issues": {"type": "boolean"},
+        "issues": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "type": {"type": "string", "enum": ["contradiction", "budget_scope_mismatch"]},
+                    "field": {"type": "string", "nullable": True},
+                    "description": {"type": "string"},
+                    "confidence": {"type": "number"},
+                },
+                "required": ["type", "description", "confidence"],
+            },
+        },
+        "first_question": {
+            "type": "object",
+            "nullable": True,
+            "properties": {
+                "question_text": {"type": "string"},
+                "question_type": {"type": "string", "enum": ["single_choice", "text", "confirmation"]},
+                "question_purpose": {"type": "string", "nullable": True},
+                "options": {
+                    "type": "array",
+                    "nullable": True,
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "value": {"type": "string"},
+                            "label": {"type": "string"},
+                            "description": {"type": "string", "nullable": True},
+                            "maps_to_field": {"type": "string", "nullable": True},
+                            "maps_to_value": {"type": "string", "nullable": True},
+                        },
+                        "required": ["value", "label"],
+                    },
+                },
+                "target_field": {"type": "string", "nullable": True},
+            },
+            "required": ["question_text", "question_type"],
+        },
+    },
+    "required": ["has_issues", "issues", "first_question"],
+}
+
+
 # ============================================================================
 # INTELLIGENCE GATHERING PROMPTS
 # ============================================================================
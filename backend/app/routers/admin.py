@@ -0,0 +1,59 @@
+"""Operator endpoints (require the admin token)."""
+
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, status
+
+from app.config import get_settings
+from app.services.ai_assistant import get_ai_assistant
+from app.services.gate import get_gate_engine
+from app.services.llm_cache import get_llm_cache
+from app.services.seen_events import get_seen_event_filter
+from app.services.session_keepalive import get_session_keepalive
+from app.services.session_sweeper import get_session_sweeper
+from app.services.webhook_outbox import get_webhook_outbox
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+def _require_admin(token: Optional[str]) -> None:
+    """Reject requests without the configured admin token.
+
+    Admin endpoints are disabled (404) while admin_api_token is unset.
+    """
+    expected = get_settings().admin_api_token
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not token or not hmac.compare_digest(token, expected):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid admin token")
+
+
+@router.get("/stats")
+async def get_stats(x_admin_token: str = Header(None, alias="x-admin-token")):
+    """Runtime stats of the background components and caches.
+
+    Includes the gate rules version and LLM cache, circuit breaker, session
+    cache, keepalive, sweeper, webhook outbox and seen-event filter stats.
+    """
+    _require_admin(x_admin_token)
+
+    stats = {"gate_rules_version": get_gate_engine().rules.version}
+    if get_settings().ai_llm_cache_enabled:
+        stats["llm_cache"] = get_llm_cache().stats.as_dict()
+    ai_service = get_ai_assistant()
+    if ai_service.breaker is not None:
+        stats["llm_circuit"] = ai_service.breaker.snapshot()
+    if ai_service.session_cache is not None:
+        stats["session_cache"] = ai_service.session_cache.stats()
+    keepalive = get_session_keepalive()
+    if keepalive.running:
+        stats["session_keepalive"] = keepalive.stats()
+    sweeper = get_session_sweeper()
+    if sweeper.running:
+        stats["session_sweeper"] = sweeper.stats()
+    webhook_outbox = get_webhook_outbox()
+    if webhook_outbox.running:
+        stats["webhook_outbox"] = webhook_outbox.stats()
+    stats["seen_webhook_events"] = get_seen_event_filter().stats()
+    return stats
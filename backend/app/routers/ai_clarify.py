@@ -3,12 +3,15 @@
 from fastapi import APIRouter, HTTPException, status
 
 from app.schemas.ai_assistant import (
+    AIAnalysisStatusResponse,
     AISessionStateResponse,
     AITurnResponse,
     ClarifyAnswerRequest,
     SessionKeepAliveRequest,
 )
 from app.services.ai_assistant import get_ai_assistant
+from app.services.analysis_worker import get_analysis_worker
+from app.services.session_keepalive import get_session_keepalive
 
 router = APIRouter(prefix="/api/intake", tags=["ai-clarify"])
 
@@ -60,6 +63,35 @@ async def submit_clarification_answer(request: ClarifyAnswerRequest) -> AITurnRe
         )
 
 
+@router.get("/analysis/{inquiry_id}", response_model=AIAnalysisStatusResponse)
+async def get_analysis_status(inquiry_id: str) -> AIAnalysisStatusResponse:
+    """Get the result of a background submission analysis.
+
+    Used in async analysis mode, where /api/intake returns a provisional
+    routing with analysis_pending=True. Poll until status is "complete"
+    (or "failed", in which case the provisional routing stands).
+
+    Args:
+        inquiry_id: The inquiry ID returned by /api/intake
+
+    Returns:
+        AIAnalysisStatusResponse with the clarification session and first
+        question if clarification is needed
+
+    Raises:
+        404: No analysis known for this inquiry
+    """
+    analysis = await get_analysis_worker().get_status(inquiry_id)
+
+    if not analysis:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Analysis not found",
+        )
+
+    return analysis
+
+
 @router.get("/session/{session_id}", response_model=AISessionStateResponse)
 async def get_session_state(session_id: str) -> AISessionStateResponse:
     """Get current state of an AI clarification session.
@@ -115,6 +147,9 @@ async def keep_session_alive(session_id: str, request: SessionKeepAliveRequest)
     Should be called periodically (e.g., every 5 minutes) while
     the user is actively on the clarification page.
 
+    With Settings.ai_keepalive_batching, activity is recorded in memory
+    and written to expires_at in the next batched flush.
+
     Args:
         session_id: The AI session ID
         request: Keep-alive request body
@@ -126,29 +161,21 @@ async def keep_session_alive(session_id: str, request: SessionKeepAliveRequest)
         404: Session not found
         400: Session already completed
     """
-    ai_service = get_ai_assistant()
+    session_status = await get_ai_assistant().get_session_status(session_id)
 
-    session_state = await ai_service.get_session_state(session_id)
-
-    if not session_state:
+    if not session_status:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Session not found",
         )
 
-    if session_state["status"] != "active":
+    if session_status != "active":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Cannot extend {session_state['status']} session",
+            detail=f"Cannot extend {session_status} session",
         )
 
     # Extend TTL
-    from datetime import datetime, timedelta, timezone
-    from app.config import get_settings
-
-    settings = get_settings()
-    new_expires = datetime.now(timezone.utc) + timedelta(minutes=settings.ai_session_ttl_minutes)
-
-    await ai_service._update_session(session_id, {"expires_at": new_expires.isoformat()})
+    new_expires = await get_session_keepalive().touch(session_id)
 
     return {"status": "ok", "expires_at": new_expires.isoformat()}
@@ -1,10 +1,13 @@
 """Stripe Checkout session creation endpoints."""
 
+from typing import Optional
+
 import stripe
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 
 from app.config import get_settings
+from app.services.stripe_client import stripe_client_dependency
 from app.services.supabase import get_supabase_service
 
 router = APIRouter(prefix="/api/checkout", tags=["checkout"])
@@ -26,7 +29,10 @@ class VerifyResponse(BaseModel):
 
 
 @router.post("/advisory", response_model=CheckoutResponse)
-async def create_advisory_checkout(request: CheckoutRequest):
+async def create_advisory_checkout(
+    request: CheckoutRequest,
+    stripe_client: Optional[stripe.StripeClient] = Depends(stripe_client_dependency),
+):
     """Create Stripe Checkout session for paid advisory.
 
     Returns the Stripe hosted checkout URL for the $300 advisory session.
@@ -35,7 +41,7 @@ async def create_advisory_checkout(request: CheckoutRequest):
     settings = get_settings()
     supabase = get_supabase_service()
 
-    if not settings.stripe_secret_key or "PLACEHOLDER" in settings.stripe_secret_key:
+    if stripe_client is None:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Payment system not configured",
@@ -60,26 +66,24 @@ async def create_advisory_checkout(request: CheckoutRequest):
             detail="Email does not match inquiry",
         )
 
-    stripe.api_key = settings.stripe_secret_key
-
     try:
-        session = stripe.checkout.Session.create(
-            payment_method_types=["card"],
-            line_items=[{
+        session = await stripe_client.checkout.sessions.create_async(params={
+            "payment_method_types": ["card"],
+            "line_items": [{
                 "price": settings.stripe_price_advisory,
                 "quantity": 1,
             }],
-            mode="payment",
-            customer_email=request.customer_email,
-            allow_promotion_codes=True,
-            metadata={
+            "mode": "payment",
+            "customer_email": request.customer_email,
+            "allow_promotion_codes": True,
+            "metadata": {
                 "inquiry_id": request.inquiry_id,
                 "customer_name": request.customer_name,
                 "service": "advisory",  # Used for verification
             },
-            success_url=f"{settings.frontend_url}/booking/success?session_id={{CHECKOUT_SESSION_ID}}",
-            cancel_url=settings.frontend_url,  # Redirect home on cancel
-        )
+            "success_url": f"{settings.frontend_url}/booking/success?session_id={{CHECKOUT_SESSION_ID}}",
+            "cancel_url": settings.frontend_url,  # Redirect home on cancel
+        })
 
         return CheckoutResponse(
             checkout_url=session.url,
@@ -94,7 +98,10 @@ async def create_advisory_checkout(request: CheckoutRequest):
 
 
 @router.get("/verify/{session_id}", response_model=VerifyResponse)
-async def verify_checkout(session_id: str):
+async def verify_checkout(
+    session_id: str,
+    stripe_client: Optional[stripe.StripeClient] = Depends(stripe_client_dependency),
+):
     """Verify a checkout session was completed successfully.
 
     SECURITY:
@@ -102,15 +109,11 @@ async def verify_checkout(session_id: str):
     - Validates service type matches 'advisory' to prevent
       other Stripe products from unlocking advisory booking
     """
-    settings = get_settings()
-
-    if not settings.stripe_secret_key or "PLACEHOLDER" in settings.stripe_secret_key:
+    if stripe_client is None:
         return VerifyResponse(verified=False)
 
-    stripe.api_key = settings.stripe_secret_key
-
     try:
-        session = stripe.checkout.Session.retrieve(session_id)
+        session = await stripe_client.checkout.sessions.retrieve_async(session_id)
 
         # Must be paid
         if session.payment_status != "paid":
@@ -2,7 +2,7 @@
 
 import json
 from typing import Optional
-from fastapi import APIRouter, HTTPException, Request, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
 
 from app.config import get_settings
 from app.schemas.intake import (
@@ -15,6 +15,9 @@ from app.services.gate import (
     extract_email_domain,
     get_routing_message,
 )
+from app.services.analysis_worker import get_analysis_worker
+from app.services.pipeline import StageGraph
+from app.services.rate_limit import get_rate_limiter
 from app.services.supabase import get_supabase_service
 from app.services.ai_assistant import get_ai_assistant
 
@@ -33,22 +36,44 @@ router = APIRouter(prefix="/api", tags=["intake"])
 async def submit_intake(
     form: IntakeFormRequest,
     request: Request,
+    response: Response,
 ) -> IntakeResponse:
     """Submit intake form and receive routing result.
 
     This endpoint:
     1. Validates the form submission
-    2. Checks rate limits
+    2. Checks rate limits (in-memory sliding windows, no database query)
     3. Evaluates the high-signal gate
     4. Creates the inquiry record
-    5. Returns the routing result
+    5. Runs AI analysis (inline, or queued in async analysis mode)
+    6. Returns the routing result
 
     The routing determines whether the lead should:
     - Book a free strategy call (gate passed)
     - Book a paid advisory session (gate failed or advisory requested)
     - Wait for manual review (access flagged)
+
+    Independent stages run concurrently (AI trigger detection overlaps the
+    inquiry insert); per-stage durations are returned in Server-Timing.
     """
     settings = get_settings()
+    graph = StageGraph("intake")
+    try:
+        return await _submit_intake(form, request, graph)
+    finally:
+        await graph.aclose()
+        response.headers["Server-Timing"] = graph.server_timing()
+        if settings.stage_timing_log:
+            print(f"Stage timing {graph.summary()}")
+
+
+async def _submit_intake(
+    form: IntakeFormRequest,
+    request: Request,
+    graph: StageGraph,
+) -> IntakeResponse:
+    """Run the submit_intake stages on the request's stage graph."""
+    settings = get_settings()
     supabase = get_supabase_service()
 
     # Extract client IP (handle proxies)
@@ -59,18 +84,19 @@ async def submit_intake(
     else:
         ip_address = request.client.host if request.client else None
 
-    # Check rate limits
-    is_allowed, rate_limit_reason = await supabase.check_rate_limit(
+    # Check rate limits (before any AI or database work is spent)
+    rate_limiter = get_rate_limiter()
+    reservation = await rate_limiter.acquire(
         email=form.email,
         ip_address=ip_address,
     )
-    if not is_allowed:
+    if not reservation.allowed:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=rate_limit_reason,
+            detail=reservation.reason,
         )
 
-    # Evaluate gate and determine routing
+    # Evaluate gate and determine routing (synchronous table lookup)
     evaluation = evaluate_gate(form)
 
     # Extract email domain
@@ -114,18 +140,21 @@ async def submit_intake(
         "user_agent": request.headers.get("user-agent"),
         # Versioning
         "form_version": settings.form_version,
-        "rules_version": settings.rules_version,
+        "rules_version": evaluation.rules_version or settings.rules_version,
         "answers_raw": answers_raw_data,
         "answers_version": settings.answers_version,
     }
 
-    try:
-        # Create inquiry in database
-        inquiry = await supabase.create_inquiry(inquiry_data)
+    # AI trigger detection doesn't need the inquiry record, so start it now
+    # and let it overlap the insert (unless it runs in the background worker)
+    ai_service = get_ai_assistant()
+    if not settings.ai_async_analysis:
+        ai_service.start_analysis(graph, form)
 
-        # Create audit event
-        await supabase.create_inquiry_event(
-            inquiry_id=inquiry["id"],
+    try:
+        # Create inquiry and its audit event in one transaction
+        graph.add("inquiry", lambda: supabase.create_inquiry_with_event(
+            inquiry_data,
             event_type="created",
             actor_type="system",
             new_value=json.dumps({
@@ -133,14 +162,36 @@ async def submit_intake(
                 "routing_result": evaluation.routing_result.value,
             }),
             reason="Form submission",
-        )
+        ))
+        try:
+            inquiry = await graph.get("inquiry")
+        except Exception:
+            # Only stored submissions count toward the rate limits
+            await rate_limiter.release(reservation)
+            raise
+
+        # Async analysis mode: acknowledge now with the provisional routing;
+        # the client polls /api/intake/analysis/{inquiry_id} for the result
+        if settings.ai_async_analysis and get_analysis_worker().submit(
+            inquiry_id=inquiry["id"],
+            form=form,
+            gate_result=evaluation,
+        ):
+            return IntakeResponse(
+                inquiry_id=inquiry["id"],
+                gate_status=evaluation.gate_status,
+                routing_result=evaluation.routing_result,
+                message=get_routing_message(evaluation.routing_result),
+                analysis_pending=True,
+            )
 
         # AI Analysis: Check for clarification triggers
-        ai_service = get_ai_assistant()
+        # (inline when async mode is off or the analysis queue is full)
         ai_result = await ai_service.analyze_submission(
             form=form,
             inquiry_id=inquiry["id"],
             gate_result=evaluation,
+            graph=graph,
         )
 
         # If AI clarification is needed, return modified response
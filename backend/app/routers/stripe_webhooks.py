@@ -4,7 +4,9 @@ import stripe
 from fastapi import APIRouter, HTTPException, Header, Request, status
 
 from app.config import get_settings
+from app.services.seen_events import get_seen_event_filter
 from app.services.supabase import get_supabase_service
+from app.services.webhook_outbox import WebhookOutbox, get_webhook_outbox
 
 router = APIRouter(prefix="/api/webhooks", tags=["webhooks"])
 
@@ -21,6 +23,9 @@ async def stripe_webhook(
     - payment_intent.succeeded: When a payment is successfully processed
 
     The webhook verifies the signature to ensure the request came from Stripe.
+    With Settings.webhook_outbox_enabled it stores the event and returns
+    immediately; the handlers run in the webhook outbox workers, which retry
+    failures with backoff.
     """
     settings = get_settings()
     supabase = get_supabase_service()
@@ -52,6 +57,11 @@ async def stripe_webhook(
     event_type = event["type"]
     event_id = event["id"]
 
+    # Replays of events this process has already handled skip the database
+    seen_events = get_seen_event_filter()
+    if seen_events.seen(event_id):
+        return {"status": "already_processed", "event_id": event_id}
+
     # Store webhook event in database for idempotency
     try:
         await supabase.create_webhook_event(
@@ -60,10 +70,19 @@ async def stripe_webhook(
             payload=event,
         )
     except Exception as e:
-        # If event already exists, it's a duplicate - skip processing
-        if "duplicate" in str(e).lower() or "unique" in str(e).lower():
+        if "duplicate" not in str(e).lower() and "unique" not in str(e).lower():
+            raise
+        # Already stored: a Stripe retry of an event that failed is processed
+        # again, any other duplicate is skipped
+        if not await supabase.retry_failed_webhook_event(event_id):
             return {"status": "already_processed", "event_id": event_id}
-        raise
+
+    if settings.webhook_outbox_enabled:
+        # Processing happens in the webhook outbox workers (which retry
+        # failures themselves); Stripe only needs to know it was received
+        seen_events.add(event_id)
+        get_webhook_outbox().notify()
+        return {"status": "received", "event_id": event_id}
 
     # Handle specific event types
     try:
@@ -75,8 +94,10 @@ async def stripe_webhook(
             # Log unhandled event type
             print(f"Unhandled webhook event type: {event_type}")
 
-        # Mark webhook as processed
-        await supabase.update_webhook_event(event_id, status="processed")
+        # Mark webhook as processed (checkout completion already did so
+        # inside its own transaction)
+        if event_type != "checkout.session.completed":
+            await supabase.update_webhook_event(event_id, status="processed")
 
     except Exception as e:
         # Mark webhook as failed
@@ -90,14 +111,24 @@ async def stripe_webhook(
             detail=f"Error processing webhook: {str(e)}",
         )
 
+    # Only remembered once processed, so a retry after a failure gets through
+    seen_events.add(event_id)
     return {"status": "success", "event_id": event_id}
 
 
+def register_handlers(outbox: WebhookOutbox) -> None:
+    """Register the Stripe event handlers with the webhook outbox."""
+    # Checkout completion marks the webhook processed inside its own transaction
+    outbox.register("checkout.session.completed", handle_checkout_completed, marks_processed=True)
+    outbox.register("payment_intent.succeeded", handle_payment_succeeded)
+
+
 async def handle_checkout_completed(event: dict, supabase) -> None:
     """Handle checkout.session.completed event.
 
     This is triggered when a user completes a Stripe Checkout session,
-    typically for a paid advisory booking.
+    typically for a paid advisory booking. The webhook event is marked
+    processed as part of the same database transaction.
     """
     session = event["data"]["object"]
 
@@ -125,29 +156,31 @@ async def handle_checkout_completed(event: dict, supabase) -> None:
         },
     }
 
+    # If linked to an inquiry, update the inquiry status and audit it
+    inquiry_updates = None
+    audit_event = None
     if inquiry_id:
         payment_data["inquiry_id"] = inquiry_id
-
-    await supabase.create_payment(payment_data)
-
-    # If linked to an inquiry, update the inquiry status
-    if inquiry_id:
-        await supabase.update_inquiry(
-            inquiry_id,
-            {
-                "status": "paid",
-                "payment_status": "completed",
-            },
-        )
-
-        # Create audit event
-        await supabase.create_inquiry_event(
-            inquiry_id=inquiry_id,
-            event_type="payment_completed",
-            actor_type="system",
-            new_value=f"Payment of {amount_total/100} {currency.upper()} received",
-            reason="Checkout completed",
-        )
+        inquiry_updates = {
+            "status": "paid",
+            "payment_status": "completed",
+        }
+        audit_event = {
+            "event_type": "payment_completed",
+            "actor_type": "system",
+            "new_value": f"Payment of {amount_total/100} {currency.upper()} received",
+            "reason": "Checkout completed",
+        }
+
+    # Payment, inquiry status change, audit event and webhook status are
+    # written atomically so a partial failure cannot split them
+    await supabase.complete_checkout(
+        stripe_event_id=event["id"],
+        payment_data=payment_data,
+        inquiry_id=inquiry_id,
+        inquiry_updates=inquiry_updates,
+        event=audit_event,
+    )
 
 
 async def handle_payment_succeeded(event: dict, supabase) -> None:
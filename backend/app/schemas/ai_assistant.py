@@ -26,6 +26,13 @@ class AITriggerReason(str, Enum):
     INTELLIGENCE = "intelligence"
 
 
+class AIAnalysisStatus(str, Enum):
+    """Status of a background submission analysis (async analysis mode)."""
+    PENDING = "pending"
+    COMPLETE = "complete"
+    FAILED = "failed"
+
+
 class AIQuestionType(str, Enum):
     """Type of clarification question."""
     SINGLE_CHOICE = "single_choice"
@@ -128,6 +135,20 @@ class AISessionStateResponse(BaseModel):
     expires_at: str
 
 
+class AIAnalysisStatusResponse(BaseModel):
+    """Result of a background submission analysis (async analysis mode)."""
+    inquiry_id: str
+    status: AIAnalysisStatus
+
+    # Set once status is complete
+    needs_clarification: bool = False
+    ai_session_id: Optional[str] = None
+    first_question: Optional[AIQuestion] = None
+    gate_status: Optional[str] = None
+    routing_result: Optional[str] = None
+    message: Optional[str] = None
+
+
 # ============================================================================
 # INTERNAL SCHEMAS (used by AI service, not exposed via API)
 # ============================================================================
@@ -148,6 +148,7 @@ class GateEvaluationResult(BaseModel):
     qualification: Qualification
     routing_result: RoutingResult
     flags: list[str]
+    rules_version: Optional[str] = None  # Gate rules version that decided it
 
 
 # Response schemas
@@ -165,6 +166,10 @@ class IntakeResponse(BaseModel):
     provisional_gate_status: Optional[GateStatus] = None  # Gate status before clarification
     first_question: Optional[Any] = None  # AIQuestion object (typed as Any to avoid circular import)
 
+    # Async analysis mode: routing is provisional until analysis completes
+    # (poll GET /api/intake/analysis/{inquiry_id})
+    analysis_pending: bool = False
+
 
 class ErrorResponse(BaseModel):
     """Error response."""
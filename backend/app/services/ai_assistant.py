@@ -8,17 +8,25 @@ This service orchestrates the AI-powered intake clarification flow:
 5. Builds final output when session completes
 """
 
+import asyncio
 import json
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional
-
-import google.generativeai as genai
+from functools import partial
+from typing import Any, Callable, Optional
 
 from app.config import get_settings
 from app.prompts.clarification import (
+    COMBINED_ANALYSIS_SCHEMA,
+    COMBINED_ANALYSIS_SYSTEM,
+    COMBINED_ANALYSIS_USER,
     FALLBACK_QUESTIONS,
     QUESTION_GENERATION_SYSTEM,
     QUESTION_GENERATION_USER,
+    QUESTION_PLAN_SYSTEM,
+    QUESTION_PLAN_USER,
+    TRIGGER_DETECTION_BATCH_FORM,
+    TRIGGER_DETECTION_BATCH_USER,
     TRIGGER_DETECTION_SYSTEM,
     TRIGGER_DETECTION_USER,
 )
@@ -46,9 +54,32 @@ from app.schemas.intake import (
     ServiceType,
 )
 from app.services.gate import evaluate_gate, get_routing_message
+from app.services.llm_cache import LLMResponseCache, get_llm_cache, make_cache_key
+from app.services.llm_provider import (
+    COMBINED_ANALYSIS,
+    QUESTION_GENERATION,
+    QUESTION_PLAN,
+    TRIGGER_DETECTION,
+    TRIGGER_DETECTION_BATCH,
+    LLMProvider,
+    LLMRequest,
+    create_llm_provider,
+)
+from app.services.llm_resilience import CircuitBreaker, CircuitOpenError, CircuitState, hedged
+from app.services.micro_batch import MicroBatcher
+from app.services.pipeline import StageGraph
+from app.services.prefetch import QuestionPrefetcher
+from app.services.question_bank import QuestionBank, load_question_bank, validate_question
+from app.services.question_plan import build_plan, next_planned_question
+from app.services.session_cache import SessionCache, SessionRecord
 from app.services.supabase import get_supabase_service
 
 
+# Enum form fields an answer option may rewrite (same whitelist as the
+# record_clarification_answer RPC)
+PREFETCH_MAPPABLE_FIELDS = ("budget_range", "service_type", "access_model", "timeline", "role_title")
+
+
 class AIAssistantService:
     """Orchestrates AI-powered intake clarification."""
 
@@ -56,22 +87,92 @@ class AIAssistantService:
         settings = get_settings()
         self.settings = settings
         self.supabase = get_supabase_service()
-        self.model = None
-
-        # Initialize Gemini if API key is available
-        if settings.gemini_api_key:
-            genai.configure(api_key=settings.gemini_api_key)
-            self.model = genai.GenerativeModel(settings.gemini_model)
+        self.llm: Optional[LLMProvider] = create_llm_provider(settings)
+        self.prefetcher = QuestionPrefetcher()
+        self.llm_cache: Optional[LLMResponseCache] = None
+        self.question_bank: Optional[QuestionBank] = None
+        self.breaker: Optional[CircuitBreaker] = None
+        self.trigger_batcher: Optional[MicroBatcher[IntakeFormRequest, TriggerAnalysisResult]] = None
+        self._background_tasks: set[asyncio.Task] = set()
+        self.session_cache: Optional[SessionCache] = None
+        if settings.ai_session_cache_enabled:
+            self.session_cache = SessionCache(capacity=settings.ai_session_cache_size)
+
+        # Precomputed questions for context-independent states
+        if settings.ai_question_bank_path:
+            self.question_bank = load_question_bank(settings.ai_question_bank_path)
+
+        if self.llm is not None:
+            if settings.ai_llm_cache_enabled:
+                self.llm_cache = get_llm_cache()
+            if settings.ai_breaker_enabled:
+                self.breaker = CircuitBreaker(
+                    name="gemini",
+                    window_size=settings.ai_breaker_window,
+                    min_calls=settings.ai_breaker_min_calls,
+                    error_rate_threshold=settings.ai_breaker_error_rate,
+                    p95_latency_threshold=settings.ai_breaker_p95_ratio * settings.ai_llm_timeout_seconds,
+                    open_seconds=settings.ai_breaker_open_seconds,
+                )
+            if settings.ai_trigger_batching:
+                self.trigger_batcher = MicroBatcher(
+                    self._request_llm_triggers_batch,
+                    window_seconds=settings.ai_trigger_batch_window_ms / 1000,
+                    max_batch_size=settings.ai_trigger_batch_max_size,
+                )
 
     # =========================================================================
     # PUBLIC API
     # =========================================================================
 
+    def start_analysis(self, graph: StageGraph, form: IntakeFormRequest) -> None:
+        """Start the analysis stages that don't need the inquiry record.
+
+        Lets callers overlap trigger detection with their own work (e.g.,
+        the inquiry insert). Safe to call more than once.
+
+        Stages:
+            rule_triggers: Rule-based trigger detection
+            combined_analysis: LLM trigger detection and first question
+                in one call (when Settings.ai_combined_analysis is on and
+                trigger batching is off)
+            llm_triggers: LLM trigger detection
+            speculative_question: First question for the rule-based
+                triggers, generated while the LLM is still deciding
+                (two-step path only)
+
+        Args:
+            graph: Stage graph to add the stages to
+            form: The submitted form data
+        """
+        if "rule_triggers" in graph:
+            return
+
+        graph.add("rule_triggers", lambda: self._detect_rule_based_triggers(form))
+        # Combined calls can't share a batch; batching takes the two-step path
+        if self.llm and self.settings.ai_combined_analysis and self.trigger_batcher is None:
+            graph.add(
+                "combined_analysis",
+                lambda rule_triggers: self._detect_llm_triggers_with_question(form, rule_triggers),
+                "rule_triggers",
+            )
+            graph.add("llm_triggers", lambda combined: combined[0], "combined_analysis")
+            return
+
+        graph.add("llm_triggers", lambda: self._detect_llm_triggers(form))
+        if self.settings.ai_speculative_question:
+            graph.add(
+                "speculative_question",
+                lambda triggers: self._first_question(form, triggers) if triggers else None,
+                "rule_triggers",
+            )
+
     async def analyze_submission(
         self,
         form: IntakeFormRequest,
         inquiry_id: str,
         gate_result: GateEvaluationResult,
+        graph: Optional[StageGraph] = None,
     ) -> AISessionStartResponse:
         """Analyze form submission for triggers, create session if needed.
 
@@ -81,19 +182,48 @@ class AIAssistantService:
             form: The submitted form data
             inquiry_id: ID of the created inquiry record
             gate_result: Initial gate evaluation result
+            graph: Caller's stage graph, if start_analysis() was already
+                called on it (a private graph is used otherwise)
 
         Returns:
             AISessionStartResponse indicating if clarification is needed
         """
+        owns_graph = graph is None
+        if graph is None:
+            graph = StageGraph("analysis")
+        self.start_analysis(graph, form)
+
+        try:
+            return await self._analyze(graph, form, inquiry_id, gate_result)
+        finally:
+            if owns_graph:
+                await graph.aclose()
+                if self.settings.stage_timing_log:
+                    print(f"Stage timing {graph.summary()}")
+
+    async def _analyze(
+        self,
+        graph: StageGraph,
+        form: IntakeFormRequest,
+        inquiry_id: str,
+        gate_result: GateEvaluationResult,
+    ) -> AISessionStartResponse:
+        """Finish the analysis started by start_analysis()."""
         # Step 1: Rule-based trigger detection (always runs)
-        rule_triggers = self._detect_rule_based_triggers(form)
+        rule_triggers = await graph.get("rule_triggers")
 
         # Step 2: LLM-based trigger detection (may fail gracefully)
-        llm_result = await self._detect_llm_triggers(form)
+        llm_result = await graph.get("llm_triggers")
 
         # Combine triggers
         all_triggers = list(set(rule_triggers + llm_result.triggers))
 
+        # The speculative question is only valid if the LLM found nothing new
+        # (issues, and therefore the question, depend only on the trigger set)
+        use_speculative = "speculative_question" in graph and set(all_triggers) == set(rule_triggers)
+        if not use_speculative:
+            graph.cancel("speculative_question")
+
         # Step 3: Handle LLM failure case
         if not llm_result.llm_available and not rule_triggers:
             # LLM failed and no rule-based triggers
@@ -116,24 +246,52 @@ class AIAssistantService:
                 message=get_routing_message(gate_result.routing_result),
             )
 
-        # Step 5: Create AI session
-        session = await self._create_session(
+        # Steps 5 + 6: Create AI session and generate first question concurrently
+        # (the combined call may already have drafted it)
+        combined_question = None
+        if "combined_analysis" in graph:
+            _, combined_question = await graph.get("combined_analysis")
+
+        question_stage = "speculative_question"
+        if not use_speculative:
+            question_stage = "first_question"
+            if combined_question is not None:
+                graph.add("first_question", lambda: combined_question)
+            else:
+                graph.add("first_question", lambda: self._first_question(form, all_triggers))
+
+        graph.add("ai_session", lambda: self._create_session(
             inquiry_id=inquiry_id,
             triggers=all_triggers,
             provisional_gate_status=gate_result.gate_status,
-        )
-
-        # Step 6: Generate first question
-        all_issues = self._triggers_to_issues(all_triggers, form)
-        first_question = await self._generate_question(
-            session=session,
-            form=form,
-            issues=all_issues,
-            previous_turns=[],
-        )
+        ))
 
         # Step 7: Store first turn
-        await self._create_turn(session["id"], 0, first_question)
+        graph.add(
+            "first_turn",
+            lambda session, question: self._create_turn(session["id"], 0, question),
+            "ai_session",
+            question_stage,
+        )
+        await graph.get("first_turn")
+        session = await graph.get("ai_session")
+        first_question = await graph.get(question_stage)
+        if self.session_cache is not None:
+            # Answers are re-gated from this snapshot plus their field deltas
+            self.session_cache.set_form(session["id"], form)
+
+        # Plan the follow-ups for the whole session (served by any worker),
+        # or prefetch the next question locally
+        if not self._schedule_question_plan(session["id"], form, all_triggers, first_question):
+            self._prefetch_next_questions(
+                session_id=session["id"],
+                turn_index=0,
+                max_questions=self.settings.ai_max_questions,
+                form=form,
+                triggers=all_triggers,
+                previous_turns=[],
+                question=first_question,
+            )
 
         return AISessionStartResponse(
             needs_clarification=True,
@@ -159,46 +317,61 @@ class AIAssistantService:
         Returns:
             AITurnResponse with next question or final routing
         """
-        # 1. Get session and validate
-        session = await self._get_session(session_id)
-        if not session:
-            raise ValueError("Session not found")
-        if session["status"] != "active":
-            raise ValueError(f"Session is {session['status']}, not active")
-
-        # 2. Get the turn and validate
-        turn = await self._get_turn(session_id, turn_index)
-        if not turn:
-            raise ValueError("Turn not found")
-        if turn.get("answered_at"):
-            raise ValueError("Question already answered")
-
-        # 3. Update turn with answer
-        await self._update_turn_answer(turn["id"], answer_value, turn)
-
-        # 4. Apply field update if applicable
-        field_updated, old_value, new_value = await self._apply_field_update(
-            session, turn, answer_value
+        # 1. Validate session and turn, record the answer, apply the field
+        #    update and bump question_count in one transactional round trip
+        #    (obviously invalid answers are rejected from the session cache;
+        #    the inquiry is only sent back if there's no cached form snapshot)
+        cached = self._check_cached_answer(session_id, turn_index)
+        snapshot = cached.form if cached is not None else None
+        recorded = await self.supabase.record_clarification_answer(
+            session_id, turn_index, answer_value, return_inquiry=snapshot is None
         )
-
-        # 5. Increment question count
-        new_count = session["question_count"] + 1
-        await self._update_session(session_id, {"question_count": new_count})
-
-        # 6. Get updated inquiry and re-run gate
-        inquiry = await self.supabase.get_inquiry(session["inquiry_id"])
-        form = self._inquiry_to_form(inquiry)
+        session = recorded["session"]
+        previous_turns = recorded["turns"]
+        record = None
+        version = None
+        if self.session_cache is not None:
+            record = self.session_cache.put_session(
+                session, expected_version=cached.version if cached is not None else None
+            )
+            if record is not None:
+                self.session_cache.put_turns(session_id, previous_turns)
+                version = record.version
+        field_updated = recorded.get("field_updated")
+        old_value = recorded.get("old_value")
+        new_value = recorded.get("new_value")
+        new_count = session["question_count"]
+
+        # 2. Re-run gate against the updated form: the snapshot plus this
+        #    answer's field delta, as long as no other write to the session
+        #    got in between (the entry still carries the same snapshot, and
+        #    the database counted no other answer since it was cached)
+        form = None
+        if recorded.get("inquiry") is not None:
+            form = self._inquiry_to_form(recorded["inquiry"])
+        elif (
+            snapshot is not None
+            and record is not None
+            and record.form is snapshot
+            and new_count == cached.question_count + 1
+        ):
+            form = self._apply_field_delta(snapshot, field_updated, new_value)
+        if form is None:
+            inquiry = await self.supabase.get_inquiry(session["inquiry_id"])
+            if inquiry is None:
+                raise ValueError("Inquiry not found")
+            form = self._inquiry_to_form(inquiry)
+        if record is not None:
+            record.form = form
         gate_result = evaluate_gate(form)
 
-        # 7. Update session with latest gate result
-        await self._update_session(session_id, {
-            "latest_gate_status": gate_result.gate_status.value,
-            "latest_routing_result": gate_result.routing_result.value,
-        })
-
-        # 8. Check if resolved (gate now passes)
+        # 3. Check if resolved (gate now passes)
         if gate_result.gate_status == GateStatus.PASS:
-            await self._complete_session(session_id, AISessionStatus.RESOLVED, gate_result)
+            self.prefetcher.discard(session_id, turn_index)
+            await self._complete_session(
+                session_id, AISessionStatus.RESOLVED, gate_result,
+                turns=previous_turns, expected_version=version,
+            )
             return AITurnResponse(
                 session_id=session_id,
                 turn_index=turn_index,
@@ -212,9 +385,13 @@ class AIAssistantService:
                 field_new_value=new_value,
             )
 
-        # 9. Check if max questions reached
+        # 4. Check if max questions reached
         if new_count >= session["max_questions"]:
-            await self._complete_session(session_id, AISessionStatus.MANUAL, gate_result)
+            self.prefetcher.discard(session_id, turn_index)
+            await self._complete_session(
+                session_id, AISessionStatus.MANUAL, gate_result,
+                turns=previous_turns, expected_version=version,
+            )
             return AITurnResponse(
                 session_id=session_id,
                 turn_index=turn_index,
@@ -228,20 +405,46 @@ class AIAssistantService:
                 field_new_value=new_value,
             )
 
-        # 10. Generate next question
+        # 5. Record latest gate result on the still-active session
+        await self._update_session(session_id, {
+            "latest_gate_status": gate_result.gate_status.value,
+            "latest_routing_result": gate_result.routing_result.value,
+        }, expected_version=version)
+
+        # 6. Generate next question (served from the session's question plan
+        #    if the answers stayed on it, else from the prefetch if one was
+        #    built for this answer and the form ended up as predicted)
         triggers = [AITriggerReason(t) for t in session["trigger_reasons"]]
         issues = self._triggers_to_issues(triggers, form)
-        previous_turns = await self._get_all_turns(session_id)
 
-        next_question = await self._generate_question(
-            session=session,
-            form=form,
-            issues=issues,
-            previous_turns=previous_turns,
-        )
+        next_question = next_planned_question(session.get("question_plan"), previous_turns)
+        planned = next_question is not None
+        if planned:
+            self.prefetcher.discard(session_id, turn_index)
+        else:
+            next_question = await self.prefetcher.claim(
+                session_id, turn_index, answer_value, self._question_fingerprint(form)
+            )
+        if next_question is None:
+            next_question = await self._generate_question(
+                session=session,
+                form=form,
+                issues=issues,
+                previous_turns=previous_turns,
+            )
 
-        # 11. Create next turn
+        # 7. Create next turn
         await self._create_turn(session_id, new_count, next_question)
+        if not planned:
+            self._prefetch_next_questions(
+                session_id=session_id,
+                turn_index=new_count,
+                max_questions=session["max_questions"],
+                form=form,
+                triggers=triggers,
+                previous_turns=previous_turns,
+                question=next_question,
+            )
 
         return AITurnResponse(
             session_id=session_id,
@@ -254,6 +457,11 @@ class AIAssistantService:
             field_new_value=new_value,
         )
 
+    async def get_session_status(self, session_id: str) -> Optional[str]:
+        """Status of an AI session (from the session cache when possible)."""
+        session = await self._get_session(session_id)
+        return session["status"] if session else None
+
     async def get_session_state(self, session_id: str) -> Optional[dict]:
         """Get current state of an AI session for resume."""
         session = await self._get_session(session_id)
@@ -311,79 +519,32 @@ class AIAssistantService:
 
     async def _detect_llm_triggers(self, form: IntakeFormRequest) -> TriggerAnalysisResult:
         """Use LLM to detect contradictions and budget/scope mismatches."""
-        if not self.model:
+        if not self.llm:
             return TriggerAnalysisResult(
                 has_triggers=False,
                 llm_available=False,
-                llm_error="Gemini API key not configured",
+                llm_error="LLM provider not configured",
             )
 
         try:
-            # Get decision maker status
-            is_decision_maker = None
-            if form.answers_raw:
-                is_decision_maker = form.answers_raw.is_decision_maker
-
-            prompt = TRIGGER_DETECTION_USER.format(
-                name=form.name,
-                role_title=form.role_title.value,
-                is_decision_maker=is_decision_maker,
-                service_type=form.service_type.value,
-                context_raw=form.context_raw,
-                timeline=form.timeline.value,
-                budget_range=form.budget_range.value,
-                access_model=form.access_model.value,
-            )
+            if self.trigger_batcher is not None:
+                return await self.trigger_batcher.submit(form)
+            return await self._request_llm_triggers(form)
 
-            response = self.model.generate_content(
-                [
-                    {"role": "user", "parts": [TRIGGER_DETECTION_SYSTEM]},
-                    {"role": "model", "parts": ["I understand. I'll analyze the form and return JSON only."]},
-                    {"role": "user", "parts": [prompt]},
-                ],
-                generation_config={
-                    "response_mime_type": "application/json",
-                    "temperature": 0.3,  # Lower temperature for more deterministic responses
-                },
+        except CircuitOpenError:
+            # Rule-only path: don't wait on a degraded model
+            return TriggerAnalysisResult(
+                has_triggers=False,
+                llm_available=False,
+                llm_error="Gemini circuit is open",
             )
-
-            result = json.loads(response.text)
-            triggers = []
-            issues = []
-
-            if result.get("has_issues"):
-                for issue in result.get("issues", []):
-                    confidence = issue.get("confidence", 0.5)
-                    if confidence < 0.7:
-                        continue  # Skip low-confidence issues
-
-                    issue_type = issue.get("type", "").lower()
-                    if issue_type == "contradiction":
-                        triggers.append(AITriggerReason.CONTRADICTION)
-                        issues.append(DetectedIssue(
-                            trigger_type=AITriggerReason.CONTRADICTION,
-                            field=issue.get("field"),
-                            description=issue.get("description", ""),
-                            priority=2,
-                            confidence=confidence,
-                        ))
-                    elif issue_type == "budget_scope_mismatch":
-                        triggers.append(AITriggerReason.BUDGET_SCOPE_MISMATCH)
-                        issues.append(DetectedIssue(
-                            trigger_type=AITriggerReason.BUDGET_SCOPE_MISMATCH,
-                            field="budget_range",
-                            description=issue.get("description", ""),
-                            priority=1,
-                            confidence=confidence,
-                        ))
-
+        except asyncio.TimeoutError:
+            print("LLM trigger detection timed out")
             return TriggerAnalysisResult(
-                has_triggers=len(triggers) > 0,
-                triggers=list(set(triggers)),
-                issues=issues,
-                llm_available=True,
+                has_triggers=False,
+                llm_available=False,
+                llm_error="Gemini request timed out",
             )
-
         except Exception as e:
             print(f"LLM trigger detection error: {e}")
             return TriggerAnalysisResult(
@@ -392,6 +553,317 @@ class AIAssistantService:
                 llm_error=str(e),
             )
 
+    async def _detect_llm_triggers_with_question(
+        self,
+        form: IntakeFormRequest,
+        rule_triggers: list[AITriggerReason],
+    ) -> tuple[TriggerAnalysisResult, Optional[AIQuestion]]:
+        """Detect LLM triggers and draft the first question in one call.
+
+        The response is constrained to COMBINED_ANALYSIS_SCHEMA. If it
+        can't be used, this degrades to the two-step path: triggers via
+        _detect_llm_triggers, and no question (the caller generates it).
+
+        Args:
+            form: The submitted form data
+            rule_triggers: Triggers already found by the rules
+
+        Returns:
+            The trigger result and the first question for the combined
+            trigger set (None if there is nothing to ask or the drafted
+            question was unusable)
+        """
+        if not self.llm:
+            return await self._detect_llm_triggers(form), None
+
+        known_issues = [
+            {"type": i.trigger_type.value, "field": i.field, "description": i.description}
+            for i in self._triggers_to_issues(rule_triggers, form)
+        ]
+        prompt = COMBINED_ANALYSIS_USER.format(
+            **self._trigger_prompt_fields(form),
+            known_issues=json.dumps(known_issues, indent=2) if known_issues else "None",
+            max_questions=self.settings.ai_max_questions,
+        )
+
+        try:
+            result = await self._generate_json(
+                kind=COMBINED_ANALYSIS,
+                system=COMBINED_ANALYSIS_SYSTEM,
+                acknowledgement="I understand. I'll analyze the form and return JSON only.",
+                prompt=prompt,
+                temperature=0.3,
+                response_schema=COMBINED_ANALYSIS_SCHEMA,
+                usable=self._combined_result_usable,
+            )
+            llm_result = self._parse_trigger_result(result)
+            question = None
+            if result.get("first_question") and (rule_triggers or llm_result.has_triggers):
+                question = self._parse_question(result["first_question"])
+                problems = validate_question(question)
+                if problems:
+                    print(f"Combined analysis question rejected: {'; '.join(problems)}")
+                    question = None
+            return llm_result, question
+
+        except CircuitOpenError:
+            return TriggerAnalysisResult(
+                has_triggers=False,
+                llm_available=False,
+                llm_error="Gemini circuit is open",
+            ), None
+        except asyncio.TimeoutError:
+            # A second (two-step) call would blow the deadline again
+            print("LLM combined analysis timed out")
+            return TriggerAnalysisResult(
+                has_triggers=False,
+                llm_available=False,
+                llm_error="Gemini request timed out",
+            ), None
+        except Exception as e:
+            print(f"LLM combined analysis unusable ({e}), using two-step path")
+            return await self._detect_llm_triggers(form), None
+
+    async def _request_llm_triggers(self, form: IntakeFormRequest) -> TriggerAnalysisResult:
+        """Run trigger detection for one form in its own Gemini call."""
+        prompt = TRIGGER_DETECTION_USER.format(**self._trigger_prompt_fields(form))
+        result = await self._generate_json(
+            kind=TRIGGER_DETECTION,
+            system=TRIGGER_DETECTION_SYSTEM,
+            acknowledgement="I understand. I'll analyze the form and return JSON only.",
+            prompt=prompt,
+            temperature=0.3,  # Lower temperature for more deterministic responses
+            usable=self._trigger_result_usable,
+        )
+        return self._parse_trigger_result(result)
+
+    async def _request_llm_triggers_batch(
+        self,
+        forms: list[IntakeFormRequest],
+    ) -> list[TriggerAnalysisResult | Exception]:
+        """Run trigger detection for several forms in one Gemini call.
+
+        Forms whose result is missing or malformed in the batched response
+        (or all of them, if the response can't be parsed) are retried with
+        single calls. Timeouts and open-circuit errors are not retried.
+
+        Returns:
+            One result (or the error of its single-call retry) per form
+        """
+        if len(forms) == 1:
+            return [await self._request_llm_triggers(forms[0])]
+
+        blocks = [
+            TRIGGER_DETECTION_BATCH_FORM.format(form_id=i + 1, **self._trigger_prompt_fields(form))
+            for i, form in enumerate(forms)
+        ]
+        prompt = TRIGGER_DETECTION_BATCH_USER.format(count=len(forms), forms="\n\n".join(blocks))
+
+        parsed: dict[int, TriggerAnalysisResult] = {}
+        try:
+            result = await self._generate_json(
+                kind=TRIGGER_DETECTION_BATCH,
+                system=TRIGGER_DETECTION_SYSTEM,
+                acknowledgement="I understand. I'll analyze each form and return JSON only.",
+                prompt=prompt,
+                temperature=0.3,
+                usable=lambda r: self._batch_result_usable(r, len(forms)),
+            )
+            for entry in result["results"]:
+                try:
+                    parsed[int(entry["form_id"]) - 1] = self._parse_trigger_result(entry)
+                except (KeyError, TypeError, ValueError, AttributeError):
+                    continue  # Retried below
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Batched trigger detection unparseable ({e}); falling back to single calls")
+
+        missing = [i for i in range(len(forms)) if i not in parsed]
+        if missing and len(missing) < len(forms):
+            print(f"Batched trigger detection missed {len(missing)}/{len(forms)} forms; retrying singly")
+        retried = await asyncio.gather(
+            *(self._request_llm_triggers(forms[i]) for i in missing),
+            return_exceptions=True,
+        )
+        for i, outcome in zip(missing, retried):
+            if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+                raise outcome
+            parsed[i] = outcome
+
+        return [parsed[i] for i in range(len(forms))]
+
+    def _trigger_prompt_fields(self, form: IntakeFormRequest) -> dict[str, Any]:
+        """Form values substituted into the trigger detection prompts."""
+        # Get decision maker status
+        is_decision_maker = None
+        if form.answers_raw:
+            is_decision_maker = form.answers_raw.is_decision_maker
+
+        return {
+            "name": form.name,
+            "role_title": form.role_title.value,
+            "is_decision_maker": is_decision_maker,
+            "service_type": form.service_type.value,
+            "context_raw": form.context_raw,
+            "timeline": form.timeline.value,
+            "budget_range": form.budget_range.value,
+            "access_model": form.access_model.value,
+        }
+
+    def _parse_trigger_result(self, result: dict) -> TriggerAnalysisResult:
+        """Convert a trigger detection JSON response into triggers/issues."""
+        triggers = []
+        issues = []
+
+        if result.get("has_issues"):
+            for issue in result.get("issues", []):
+                confidence = issue.get("confidence", 0.5)
+                if confidence < 0.7:
+                    continue  # Skip low-confidence issues
+
+                issue_type = issue.get("type", "").lower()
+                if issue_type == "contradiction":
+                    triggers.append(AITriggerReason.CONTRADICTION)
+                    issues.append(DetectedIssue(
+                        trigger_type=AITriggerReason.CONTRADICTION,
+                        field=issue.get("field"),
+                        description=issue.get("description", ""),
+                        priority=2,
+                        confidence=confidence,
+                    ))
+                elif issue_type == "budget_scope_mismatch":
+                    triggers.append(AITriggerReason.BUDGET_SCOPE_MISMATCH)
+                    issues.append(DetectedIssue(
+                        trigger_type=AITriggerReason.BUDGET_SCOPE_MISMATCH,
+                        field="budget_range",
+                        description=issue.get("description", ""),
+                        priority=1,
+                        confidence=confidence,
+                    ))
+
+        return TriggerAnalysisResult(
+            has_triggers=len(triggers) > 0,
+            triggers=list(set(triggers)),
+            issues=issues,
+            llm_available=True,
+        )
+
+    def _trigger_result_usable(self, result: dict) -> bool:
+        """Whether a trigger detection response parses (worth caching)."""
+        try:
+            self._parse_trigger_result(result)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return False
+        return True
+
+    def _batch_result_usable(self, result: dict, count: int) -> bool:
+        """Whether a batched trigger response has a parseable result for every form."""
+        try:
+            entries = result["results"]
+            form_ids = {int(entry["form_id"]) for entry in entries}
+        except (KeyError, TypeError, ValueError):
+            return False
+        return form_ids == set(range(1, count + 1)) and all(map(self._trigger_result_usable, entries))
+
+    def _combined_result_usable(self, result: dict) -> bool:
+        """Whether a combined analysis response parses and its question validates."""
+        if not self._trigger_result_usable(result):
+            return False
+        first_question = result.get("first_question")
+        return not first_question or self._question_usable(first_question, check=True)
+
+    # =========================================================================
+    # LLM CALLS
+    # =========================================================================
+
+    async def _generate_json(
+        self,
+        kind: str,
+        system: str,
+        acknowledgement: str,
+        prompt: str,
+        temperature: float,
+        response_schema: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        usable: Optional[Callable[[dict], bool]] = None,
+    ) -> dict:
+        """Run a JSON generation on the LLM provider with a hard deadline.
+
+        The deadline covers waiting for a provider slot as well as the call
+        itself; on expiry the call is cancelled. Responses are served from
+        the LLM response cache when enabled; only responses that usable
+        accepts are stored, so a malformed one isn't replayed.
+
+        Calls go through the Gemini circuit breaker: while it is open they
+        fail immediately (callers fall back). Calls with their own timeout
+        (long background generations) bypass the breaker so their latency
+        doesn't skew its p95. Independently, a slow call is hedged with a
+        second request when Settings.ai_llm_hedge_delay_seconds is set,
+        unless the breaker is open or half-open.
+
+        Args:
+            kind: Request kind (see app.services.llm_provider)
+            system: System instructions (sent as the first user turn)
+            acknowledgement: Model turn acknowledging the instructions
+            prompt: The user prompt
+            temperature: Sampling temperature
+            response_schema: Schema the response is constrained to
+            timeout: Deadline override (default Settings.ai_llm_timeout_seconds)
+            usable: Check that the response can be used (None = any response)
+
+        Returns:
+            Parsed JSON response
+
+        Raises:
+            asyncio.TimeoutError: Deadline exceeded
+            CircuitOpenError: Gemini circuit is open
+        """
+        use_breaker = self.breaker is not None and timeout is None
+        if timeout is None:
+            timeout = self.settings.ai_llm_timeout_seconds
+        request = LLMRequest(
+            kind=kind,
+            system=system,
+            acknowledgement=acknowledgement,
+            prompt=prompt,
+            temperature=temperature,
+            timeout=timeout,
+            response_schema=response_schema,
+        )
+
+        async def call() -> dict:
+            return json.loads(await self.llm.generate_json(request))
+
+        async def generate() -> dict:
+            if use_breaker and not self.breaker.allow():
+                raise CircuitOpenError("Gemini circuit is open")
+
+            # Hedge only while healthy; a half-open probe is a single call
+            hedge_delay = self.settings.ai_llm_hedge_delay_seconds
+            if self.breaker is not None and self.breaker.state != CircuitState.CLOSED:
+                hedge_delay = None
+            if not use_breaker:
+                return await asyncio.wait_for(hedged(call, hedge_delay), timeout=timeout)
+
+            started = time.monotonic()
+            try:
+                result = await asyncio.wait_for(hedged(call, hedge_delay), timeout=timeout)
+            except asyncio.CancelledError:
+                self.breaker.record_abandoned()
+                raise
+            except Exception:
+                self.breaker.record_failure(time.monotonic() - started)
+                raise
+            self.breaker.record_success(time.monotonic() - started)
+            return result
+
+        if self.llm_cache is None:
+            return await generate()
+
+        key = make_cache_key(
+            self.llm.name, system, acknowledgement, prompt, temperature, response_schema
+        )
+        return await self.llm_cache.get_or_compute(key, generate, validate=usable)
+
     # =========================================================================
     # QUESTION GENERATION
     # =========================================================================
@@ -403,17 +875,40 @@ class AIAssistantService:
         issues: list[DetectedIssue],
         previous_turns: list[dict],
     ) -> AIQuestion:
-        """Generate the next clarifying question using LLM or fallback."""
-        # Try LLM first
-        if self.model:
+        """Generate the next clarifying question (bank, then LLM, then fallback)."""
+        # Precomputed question, if the free-text context doesn't matter
+        if self.question_bank is not None:
+            question = self.question_bank.lookup(form, issues, previous_turns)
+            if question is not None:
+                return question
+
+        # Try LLM
+        if self.llm:
             try:
                 return await self._generate_question_llm(session, form, issues, previous_turns)
+            except CircuitOpenError:
+                pass  # Degraded model; fallback without logging every request
+            except asyncio.TimeoutError:
+                print("LLM question generation timed out, using fallback")
             except Exception as e:
                 print(f"LLM question generation error: {e}")
 
         # Fallback to deterministic questions
         return self._get_fallback_question(form, issues, previous_turns)
 
+    async def _first_question(
+        self,
+        form: IntakeFormRequest,
+        triggers: list[AITriggerReason],
+    ) -> AIQuestion:
+        """Generate the first question of a (possibly not yet created) session."""
+        return await self._generate_question(
+            session={"question_count": 0, "max_questions": self.settings.ai_max_questions},
+            form=form,
+            issues=self._triggers_to_issues(triggers, form),
+            previous_turns=[],
+        )
+
     async def _generate_question_llm(
         self,
         session: dict,
@@ -422,21 +917,8 @@ class AIAssistantService:
         previous_turns: list[dict],
     ) -> AIQuestion:
         """Generate question using LLM."""
-        # Build form state dict
-        form_state = {
-            "service_type": form.service_type.value,
-            "budget_range": form.budget_range.value,
-            "timeline": form.timeline.value,
-            "access_model": form.access_model.value,
-            "context_raw": form.context_raw[:500],  # Truncate for prompt
-            "role_title": form.role_title.value,
-        }
-
-        # Build issues list
-        issues_list = [
-            {"type": i.trigger_type.value, "field": i.field, "description": i.description}
-            for i in issues
-        ]
+        form_state = self._question_form_state(form)
+        issues_list = self._question_issues(issues)
 
         # Build previous answers
         previous_answers = []
@@ -456,20 +938,39 @@ class AIAssistantService:
             previous_answers=json.dumps(previous_answers, indent=2) if previous_answers else "None",
         )
 
-        response = self.model.generate_content(
-            [
-                {"role": "user", "parts": [QUESTION_GENERATION_SYSTEM]},
-                {"role": "model", "parts": ["I understand. I'll generate the most important clarifying question."]},
-                {"role": "user", "parts": [prompt]},
-            ],
-            generation_config={
-                "response_mime_type": "application/json",
-                "temperature": 0.5,  # Slightly higher for more natural questions
-            },
+        result = await self._generate_json(
+            kind=QUESTION_GENERATION,
+            system=QUESTION_GENERATION_SYSTEM,
+            acknowledgement="I understand. I'll generate the most important clarifying question.",
+            prompt=prompt,
+            temperature=0.5,  # Slightly higher for more natural questions
+            usable=self._question_usable,
         )
+        return self._parse_question(result)
+
+    @staticmethod
+    def _question_form_state(form: IntakeFormRequest) -> dict:
+        """Form state shown to the model in question prompts."""
+        return {
+            "service_type": form.service_type.value,
+            "budget_range": form.budget_range.value,
+            "timeline": form.timeline.value,
+            "access_model": form.access_model.value,
+            "context_raw": form.context_raw[:500],  # Truncate for prompt
+            "role_title": form.role_title.value,
+        }
 
-        result = json.loads(response.text)
+    @staticmethod
+    def _question_issues(issues: list[DetectedIssue]) -> list[dict]:
+        """Issues shown to the model in question prompts."""
+        return [
+            {"type": i.trigger_type.value, "field": i.field, "description": i.description}
+            for i in issues
+        ]
 
+    @staticmethod
+    def _parse_question(result: dict) -> AIQuestion:
+        """Convert a generated question JSON object into an AIQuestion."""
         # Parse options if present
         options = None
         if result.get("options"):
@@ -492,6 +993,219 @@ class AIAssistantService:
             target_field=result.get("target_field"),
         )
 
+    @classmethod
+    def _question_usable(cls, result: dict, check: bool = False) -> bool:
+        """Whether a generated question parses (and, with check, validates)."""
+        try:
+            question = cls._parse_question(result)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return False
+        return not (check and validate_question(question))
+
+    # =========================================================================
+    # QUESTION PLAN
+    # =========================================================================
+
+    def _schedule_question_plan(
+        self,
+        session_id: str,
+        form: IntakeFormRequest,
+        triggers: list[AITriggerReason],
+        first_question: AIQuestion,
+    ) -> bool:
+        """Start planning the session's follow-up questions in the background.
+
+        The plan is written to ai_sessions.question_plan when ready; answers
+        arriving before then are handled as if there were no plan.
+
+        Returns:
+            True if planning was started
+        """
+        max_questions = self.settings.ai_max_questions
+        if not self.llm or not self.settings.ai_question_plan or max_questions < 2:
+            return False
+        if self.breaker is not None and self.breaker.state != CircuitState.CLOSED:
+            return False
+
+        task = asyncio.create_task(
+            self._store_question_plan(session_id, form, triggers, first_question, max_questions),
+            name=f"question_plan:{session_id}",
+        )
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return True
+
+    async def _store_question_plan(
+        self,
+        session_id: str,
+        form: IntakeFormRequest,
+        triggers: list[AITriggerReason],
+        first_question: AIQuestion,
+        max_questions: int,
+    ) -> None:
+        """Generate the question plan and save it on the session."""
+        try:
+            plan = await self._generate_question_plan(form, triggers, first_question, max_questions)
+            if plan is None:
+                print(f"Question plan for session {session_id} had no usable follow-ups")
+                return
+            await self._update_session(session_id, {"question_plan": plan})
+        except asyncio.TimeoutError:
+            print(f"Question plan for session {session_id} timed out")
+        except Exception as e:
+            print(f"Question plan for session {session_id} failed: {e}")
+
+    async def _generate_question_plan(
+        self,
+        form: IntakeFormRequest,
+        triggers: list[AITriggerReason],
+        first_question: AIQuestion,
+        max_questions: int,
+    ) -> Optional[dict]:
+        """Ask the model for the follow-ups to every answer path."""
+        prompt = QUESTION_PLAN_USER.format(
+            form_state=json.dumps(self._question_form_state(form), indent=2),
+            issues=json.dumps(self._question_issues(self._triggers_to_issues(triggers, form)), indent=2),
+            first_question=json.dumps(first_question.model_dump(mode="json", exclude_none=True), indent=2),
+            max_questions=max_questions,
+            follow_up_depth=max_questions - 1,
+        )
+        result = await self._generate_json(
+            kind=QUESTION_PLAN,
+            system=QUESTION_PLAN_SYSTEM,
+            acknowledgement="I understand. I'll plan the follow-up questions and return JSON only.",
+            prompt=prompt,
+            temperature=0.5,
+            timeout=self.settings.ai_question_plan_timeout_seconds,
+            usable=lambda r: isinstance(r, dict) and build_plan(first_question, r.get("next"), max_questions) is not None,
+        )
+        return build_plan(first_question, result.get("next"), max_questions)
+
+    # =========================================================================
+    # SPECULATIVE PREFETCH
+    # =========================================================================
+
+    def _prefetch_next_questions(
+        self,
+        session_id: str,
+        turn_index: int,
+        max_questions: int,
+        form: IntakeFormRequest,
+        triggers: list[AITriggerReason],
+        previous_turns: list[dict],
+        question: AIQuestion,
+    ) -> None:
+        """Start generating the follow-up question for each likely option.
+
+        Only single_choice turns are prefetched, and only options whose
+        predicted form would still need another question.
+
+        Args:
+            session_id: AI session ID
+            turn_index: Index of the turn just created
+            max_questions: Session question limit
+            form: Form state when the turn was created
+            triggers: Session trigger reasons
+            previous_turns: Turns before this one
+            question: The question just asked
+        """
+        if not self.llm or not self.settings.ai_prefetch_enabled:
+            return
+        if self.breaker is not None and self.breaker.state != CircuitState.CLOSED:
+            return  # Fallback questions are instant; nothing to prefetch
+        if question.question_type != AIQuestionType.SINGLE_CHOICE or not question.options:
+            return
+
+        # After this answer the session has asked turn_index + 1 questions
+        question_count = turn_index + 1
+        if question_count >= max_questions:
+            return
+
+        branches = {}
+        for option in question.options[: self.settings.ai_prefetch_max_options]:
+            predicted = self._apply_option(form, option)
+            if evaluate_gate(predicted).gate_status == GateStatus.PASS:
+                continue  # Session would resolve; no next question
+
+            answered_turns = previous_turns + [{
+                "turn_index": turn_index,
+                "question_text": question.question_text,
+                "answer_text": option.label,
+                "target_field": question.target_field,
+            }]
+            branches[option.value] = (
+                self._question_fingerprint(predicted),
+                partial(
+                    self._generate_question,
+                    session={"question_count": question_count, "max_questions": max_questions},
+                    form=predicted,
+                    issues=self._triggers_to_issues(triggers, predicted),
+                    previous_turns=answered_turns,
+                ),
+            )
+
+        if branches:
+            self.prefetcher.schedule(session_id, turn_index, branches)
+
+    def _apply_option(self, form: IntakeFormRequest, option: QuestionOption) -> IntakeFormRequest:
+        """Predict the form after an option is chosen.
+
+        Mirrors the field update applied by record_clarification_answer.
+        """
+        if option.maps_to_field not in PREFETCH_MAPPABLE_FIELDS or option.maps_to_value is None:
+            return form
+
+        enum_type = IntakeFormRequest.model_fields[option.maps_to_field].annotation
+        try:
+            value = enum_type(option.maps_to_value)
+        except ValueError:
+            return form
+        return form.model_copy(update={option.maps_to_field: value})
+
+    def _apply_field_delta(
+        self,
+        form: IntakeFormRequest,
+        field: Optional[str],
+        new_value: Any,
+    ) -> Optional[IntakeFormRequest]:
+        """Apply the field update reported by record_clarification_answer.
+
+        Args:
+            form: Form before the answer
+            field: field_updated (None if the answer changed nothing)
+            new_value: The field's new value (full text for context_raw)
+
+        Returns:
+            The updated form, or None if the delta can't be applied locally
+        """
+        if field is None:
+            return form
+        if field == "context_raw":
+            if not isinstance(new_value, str):
+                return None
+            return form.model_copy(update={"context_raw": new_value})
+        if field not in PREFETCH_MAPPABLE_FIELDS:
+            return None
+
+        enum_type = IntakeFormRequest.model_fields[field].annotation
+        try:
+            value = enum_type(new_value)
+        except ValueError:
+            return None
+        return form.model_copy(update={field: value})
+
+    @staticmethod
+    def _question_fingerprint(form: IntakeFormRequest) -> tuple:
+        """The form state a generated question depends on."""
+        return (
+            form.service_type,
+            form.budget_range,
+            form.timeline,
+            form.access_model,
+            form.role_title,
+            form.context_raw,
+        )
+
     def _get_fallback_question(
         self,
         form: IntakeFormRequest,
@@ -571,27 +1285,87 @@ class AIAssistantService:
             "expires_at": expires_at.isoformat(),
         }
 
-        result = self.supabase.client.table("ai_sessions").insert(session_data).execute()
-        return result.data[0]
+        result = await self.supabase.client.table("ai_sessions").insert(session_data).execute()
+        session = result.data[0]
+        if self.session_cache is not None:
+            self.session_cache.put_session(session)
+        return session
 
     async def _get_session(self, session_id: str) -> Optional[dict]:
-        """Get an AI session by ID."""
-        result = self.supabase.client.table("ai_sessions").select("*").eq("id", session_id).execute()
-        return result.data[0] if result.data else None
+        """Get an AI session by ID (from the session cache when possible)."""
+        if self.session_cache is not None:
+            cached = self.session_cache.get(session_id)
+            if cached is not None:
+                return cached.as_dict()
+
+        result = await self.supabase.client.table("ai_sessions").select("*").eq("id", session_id).execute()
+        if not result.data:
+            return None
+        if self.session_cache is not None:
+            self.session_cache.put_session(result.data[0])
+        return result.data[0]
 
-    async def _update_session(self, session_id: str, updates: dict) -> None:
-        """Update session fields."""
-        self.supabase.client.table("ai_sessions").update(updates).eq("id", session_id).execute()
+    async def _update_session(
+        self,
+        session_id: str,
+        updates: dict,
+        expected_version: Optional[int] = None,
+    ) -> None:
+        """Update session fields (written through to the session cache).
+
+        Args:
+            session_id: AI session ID
+            updates: Columns to set
+            expected_version: Cache version the caller based the update on
+                (None = don't check)
+        """
+        await self.supabase.client.table("ai_sessions").update(updates).eq("id", session_id).execute()
+        if self.session_cache is not None:
+            self.session_cache.update_session(session_id, updates, expected_version)
+
+    def _check_cached_answer(self, session_id: str, turn_index: int) -> Optional[SessionRecord]:
+        """Reject an answer the cached session state already rules out.
+
+        Mirrors the validation of record_clarification_answer (which remains
+        authoritative).
+
+        Returns:
+            The cached session the answer is based on (None if not cached)
+
+        Raises:
+            ValueError: Session not active or question already answered
+        """
+        if self.session_cache is None:
+            return None
+        cached = self.session_cache.get(session_id)
+        if cached is None:
+            return None
+        if cached.status != AISessionStatus.ACTIVE.value:
+            raise ValueError(f"Session is {cached.status}, not active")
+        turn = cached.turns.get(turn_index)
+        if turn is not None and turn.answered_at is not None:
+            raise ValueError("Question already answered")
+        return cached
 
     async def _complete_session(
         self,
         session_id: str,
         status: AISessionStatus,
         gate_result: GateEvaluationResult,
+        turns: Optional[list[dict]] = None,
+        expected_version: Optional[int] = None,
     ) -> None:
-        """Complete a session and build final output."""
-        # Get all turns for this session
-        turns = await self._get_all_turns(session_id)
+        """Complete a session and build final output.
+
+        Args:
+            session_id: AI session ID
+            status: Final session status
+            gate_result: Final gate evaluation
+            turns: Session turns if already loaded (fetched otherwise)
+            expected_version: Cache version the caller based the update on
+        """
+        if turns is None:
+            turns = await self._get_all_turns(session_id)
 
         # Build clarifications from turns with field updates
         clarifications = []
@@ -623,7 +1397,7 @@ class AIAssistantService:
             "latest_gate_status": gate_result.gate_status.value,
             "latest_routing_result": gate_result.routing_result.value,
             "final_output": final_output.model_dump(),
-        })
+        }, expected_version=expected_version)
 
     # =========================================================================
     # TURN MANAGEMENT
@@ -639,26 +1413,38 @@ class AIAssistantService:
             "question_purpose": question.question_purpose,
             "options": [opt.model_dump() for opt in question.options] if question.options else None,
             "target_field": question.target_field,
-            "llm_model": self.settings.gemini_model if self.model else None,
+            "llm_model": self.llm.name if self.llm else None,
         }
 
-        result = self.supabase.client.table("ai_turns").insert(turn_data).execute()
-        return result.data[0]
+        result = await self.supabase.client.table("ai_turns").insert(turn_data).execute()
+        turn = result.data[0]
+        if self.session_cache is not None:
+            self.session_cache.put_turns(session_id, [turn])
+        return turn
 
     async def _get_turn(self, session_id: str, turn_index: int) -> Optional[dict]:
-        """Get a specific turn by session ID and index."""
-        result = (
+        """Get a specific turn by session ID and index (cached when possible)."""
+        if self.session_cache is not None:
+            cached = self.session_cache.get_turn(session_id, turn_index)
+            if cached is not None:
+                return cached.as_dict()
+
+        result = await (
             self.supabase.client.table("ai_turns")
             .select("*")
             .eq("session_id", session_id)
             .eq("turn_index", turn_index)
             .execute()
         )
-        return result.data[0] if result.data else None
+        if not result.data:
+            return None
+        if self.session_cache is not None:
+            self.session_cache.put_turns(session_id, result.data)
+        return result.data[0]
 
     async def _get_all_turns(self, session_id: str) -> list[dict]:
         """Get all turns for a session, ordered by turn_index."""
-        result = (
+        result = await (
             self.supabase.client.table("ai_turns")
             .select("*")
             .eq("session_id", session_id)
@@ -667,115 +1453,6 @@ class AIAssistantService:
         )
         return result.data or []
 
-    async def _update_turn_answer(self, turn_id: str, answer_value: Any, turn: dict) -> None:
-        """Update turn with user's answer."""
-        # Determine answer_text based on answer type
-        answer_text = str(answer_value)
-
-        # If it's a choice question, find the label for the selected value
-        if turn.get("options"):
-            for opt in turn["options"]:
-                if opt.get("value") == answer_value:
-                    answer_text = opt.get("label", str(answer_value))
-                    break
-
-        self.supabase.client.table("ai_turns").update({
-            "answer_value": answer_value if isinstance(answer_value, (dict, list)) else {"value": answer_value},
-            "answer_text": answer_text,
-            "answered_at": datetime.now(timezone.utc).isoformat(),
-        }).eq("id", turn_id).execute()
-
-    async def _apply_field_update(
-        self,
-        session: dict,
-        turn: dict,
-        answer_value: Any,
-    ) -> tuple[Optional[str], Any, Any]:
-        """Apply field update to inquiry if applicable.
-
-        Returns:
-            Tuple of (field_updated, old_value, new_value) or (None, None, None)
-        """
-        # Check if this answer maps to a field update
-        if not turn.get("options"):
-            # Text answer - might update context_raw
-            if turn.get("target_field") == "context_raw" and isinstance(answer_value, str):
-                inquiry = await self.supabase.get_inquiry(session["inquiry_id"])
-                old_value = inquiry.get("context_raw", "")
-                new_value = old_value + "\n\n" + answer_value if old_value else answer_value
-
-                await self.supabase.update_inquiry(session["inquiry_id"], {"context_raw": new_value})
-
-                # Update turn record
-                self.supabase.client.table("ai_turns").update({
-                    "field_updated": True,
-                    "old_field_value": old_value,
-                    "new_field_value": new_value,
-                }).eq("id", turn["id"]).execute()
-
-                # Update session field_updates
-                field_updates = session.get("field_updates", {})
-                field_updates["context_raw"] = {
-                    "old": old_value,
-                    "new": new_value,
-                    "turn_index": turn["turn_index"],
-                }
-                await self._update_session(session["id"], {"field_updates": field_updates})
-
-                return "context_raw", old_value, new_value
-
-            return None, None, None
-
-        # Choice question - find the selected option
-        selected_option = None
-        for opt in turn["options"]:
-            if opt.get("value") == answer_value:
-                selected_option = opt
-                break
-
-        if not selected_option:
-            return None, None, None
-
-        # Check if this option updates a field
-        maps_to_field = selected_option.get("maps_to_field")
-        maps_to_value = selected_option.get("maps_to_value")
-
-        if not maps_to_field or maps_to_value is None:
-            # "Keep current selection" or similar - no update
-            return None, None, None
-
-        # Get current value
-        inquiry = await self.supabase.get_inquiry(session["inquiry_id"])
-        old_value = inquiry.get(maps_to_field)
-
-        # Update inquiry
-        await self.supabase.update_inquiry(session["inquiry_id"], {maps_to_field: maps_to_value})
-
-        # Update turn record
-        self.supabase.client.table("ai_turns").update({
-            "field_updated": True,
-            "old_field_value": old_value,
-            "new_field_value": maps_to_value,
-        }).eq("id", turn["id"]).execute()
-
-        # Update session field_updates
-        field_updates = session.get("field_updates", {})
-        field_updates[maps_to_field] = {
-            "old": old_value,
-            "new": maps_to_value,
-            "turn_index": turn["turn_index"],
-        }
-        await self._update_session(session["id"], {"field_updates": field_updates})
-
-        # Log budget upgrade if applicable
-        if maps_to_field == "budget_range":
-            budget_order = {"under_10k": 0, "10k_25k": 1, "25k_50k": 2, "over_50k": 3, "unsure": 0}
-            if budget_order.get(maps_to_value, 0) > budget_order.get(old_value, 0):
-                # This is a budget upgrade - could add a note to inquiry
-                pass
-
-        return maps_to_field, old_value, maps_to_value
-
     # =========================================================================
     # HELPER METHODS
     # =========================================================================
@@ -0,0 +1,190 @@
+"""Background worker for asynchronous AI analysis of intake submissions.
+
+In async analysis mode, /api/intake creates the inquiry and returns the
+provisional (rule-based) routing immediately. Trigger detection and
+first-question generation run here, off the request path, with bounded
+concurrency and a bounded queue. Results are kept in memory for polling
+and recorded as an inquiry event so any worker process can serve them.
+"""
+
+import asyncio
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from app.config import get_settings
+from app.schemas.ai_assistant import AIAnalysisStatus, AIAnalysisStatusResponse
+from app.schemas.intake import GateEvaluationResult, IntakeFormRequest
+from app.services.ai_assistant import get_ai_assistant
+from app.services.supabase import get_supabase_service
+
+ANALYSIS_EVENT_TYPE = "ai_analysis_completed"
+
+
+@dataclass
+class AnalysisJob:
+    """A submission waiting for AI analysis."""
+
+    inquiry_id: str
+    form: IntakeFormRequest
+    gate_result: GateEvaluationResult
+
+
+class AnalysisWorker:
+    """Bounded worker pool running analyze_submission in the background."""
+
+    # Number of recent results kept in memory for polling
+    RESULT_CAPACITY = 1000
+
+    def __init__(self, concurrency: int, queue_size: int):
+        self.concurrency = concurrency
+        self._queue: asyncio.Queue[AnalysisJob] = asyncio.Queue(maxsize=queue_size)
+        self._results: OrderedDict[str, AIAnalysisStatusResponse] = OrderedDict()
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """Start the worker tasks (called from lifespan startup)."""
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._run(), name=f"ai-analysis-{i}")
+                for i in range(self.concurrency)
+            ]
+
+    async def stop(self, drain_timeout: float = 10.0) -> None:
+        """Give queued jobs a chance to finish, then cancel the workers."""
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            print(f"AI analysis worker stopping with {self._queue.qsize()} jobs queued")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(
+        self,
+        inquiry_id: str,
+        form: IntakeFormRequest,
+        gate_result: GateEvaluationResult,
+    ) -> bool:
+        """Queue a submission for analysis.
+
+        Returns:
+            False if the worker is not running or the queue is full (caller
+            should analyze inline instead)
+        """
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait(AnalysisJob(inquiry_id, form, gate_result))
+        except asyncio.QueueFull:
+            return False
+
+        self._store(AIAnalysisStatusResponse(
+            inquiry_id=inquiry_id,
+            status=AIAnalysisStatus.PENDING,
+            gate_status=gate_result.gate_status.value,
+            routing_result=gate_result.routing_result.value,
+        ))
+        return True
+
+    async def get_status(self, inquiry_id: str) -> Optional[AIAnalysisStatusResponse]:
+        """Get analysis status, falling back to the recorded inquiry event."""
+        status = self._results.get(inquiry_id)
+        if status is not None:
+            return status
+
+        event = await get_supabase_service().get_latest_inquiry_event(
+            inquiry_id, ANALYSIS_EVENT_TYPE
+        )
+        if not event or not event.get("new_value"):
+            return None
+        return AIAnalysisStatusResponse(inquiry_id=inquiry_id, **json.loads(event["new_value"]))
+
+    async def _run(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._analyze(job)
+            finally:
+                self._queue.task_done()
+
+    async def _analyze(self, job: AnalysisJob) -> None:
+        try:
+            result = await get_ai_assistant().analyze_submission(
+                form=job.form,
+                inquiry_id=job.inquiry_id,
+                gate_result=job.gate_result,
+            )
+        except Exception as e:
+            print(f"Background AI analysis error for {job.inquiry_id}: {e}")
+            self._store(AIAnalysisStatusResponse(
+                inquiry_id=job.inquiry_id,
+                status=AIAnalysisStatus.FAILED,
+                gate_status=job.gate_result.gate_status.value,
+                routing_result=job.gate_result.routing_result.value,
+            ))
+            return
+
+        if result.needs_clarification:
+            status = AIAnalysisStatusResponse(
+                inquiry_id=job.inquiry_id,
+                status=AIAnalysisStatus.COMPLETE,
+                needs_clarification=True,
+                ai_session_id=result.session_id,
+                first_question=result.first_question,
+                gate_status=job.gate_result.gate_status.value,
+                routing_result=job.gate_result.routing_result.value,
+                message="A few quick questions to help us understand your needs better.",
+            )
+        else:
+            status = AIAnalysisStatusResponse(
+                inquiry_id=job.inquiry_id,
+                status=AIAnalysisStatus.COMPLETE,
+                gate_status=result.gate_status,
+                routing_result=result.routing_result,
+                message=result.message,
+            )
+        self._store(status)
+
+        # Record the outcome (with the first question) so other worker
+        # processes can answer polls
+        try:
+            await get_supabase_service().create_inquiry_event(
+                inquiry_id=job.inquiry_id,
+                event_type=ANALYSIS_EVENT_TYPE,
+                actor_type="system",
+                new_value=status.model_dump_json(exclude={"inquiry_id"}),
+                reason="Background AI analysis",
+            )
+        except Exception as e:
+            print(f"Failed to record AI analysis event for {job.inquiry_id}: {e}")
+
+    def _store(self, status: AIAnalysisStatusResponse) -> None:
+        self._results[status.inquiry_id] = status
+        self._results.move_to_end(status.inquiry_id)
+        while len(self._results) > self.RESULT_CAPACITY:
+            self._results.popitem(last=False)
+
+
+# Singleton instance
+_analysis_worker: Optional[AnalysisWorker] = None
+
+
+def get_analysis_worker() -> AnalysisWorker:
+    """Get the background analysis worker singleton."""
+    global _analysis_worker
+    if _analysis_worker is None:
+        settings = get_settings()
+        _analysis_worker = AnalysisWorker(
+            concurrency=settings.ai_analysis_concurrency,
+            queue_size=settings.ai_analysis_queue_size,
+        )
+    return _analysis_worker
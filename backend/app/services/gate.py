@@ -1,4 +1,20 @@
-"""Gate logic service for lead qualification and routing."""
+"""Gate logic service for lead qualification and routing.
+
+The gate rules are declarative (GateRules and STATUS_RULES) and compiled
+into an immutable decision table (CompiledGate) when a rules version is
+published. A new version can be published at runtime (e.g. by the rules
+file watcher) and replaces the active engine atomically.
+"""
+
+import asyncio
+import json
+import os
+from dataclasses import dataclass, replace
+from functools import reduce
+from itertools import product
+from operator import or_
+from types import MappingProxyType
+from typing import Any, Optional
 
 from app.config import get_settings
 from app.schemas.intake import (
@@ -109,6 +125,391 @@ def has_sufficient_context(context: str) -> bool:
     return len(context) >= settings.gate_min_context_length
 
 
+# ============================================================================
+# DECLARATIVE RULES
+# ============================================================================
+
+# The six gate criteria (all required for pass), in reporting order
+GATE_CRITERIA = (
+    "business_email",
+    "qualified_access",
+    "urgent_timeline",
+    "budget_threshold",
+    "senior_role",
+    "context_length",
+)
+
+# Everything a status rule can test: the criteria plus derived facts
+GATE_FACTS = GATE_CRITERIA + (
+    "access_review",  # Access model requires manual review
+    "exploring",  # Timeline = exploring
+    "qualifying_budget",  # Budget in QUALIFYING_BUDGETS
+    "budget_unsure",  # Budget = unsure
+    "ic_other_non_decision_maker",  # IC/Other without decision-maker authority
+    "very_short_context",  # Context under 20 characters
+)
+
+FACT_BITS = MappingProxyType({name: 1 << i for i, name in enumerate(GATE_FACTS)})
+
+VERY_SHORT_CONTEXT_LENGTH = 20
+
+
+@dataclass(frozen=True)
+class StatusRule:
+    """Gate status that applies when all of the required facts hold."""
+
+    status: GateStatus
+    requires: frozenset[str]
+
+
+# Checked in order; the first matching rule decides, otherwise the gate fails
+STATUS_RULES = (
+    # Access flagged = manual review required
+    StatusRule(GateStatus.MANUAL, frozenset({"access_review"})),
+    # All criteria passed = gate pass
+    StatusRule(GateStatus.PASS, frozenset(GATE_CRITERIA)),
+    # IC/Other non-decision-maker with all other signals strong
+    StatusRule(GateStatus.MANUAL, frozenset({
+        "ic_other_non_decision_maker",
+        "qualifying_budget",
+        "urgent_timeline",
+        "qualified_access",
+        "context_length",
+        "business_email",
+    })),
+    # "Not sure" budget with all other signals strong
+    StatusRule(GateStatus.MANUAL, frozenset({
+        "budget_unsure",
+        "senior_role",
+        "urgent_timeline",
+        "qualified_access",
+        "context_length",
+        "business_email",
+    })),
+)
+
+
+def _ordered(enum_type, members) -> tuple:
+    """Members in enum definition order (stable criteria text)."""
+    return tuple(m for m in enum_type if m in members)
+
+
+@dataclass(frozen=True)
+class GateRules:
+    """One version of the gate rules.
+
+    Built from Settings at startup; a rules file (Settings.gate_rules_path)
+    can publish a new version at runtime, overriding any of the fields.
+    """
+
+    version: str
+    min_context_length: int
+    min_budget: BudgetRange
+    personal_email_domains: tuple[str, ...]
+    qualified_access_models: tuple[AccessModel, ...] = _ordered(AccessModel, QUALIFIED_ACCESS_MODELS)
+    manual_review_access_models: tuple[AccessModel, ...] = _ordered(AccessModel, MANUAL_REVIEW_ACCESS_MODELS)
+    senior_roles: tuple[RoleTitle, ...] = _ordered(RoleTitle, SENIOR_ROLES)
+    urgent_timelines: tuple[Timeline, ...] = _ordered(Timeline, URGENT_TIMELINES)
+    qualifying_budgets: tuple[BudgetRange, ...] = _ordered(BudgetRange, QUALIFYING_BUDGETS)
+    status_rules: tuple[StatusRule, ...] = STATUS_RULES
+
+    @classmethod
+    def from_settings(cls, settings) -> "GateRules":
+        return cls(
+            version=settings.rules_version,
+            min_context_length=settings.gate_min_context_length,
+            min_budget=BudgetRange(settings.gate_min_budget_threshold),
+            personal_email_domains=tuple(settings.personal_email_domains),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], base: "GateRules") -> "GateRules":
+        """Rules from a published rules document; missing keys keep base's values.
+
+        Raises:
+            ValueError: Missing rules_version, unknown enum value or fact
+        """
+        if not data.get("rules_version"):
+            raise ValueError("Gate rules document has no rules_version")
+
+        changes: dict[str, Any] = {"version": str(data["rules_version"])}
+        if "min_context_length" in data:
+            changes["min_context_length"] = int(data["min_context_length"])
+        if "min_budget_threshold" in data:
+            changes["min_budget"] = BudgetRange(data["min_budget_threshold"])
+        if "personal_email_domains" in data:
+            changes["personal_email_domains"] = tuple(d.lower() for d in data["personal_email_domains"])
+        for name, enum_type in (
+            ("qualified_access_models", AccessModel),
+            ("manual_review_access_models", AccessModel),
+            ("senior_roles", RoleTitle),
+            ("urgent_timelines", Timeline),
+            ("qualifying_budgets", BudgetRange),
+        ):
+            if name in data:
+                changes[name] = _ordered(enum_type, {enum_type(v) for v in data[name]})
+        if "status_rules" in data:
+            changes["status_rules"] = tuple(
+                StatusRule(GateStatus(rule["status"]), frozenset(rule["requires"]))
+                for rule in data["status_rules"]
+            )
+        return replace(base, **changes)
+
+
+# ============================================================================
+# COMPILED ENGINE
+# ============================================================================
+
+@dataclass(frozen=True)
+class GateOutcome:
+    """Everything the gate decides for one fact mask."""
+
+    gate_status: GateStatus
+    qualification: Qualification
+    results: tuple[tuple[str, bool], ...]
+    passed: tuple[str, ...]
+    failed: tuple[str, ...]
+    flags: tuple[str, ...]
+    qualified_access: bool
+
+
+class CompiledGate:
+    """Gate rules compiled into lookup tables.
+
+    Each enum field maps to the bits of the facts it contributes; the email
+    domain and context length add theirs, and the OR of them indexes a
+    table holding the precomputed status, qualification, criteria results
+    and flags. Routing is a second table keyed by (service type, status,
+    access qualified). An evaluation is a handful of dict lookups.
+    """
+
+    __slots__ = (
+        "rules",
+        "criteria",
+        "_personal_domains",
+        "access_bits",
+        "timeline_bits",
+        "budget_bits",
+        "role_bits",
+        "outcomes",
+        "routing",
+    )
+
+    def __init__(self, rules: GateRules):
+        for rule in rules.status_rules:
+            unknown = rule.requires - FACT_BITS.keys()
+            if unknown:
+                raise ValueError(f"Unknown gate facts in status rule: {sorted(unknown)}")
+
+        self.rules = rules
+        self.criteria = MappingProxyType({
+            "business_email": f"Email domain is business (not {list(rules.personal_email_domains[:3])}...)",
+            "qualified_access": f"Access model in {[a.value for a in rules.qualified_access_models]}",
+            "urgent_timeline": f"Timeline in {[t.value for t in rules.urgent_timelines]}",
+            "budget_threshold": f"Budget >= {rules.min_budget.value}",
+            "senior_role": f"Role in {[r.value for r in rules.senior_roles]} or IC/Other with decision-maker authority",
+            "context_length": f"Context length >= {rules.min_context_length} chars",
+        })
+        self._personal_domains = frozenset(rules.personal_email_domains)
+
+        self.access_bits = {
+            access: _bits(
+                qualified_access=access in rules.qualified_access_models,
+                access_review=access in rules.manual_review_access_models,
+            )
+            for access in AccessModel
+        }
+        self.timeline_bits = {
+            timeline: _bits(
+                urgent_timeline=timeline in rules.urgent_timelines,
+                exploring=timeline == Timeline.EXPLORING,
+            )
+            for timeline in Timeline
+        }
+        self.budget_bits = {
+            budget: _bits(
+                budget_threshold=BUDGET_ORDER[budget] >= BUDGET_ORDER[rules.min_budget],
+                qualifying_budget=budget in rules.qualifying_budgets,
+                budget_unsure=budget == BudgetRange.UNSURE,
+            )
+            for budget in BudgetRange
+        }
+        self.role_bits = {
+            (role, is_decision_maker): _bits(
+                senior_role=role in rules.senior_roles or (
+                    role in {RoleTitle.IC_ENGINEER, RoleTitle.OTHER} and is_decision_maker is True
+                ),
+                ic_other_non_decision_maker=(
+                    role in {RoleTitle.IC_ENGINEER, RoleTitle.OTHER} and is_decision_maker is not True
+                ),
+            )
+            for role in RoleTitle
+            for is_decision_maker in (True, False, None)
+        }
+
+        email = (0, FACT_BITS["business_email"])
+        context = (0, FACT_BITS["context_length"], FACT_BITS["very_short_context"],
+                   FACT_BITS["context_length"] | FACT_BITS["very_short_context"])
+        self.outcomes = {}
+        for parts in product(
+            set(self.access_bits.values()),
+            set(self.timeline_bits.values()),
+            set(self.budget_bits.values()),
+            set(self.role_bits.values()),
+            email,
+            context,
+        ):
+            mask = reduce(or_, parts)
+            self.outcomes[mask] = self._decide(mask)
+
+        self.routing = MappingProxyType({
+            (service_type, gate_status, qualified): determine_routing(service_type, gate_status, qualified)
+            for service_type in ServiceType
+            for gate_status in GateStatus
+            for qualified in (True, False)
+        })
+
+        # Read-only from here on (also used by gate_batch)
+        self.access_bits = MappingProxyType(self.access_bits)
+        self.timeline_bits = MappingProxyType(self.timeline_bits)
+        self.budget_bits = MappingProxyType(self.budget_bits)
+        self.role_bits = MappingProxyType(self.role_bits)
+        self.outcomes = MappingProxyType(self.outcomes)
+
+    def _decide(self, mask: int) -> GateOutcome:
+        facts = {name for name, bit in FACT_BITS.items() if mask & bit}
+
+        gate_status = GateStatus.FAIL
+        for rule in self.rules.status_rules:
+            if rule.requires <= facts:
+                gate_status = rule.status
+                break
+
+        flags = []
+        if "business_email" not in facts:
+            flags.append("personal_email")
+        if "very_short_context" in facts:
+            flags.append("very_short_context")
+        if "exploring" in facts:
+            flags.append("just_exploring")
+        if "access_review" in facts:
+            flags.append("access_requires_review")
+
+        if "access_review" in facts:
+            qualification = Qualification.FLAGGED
+        elif flags:
+            qualification = Qualification.LOW_QUALITY if "very_short_context" in flags else Qualification.FLAGGED
+        else:
+            qualification = Qualification.QUALIFIED
+
+        return GateOutcome(
+            gate_status=gate_status,
+            qualification=qualification,
+            results=tuple((name, name in facts) for name in GATE_CRITERIA),
+            passed=tuple(name for name in GATE_CRITERIA if name in facts),
+            failed=tuple(name for name in GATE_CRITERIA if name not in facts),
+            flags=tuple(flags),
+            qualified_access="qualified_access" in facts,
+        )
+
+    def evaluate(self, form: IntakeFormRequest) -> GateEvaluationResult:
+        """Evaluate the gate for a submission (see evaluate_gate)."""
+        is_decision_maker = form.answers_raw.is_decision_maker if form.answers_raw else None
+        context_length = len(form.context_raw)
+
+        mask = (
+            self.access_bits[form.access_model]
+            | self.timeline_bits[form.timeline]
+            | self.budget_bits[form.budget_range]
+            | self.role_bits[form.role_title, is_decision_maker]
+        )
+        if extract_email_domain(form.email) not in self._personal_domains:
+            mask |= FACT_BITS["business_email"]
+        if context_length >= self.rules.min_context_length:
+            mask |= FACT_BITS["context_length"]
+        if context_length < VERY_SHORT_CONTEXT_LENGTH:
+            mask |= FACT_BITS["very_short_context"]
+
+        outcome = self.outcomes[mask]
+        return GateEvaluationResult(
+            gate_status=outcome.gate_status,
+            gate_details=GateDetails(
+                criteria=dict(self.criteria),
+                results=dict(outcome.results),
+                passed=list(outcome.passed),
+                failed=list(outcome.failed),
+            ),
+            qualification=outcome.qualification,
+            routing_result=self.routing[form.service_type, outcome.gate_status, outcome.qualified_access],
+            flags=list(outcome.flags),
+            rules_version=self.rules.version,
+        )
+
+
+def _bits(**facts: bool) -> int:
+    return reduce(or_, (FACT_BITS[name] for name, holds in facts.items() if holds), 0)
+
+
+# Active engine; replaced wholesale (a single reference swap) on publish, so
+# an evaluation always sees one consistent rules version
+_engine: Optional[CompiledGate] = None
+
+
+def get_gate_engine() -> CompiledGate:
+    """The active gate engine (compiled from Settings on first use)."""
+    engine = _engine
+    if engine is None:
+        engine = publish_gate_rules(GateRules.from_settings(get_settings()))
+    return engine
+
+
+def publish_gate_rules(rules: GateRules) -> CompiledGate:
+    """Compile a rules version and make it the active engine.
+
+    Compilation happens before the swap, so in-flight evaluations keep
+    using the previous version and invalid rules never become active.
+
+    Raises:
+        ValueError: If the rules don't compile
+    """
+    global _engine
+    engine = CompiledGate(rules)
+    _engine = engine
+    print(f"Gate rules {rules.version} active")
+    return engine
+
+
+def load_gate_rules(path: str) -> GateRules:
+    """Read a published rules document (JSON) on top of the Settings rules.
+
+    Raises:
+        OSError, ValueError: If the file can't be read or is invalid
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return GateRules.from_dict(data, base=GateRules.from_settings(get_settings()))
+
+
+async def watch_gate_rules(path: str, interval_seconds: float) -> None:
+    """Publish the rules file whenever it carries a new rules_version.
+
+    Runs until cancelled; an unreadable or invalid file is logged and the
+    active rules stay in place.
+    """
+    last_mtime = None
+    while True:
+        try:
+            mtime = os.stat(path).st_mtime
+            if mtime != last_mtime:
+                last_mtime = mtime
+                rules = load_gate_rules(path)
+                if rules.version != get_gate_engine().rules.version:
+                    publish_gate_rules(rules)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Gate rules not loaded from {path}: {e}")
+        await asyncio.sleep(interval_seconds)
+
+
 def evaluate_gate(form: IntakeFormRequest) -> GateEvaluationResult:
     """Evaluate the high-signal gate for an intake submission.
 
@@ -120,138 +521,22 @@ def evaluate_gate(form: IntakeFormRequest) -> GateEvaluationResult:
     - Role/title indicates seniority (or IC/Other with decision-maker authority)
     - Context length >= 100 characters
 
-    Special cases:
+    Special cases (STATUS_RULES):
     - Paid advisory service bypasses gate entirely
     - IC/Other with strong signals → manual review (not fail)
     - "Not sure" budget with strong signals → manual review
     - Access flagged → manual review
 
+    Thresholds and criteria sets come from the active rules version (see
+    GateRules); the result records which version decided it.
+
     Args:
         form: The intake form submission
 
     Returns:
         GateEvaluationResult with status, details, qualification, and routing
     """
-    settings = get_settings()
-    flags: list[str] = []
-
-    # Extract is_decision_maker from answers_raw
-    is_decision_maker = None
-    if form.answers_raw:
-        is_decision_maker = form.answers_raw.is_decision_maker
-
-    # Evaluate each criterion
-    criteria = {
-        "business_email": f"Email domain is business (not {settings.personal_email_domains[:3]}...)",
-        "qualified_access": f"Access model in {[a.value for a in QUALIFIED_ACCESS_MODELS]}",
-        "urgent_timeline": f"Timeline in {[t.value for t in URGENT_TIMELINES]}",
-        "budget_threshold": f"Budget >= {settings.gate_min_budget_threshold}",
-        "senior_role": f"Role in {[r.value for r in SENIOR_ROLES]} or IC/Other with decision-maker authority",
-        "context_length": f"Context length >= {settings.gate_min_context_length} chars",
-    }
-
-    results = {
-        "business_email": is_business_email(form.email),
-        "qualified_access": is_qualified_access(form.access_model),
-        "urgent_timeline": is_urgent_timeline(form.timeline),
-        "budget_threshold": meets_budget_threshold(form.budget_range),
-        "senior_role": is_senior_role(form.role_title, is_decision_maker),
-        "context_length": has_sufficient_context(form.context_raw),
-    }
-
-    passed = [k for k, v in results.items() if v]
-    failed = [k for k, v in results.items() if not v]
-
-    gate_details = GateDetails(
-        criteria=criteria,
-        results=results,
-        passed=passed,
-        failed=failed,
-    )
-
-    # Add flags for specific conditions
-    if not results["business_email"]:
-        flags.append("personal_email")
-    if len(form.context_raw) < 20:
-        flags.append("very_short_context")
-    if form.timeline == Timeline.EXPLORING:
-        flags.append("just_exploring")
-    if form.access_model in MANUAL_REVIEW_ACCESS_MODELS:
-        flags.append("access_requires_review")
-
-    # Determine qualification
-    if form.access_model in MANUAL_REVIEW_ACCESS_MODELS:
-        qualification = Qualification.FLAGGED
-    elif flags:
-        qualification = Qualification.LOW_QUALITY if "very_short_context" in flags else Qualification.FLAGGED
-    else:
-        qualification = Qualification.QUALIFIED
-
-    # Determine gate status with new logic
-    gate_status = _determine_gate_status(form, results, is_decision_maker)
-
-    # Determine routing based on service type and gate status
-    routing_result = determine_routing(form.service_type, gate_status, results["qualified_access"])
-
-    return GateEvaluationResult(
-        gate_status=gate_status,
-        gate_details=gate_details,
-        qualification=qualification,
-        routing_result=routing_result,
-        flags=flags,
-    )
-
-
-def _determine_gate_status(
-    form: IntakeFormRequest,
-    results: dict[str, bool],
-    is_decision_maker: bool | None,
-) -> GateStatus:
-    """Determine gate status based on criteria results and special cases.
-
-    Logic:
-    1. Access flagged (managed_devices, onpremise_only, unsure) → manual review
-    2. All criteria pass → pass
-    3. IC/Other (non-decision-maker) with strong signals → manual review
-    4. "Not sure" budget with strong signals → manual review
-    5. Otherwise → fail
-    """
-    # Access flagged = manual review required
-    if form.access_model in MANUAL_REVIEW_ACCESS_MODELS:
-        return GateStatus.MANUAL
-
-    # All criteria passed = gate pass
-    if all(results.values()):
-        return GateStatus.PASS
-
-    # Special case: IC/Other non-decision-maker with strong signals → manual review
-    if form.role_title in {RoleTitle.IC_ENGINEER, RoleTitle.OTHER}:
-        if is_decision_maker is not True:  # Not a decision maker
-            # Check if all OTHER signals are strong
-            has_qualifying_budget = form.budget_range in QUALIFYING_BUDGETS
-            has_urgent_timeline = form.timeline in URGENT_TIMELINES
-            has_qualified_access = form.access_model in QUALIFIED_ACCESS_MODELS
-            has_sufficient_context = results["context_length"]
-            has_business_email = results["business_email"]
-
-            if (has_qualifying_budget and has_urgent_timeline and
-                has_qualified_access and has_sufficient_context and has_business_email):
-                return GateStatus.MANUAL
-
-    # Special case: "Not sure" budget with strong signals → manual review
-    if form.budget_range == BudgetRange.UNSURE:
-        has_senior_role = results["senior_role"]
-        has_urgent_timeline = form.timeline in URGENT_TIMELINES
-        has_qualified_access = form.access_model in QUALIFIED_ACCESS_MODELS
-        has_sufficient_context = results["context_length"]
-        has_business_email = results["business_email"]
-
-        if (has_senior_role and has_urgent_timeline and
-            has_qualified_access and has_sufficient_context and has_business_email):
-            return GateStatus.MANUAL
-
-    # Default: fail
-    return GateStatus.FAIL
+    return get_gate_engine().evaluate(form)
 
 
 def determine_routing(
@@ -0,0 +1,198 @@
+"""Vectorized gate evaluation for re-scoring inquiries in bulk.
+
+evaluate_gate_many() takes a batch of submissions as columns (enum codes,
+context lengths, business-email flags) and computes gate status,
+qualification and routing for all of them with NumPy, using the lookup
+tables of a CompiledGate. It gives the same answers as evaluate_gate() and
+is used to see how past leads would route under different rules (see
+scripts/rescore_inquiries.py).
+
+Enum codes are positions in the enum's definition order (SERVICE_TYPES,
+ACCESS_MODELS, ...); -1 marks a value the current enums don't know, and
+such rows get -1 in every output column.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+from app.schemas.intake import (
+    AccessModel,
+    BudgetRange,
+    GateStatus,
+    Qualification,
+    RoleTitle,
+    RoutingResult,
+    ServiceType,
+    Timeline,
+)
+from app.services.gate import (
+    FACT_BITS,
+    VERY_SHORT_CONTEXT_LENGTH,
+    CompiledGate,
+    get_gate_engine,
+)
+
+SERVICE_TYPES = tuple(ServiceType)
+ACCESS_MODELS = tuple(AccessModel)
+TIMELINES = tuple(Timeline)
+BUDGET_RANGES = tuple(BudgetRange)
+ROLE_TITLES = tuple(RoleTitle)
+GATE_STATUSES = tuple(GateStatus)
+QUALIFICATIONS = tuple(Qualification)
+ROUTING_RESULTS = tuple(RoutingResult)
+
+# is_decision_maker codes
+DECISION_MAKER_CODES = {True: 1, False: 0, None: -1}
+
+
+def encode(enum_values: tuple, values: Iterable[Any]) -> np.ndarray:
+    """Enum codes for raw values (-1 for unknown values)."""
+    codes = {member.value: i for i, member in enumerate(enum_values)}
+    return np.fromiter((codes.get(v, -1) for v in values), dtype=np.int16)
+
+
+def decode(enum_values: tuple, codes: np.ndarray) -> list[Optional[str]]:
+    """Raw values for enum codes (None for -1)."""
+    return [enum_values[c].value if c >= 0 else None for c in codes.tolist()]
+
+
+@dataclass
+class GateColumns:
+    """A batch of submissions, one array per gate input."""
+
+    service_type: np.ndarray  # int16 codes into SERVICE_TYPES
+    access_model: np.ndarray  # int16 codes into ACCESS_MODELS
+    timeline: np.ndarray  # int16 codes into TIMELINES
+    budget_range: np.ndarray  # int16 codes into BUDGET_RANGES
+    role_title: np.ndarray  # int16 codes into ROLE_TITLES
+    is_decision_maker: np.ndarray  # int8: 1 yes, 0 no, -1 unknown
+    business_email: np.ndarray  # bool
+    context_length: np.ndarray  # int32
+
+    def __len__(self) -> int:
+        return len(self.service_type)
+
+    @property
+    def valid(self) -> np.ndarray:
+        """Rows whose enum values are all known."""
+        return (
+            (self.service_type >= 0)
+            & (self.access_model >= 0)
+            & (self.timeline >= 0)
+            & (self.budget_range >= 0)
+            & (self.role_title >= 0)
+        )
+
+    @classmethod
+    def from_inquiries(
+        cls,
+        rows: list[dict[str, Any]],
+        personal_email_domains: Iterable[str],
+    ) -> "GateColumns":
+        """Columns for inquiry rows.
+
+        Rows need email_domain, the five enum columns, context_raw (or
+        context_length) and optionally is_decision_maker.
+        """
+        personal = frozenset(personal_email_domains)
+        return cls(
+            service_type=encode(SERVICE_TYPES, (r.get("service_type") for r in rows)),
+            access_model=encode(ACCESS_MODELS, (r.get("access_model") for r in rows)),
+            timeline=encode(TIMELINES, (r.get("timeline") for r in rows)),
+            budget_range=encode(BUDGET_RANGES, (r.get("budget_range") for r in rows)),
+            role_title=encode(ROLE_TITLES, (r.get("role_title") for r in rows)),
+            is_decision_maker=np.fromiter(
+                (DECISION_MAKER_CODES.get(r.get("is_decision_maker"), -1) for r in rows),
+                dtype=np.int8,
+            ),
+            business_email=np.fromiter(
+                ((r.get("email_domain") or "").lower() not in personal for r in rows),
+                dtype=bool,
+            ),
+            context_length=np.fromiter(
+                (
+                    r["context_length"] if "context_length" in r else len(r.get("context_raw") or "")
+                    for r in rows
+                ),
+                dtype=np.int32,
+            ),
+        )
+
+
+@dataclass
+class GateBatchResult:
+    """Per-row gate outcome codes (-1 for rows that couldn't be evaluated)."""
+
+    gate_status: np.ndarray  # int8 codes into GATE_STATUSES
+    qualification: np.ndarray  # int8 codes into QUALIFICATIONS
+    routing_result: np.ndarray  # int8 codes into ROUTING_RESULTS
+    rules_version: str
+
+
+def evaluate_gate_many(
+    columns: GateColumns,
+    engine: Optional[CompiledGate] = None,
+) -> GateBatchResult:
+    """Evaluate the gate for a batch of submissions.
+
+    Args:
+        columns: The batch
+        engine: Rules to evaluate with (default: the active rules)
+
+    Returns:
+        GateBatchResult with status, qualification and routing codes
+    """
+    engine = engine or get_gate_engine()
+    valid = columns.valid
+
+    def lookup(table: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        return table[np.where(valid, codes, 0)]
+
+    access_bits = np.array([engine.access_bits[a] for a in ACCESS_MODELS], dtype=np.int64)
+    timeline_bits = np.array([engine.timeline_bits[t] for t in TIMELINES], dtype=np.int64)
+    budget_bits = np.array([engine.budget_bits[b] for b in BUDGET_RANGES], dtype=np.int64)
+    # Role bits by [role code, decision-maker code + 1] (-1/0/1 -> None/False/True)
+    role_bits = np.array(
+        [[engine.role_bits[role, dm] for dm in (None, False, True)] for role in ROLE_TITLES],
+        dtype=np.int64,
+    )
+
+    mask = (
+        lookup(access_bits, columns.access_model)
+        | lookup(timeline_bits, columns.timeline)
+        | lookup(budget_bits, columns.budget_range)
+        | role_bits[np.where(valid, columns.role_title, 0), columns.is_decision_maker.astype(np.int64) + 1]
+        | np.where(columns.business_email, FACT_BITS["business_email"], 0)
+        | np.where(columns.context_length >= engine.rules.min_context_length, FACT_BITS["context_length"], 0)
+        | np.where(columns.context_length < VERY_SHORT_CONTEXT_LENGTH, FACT_BITS["very_short_context"], 0)
+    )
+
+    # Decide each distinct fact mask once
+    masks, inverse = np.unique(mask, return_inverse=True)
+    outcomes = [engine.outcomes[int(m)] for m in masks]
+    status = np.array([GATE_STATUSES.index(o.gate_status) for o in outcomes], dtype=np.int8)[inverse]
+    qualification = np.array(
+        [QUALIFICATIONS.index(o.qualification) for o in outcomes], dtype=np.int8
+    )[inverse]
+    qualified = np.array([o.qualified_access for o in outcomes], dtype=np.int8)[inverse]
+
+    routing_table = np.array(
+        [
+            [
+                [ROUTING_RESULTS.index(engine.routing[service_type, gate_status, q]) for q in (False, True)]
+                for gate_status in GATE_STATUSES
+            ]
+            for service_type in SERVICE_TYPES
+        ],
+        dtype=np.int8,
+    )
+    routing = routing_table[np.where(valid, columns.service_type, 0), status, qualified]
+
+    return GateBatchResult(
+        gate_status=np.where(valid, status, -1).astype(np.int8),
+        qualification=np.where(valid, qualification, -1).astype(np.int8),
+        routing_result=np.where(valid, routing, -1).astype(np.int8),
+        rules_version=engine.rules.version,
+    )
@@ -0,0 +1,251 @@
+"""Shared outbound HTTP connection pool.
+
+One pooled transport (keep-alive, HTTP/2, per-host concurrency caps) is owned
+by the application lifespan and handed to every outbound integration:
+- Supabase PostgREST client (via its httpx session)
+- Stripe (via a custom stripe HTTP client)
+- Gemini (google-generativeai manages its own gRPC channel, so it only
+  shares the per-host concurrency slots)
+"""
+
+import asyncio
+import ssl
+from typing import Any, AsyncIterable, Mapping, NoReturn, Optional, Union
+from urllib.parse import urlsplit
+
+import httpx
+import stripe
+
+from app.config import get_settings
+
+GEMINI_HOST = "generativelanguage.googleapis.com"
+STRIPE_API_BASE = "https://api.stripe.com"
+
+
+class _SlotReleasingStream(httpx.AsyncByteStream):
+    """Response stream that frees the host slot once the body is consumed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, slot: asyncio.Semaphore):
+        self._stream = stream
+        self._slot = slot
+        self._released = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._slot.release()
+
+
+class _HostLimitedTransport(httpx.AsyncBaseTransport):
+    """Routes requests through a pooled transport with a per-host cap."""
+
+    def __init__(self, pool: "HTTPPool", transport: httpx.AsyncHTTPTransport):
+        self._pool = pool
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        slot = self._pool.host_slot(request.url.host)
+        await slot.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            slot.release()
+            raise
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_SlotReleasingStream(response.stream, slot),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        # The underlying transport is shared; only the pool may close it.
+        return None
+
+
+class HTTPPool:
+    """Lifespan-owned connection pool shared by all outbound clients."""
+
+    def __init__(self):
+        settings = get_settings()
+        self.settings = settings
+        self.transport = self._new_transport()
+        # Extra transports with their own TLS verification (e.g. Stripe's CA bundle)
+        self._verify_transports: dict[Any, httpx.AsyncHTTPTransport] = {}
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        self._closed = False
+
+    def _new_transport(self, verify: Union[ssl.SSLContext, bool] = True) -> httpx.AsyncHTTPTransport:
+        return httpx.AsyncHTTPTransport(
+            verify=verify,
+            http2=self.settings.http2_enabled,
+            limits=httpx.Limits(
+                max_connections=self.settings.http_max_connections,
+                max_keepalive_connections=self.settings.http_max_keepalive_connections,
+                keepalive_expiry=self.settings.http_keepalive_expiry_seconds,
+            ),
+            retries=1,  # Retry connection failures only (never replays requests)
+        )
+
+    def transport_for(self, cafile: Optional[str] = None, verify: bool = True) -> httpx.AsyncHTTPTransport:
+        """Get a pooled transport verifying TLS against a CA bundle (or not at all).
+
+        The default transport (cafile None, verify True) uses httpx's
+        default CA store. Other transports are created on first use and
+        closed with the pool.
+        """
+        if cafile is None and verify:
+            return self.transport
+        key = (cafile, verify)
+        transport = self._verify_transports.get(key)
+        if transport is None:
+            transport = self._new_transport(ssl.create_default_context(cafile=cafile) if verify else False)
+            self._verify_transports[key] = transport
+        return transport
+
+    def host_slot(self, host: str) -> asyncio.Semaphore:
+        """Get the concurrency slot for a host (created on first use)."""
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = asyncio.Semaphore(self.settings.http_max_connections_per_host)
+            self._host_slots[host] = slot
+        return slot
+
+    def client(
+        self,
+        base_url: str = "",
+        headers: Optional[dict[str, str]] = None,
+        timeout: Any = None,
+        transport: Optional[httpx.AsyncHTTPTransport] = None,
+        **kwargs: Any,
+    ) -> httpx.AsyncClient:
+        """Create an httpx client bound to the shared pool.
+
+        Clients are cheap wrappers; closing one does not close the pool.
+        `transport` selects one of the pool's transports (see transport_for).
+        """
+        return httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout if timeout is not None else self.settings.http_timeout_seconds,
+            transport=_HostLimitedTransport(self, transport or self.transport),
+            **kwargs,
+        )
+
+    async def warm(self, urls: list[str]) -> None:
+        """Pre-establish connections (DNS + TLS) to the given origins.
+
+        Failures are logged and ignored; warming is best effort.
+        """
+        async with self.client() as client:
+            results = await asyncio.gather(
+                *(client.head(url) for url in urls),
+                return_exceptions=True,
+            )
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                print(f"HTTP pool warm-up failed for {urlsplit(url).netloc}: {result}")
+
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        if not self._closed:
+            self._closed = True
+            await self.transport.aclose()
+            for transport in self._verify_transports.values():
+                await transport.aclose()
+
+
+class PooledStripeHTTPClient(stripe.HTTPClient):
+    """Stripe HTTP client that sends requests through the shared pool.
+
+    Implements stripe's HTTPClient interface (async only). Like stripe's
+    own clients, TLS is verified against stripe.ca_bundle_path unless
+    verify_ssl_certs is False.
+    """
+
+    name = "httpx-pooled"
+
+    def __init__(self, pool: HTTPPool, timeout: Optional[float] = None, verify_ssl_certs: bool = True):
+        super().__init__(verify_ssl_certs=verify_ssl_certs)
+        self._timeout = timeout or pool.settings.http_timeout_seconds
+        self._http = pool.client(
+            timeout=self._timeout,
+            transport=pool.transport_for(cafile=stripe.ca_bundle_path, verify=verify_ssl_certs),
+        )
+
+    async def request_async(
+        self, method: str, url: str, headers: Mapping[str, str], post_data=None
+    ) -> tuple[bytes, int, Mapping[str, str]]:
+        try:
+            response = await self._http.request(method, url, headers=headers, content=post_data)
+        except Exception as e:
+            self._raise_connection_error(e)
+        return response.content, response.status_code, response.headers
+
+    async def request_stream_async(
+        self, method: str, url: str, headers: Mapping[str, str], post_data=None
+    ) -> tuple[AsyncIterable[bytes], int, Mapping[str, str]]:
+        try:
+            response = await self._http.send(
+                self._http.build_request(method, url, headers=headers, content=post_data),
+                stream=True,
+            )
+        except Exception as e:
+            self._raise_connection_error(e)
+        return response.aiter_bytes(), response.status_code, response.headers
+
+    def request(self, method, url, headers, post_data=None, *, _usage=None):
+        raise RuntimeError("PooledStripeHTTPClient only supports async requests")
+
+    def request_stream(self, method, url, headers, post_data=None, *, _usage=None):
+        raise RuntimeError("PooledStripeHTTPClient only supports async requests")
+
+    async def sleep_async(self, secs: float) -> None:
+        await asyncio.sleep(secs)
+
+    def close(self) -> None:
+        return None
+
+    async def close_async(self) -> None:
+        # Only the wrapper; the pooled connections belong to the pool
+        await self._http.aclose()
+
+    @staticmethod
+    def _raise_connection_error(e: Exception) -> NoReturn:
+        raise stripe.APIConnectionError(
+            f"Unexpected error communicating with Stripe ({type(e).__name__})",
+            should_retry=True,
+        ) from e
+
+
+# Singleton instance
+_http_pool: Optional[HTTPPool] = None
+
+
+def get_http_pool() -> HTTPPool:
+    """Get the shared HTTP pool singleton."""
+    global _http_pool
+    if _http_pool is None:
+        _http_pool = HTTPPool()
+    return _http_pool
+
+
+async def close_http_pool() -> None:
+    """Close the shared HTTP pool (called from lifespan shutdown).
+
+    The next get_http_pool() call opens a new pool. Clients built on the
+    closed pool must be dropped first (see close_supabase_service and
+    close_stripe_client).
+    """
+    global _http_pool
+    if _http_pool is not None:
+        pool, _http_pool = _http_pool, None
+        await pool.close()
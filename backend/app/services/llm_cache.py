@@ -0,0 +1,254 @@
+"""Content-addressed cache for LLM responses.
+
+Keys are the SHA-256 of the model name, generation parameters and the
+normalized prompt, salted with a hash of the prompt templates in
+app/prompts/clarification.py, so editing a template invalidates every
+entry built from the old wording.
+
+Tiers:
+- in-process LRU with TTL (always on)
+- optional SQLite store that survives restarts (Settings.ai_llm_cache_path)
+
+Concurrent misses for the same key share one LLM call.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+from app.config import get_settings
+from app.prompts import clarification
+
+
+def _templates_hash() -> str:
+    """Hash of every prompt template/constant in the clarification module."""
+    templates = {
+        name: value
+        for name, value in vars(clarification).items()
+        if name.isupper() and isinstance(value, (str, dict, list))
+    }
+    payload = json.dumps(templates, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+PROMPT_TEMPLATES_HASH = _templates_hash()
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def make_cache_key(model: str, *parts: Any) -> str:
+    """Build a cache key from the model name and prompt parts.
+
+    Strings are whitespace-normalized so trivially different submissions
+    (trailing spaces, re-wrapped text) share an entry.
+    """
+    normalized = [
+        _WHITESPACE.sub(" ", part).strip() if isinstance(part, str) else part
+        for part in parts
+    ]
+    payload = json.dumps([PROMPT_TEMPLATES_HASH, model, normalized], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0  # Misses that waited on an identical in-flight call
+    rejected: int = 0  # Computed values not stored because they failed validation
+
+    def as_dict(self) -> dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        stats: dict[str, Any] = asdict(self)
+        stats["hit_rate"] = round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0
+        return stats
+
+
+class MemoryLRUCache:
+    """Bounded in-process LRU with per-entry TTL."""
+
+    def __init__(self, capacity: int, ttl_seconds: float, clock: Callable[[], float] = time.time):
+        self.capacity = capacity
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (self._clock() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class SQLiteLLMCache:
+    """On-disk JSON store; calls are blocking (run them in a thread)."""
+
+    def __init__(self, path: str, ttl_seconds: float, clock: Callable[[], float] = time.time):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY,"
+                " templates_hash TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            # Entries from older templates can never be hit again
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE templates_hash <> ? OR expires_at <= ?",
+                (PROMPT_TEMPLATES_HASH, self._clock()),
+            )
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] <= self._clock():
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, templates_hash, value, expires_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, PROMPT_TEMPLATES_HASH, json.dumps(value), self._clock() + self.ttl_seconds),
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class LLMResponseCache:
+    """Two-tier LLM response cache with in-flight call coalescing."""
+
+    def __init__(self, memory: MemoryLRUCache, disk: Optional[SQLiteLLMCache] = None):
+        self.memory = memory
+        self.disk = disk
+        self.stats = CacheStats()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        validate: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """Return the cached value for key, computing and storing it on a miss.
+
+        Errors from compute are not cached, nor are values validate rejects
+        (they are still returned, so the caller can fall back).
+        """
+        value = self.memory.get(key)
+        if value is not None:
+            self.stats.memory_hits += 1
+            return value
+
+        if self.disk is not None:
+            value = await asyncio.to_thread(self.disk.get, key)
+            if value is not None:
+                self.stats.disk_hits += 1
+                self.memory.set(key, value)
+                return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The caller making the call was cancelled; make our own
+
+        self.stats.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Waiters re-raise it; don't warn if there are none
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        future.set_result(value)
+        if validate is not None and not validate(value):
+            self.stats.rejected += 1
+            return value
+        self.memory.set(key, value)
+        if self.disk is not None:
+            try:
+                await asyncio.to_thread(self.disk.set, key, value)
+            except Exception as e:
+                print(f"LLM cache disk write failed: {e}")
+        return value
+
+    def clear(self) -> None:
+        """Drop all entries from both tiers."""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+
+# Singleton instance
+_llm_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Get the LLM response cache singleton."""
+    global _llm_cache
+    if _llm_cache is None:
+        settings = get_settings()
+        disk = None
+        if settings.ai_llm_cache_path:
+            try:
+                disk = SQLiteLLMCache(settings.ai_llm_cache_path, settings.ai_llm_cache_ttl_seconds)
+            except sqlite3.Error as e:
+                print(f"LLM disk cache unavailable ({settings.ai_llm_cache_path}): {e}")
+        _llm_cache = LLMResponseCache(
+            memory=MemoryLRUCache(settings.ai_llm_cache_size, settings.ai_llm_cache_ttl_seconds),
+            disk=disk,
+        )
+    return _llm_cache
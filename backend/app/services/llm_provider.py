@@ -0,0 +1,240 @@
+"""LLM providers for the AI intake assistant.
+
+The service talks to an LLMProvider, never to a vendor SDK directly, so the
+backend can be swapped by configuration (Settings.llm_provider):
+
+- "gemini": Google Gemini via google-generativeai (needs GEMINI_API_KEY)
+- "fake": deterministic local stand-in for load and throughput testing
+  offline, with a configurable latency distribution, injected errors and
+  canned JSON responses
+
+Deadlines, hedging, the circuit breaker and the response cache stay in the
+service, so they behave the same with either provider.
+"""
+
+import asyncio
+import json
+import math
+import random
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import google.generativeai as genai
+
+from app.prompts.clarification import FALLBACK_QUESTIONS
+from app.services.http_pool import GEMINI_HOST, get_http_pool
+
+# Request kinds (what the prompt asks for)
+TRIGGER_DETECTION = "trigger_detection"
+TRIGGER_DETECTION_BATCH = "trigger_detection_batch"
+QUESTION_GENERATION = "question_generation"
+COMBINED_ANALYSIS = "combined_analysis"
+QUESTION_PLAN = "question_plan"
+
+
+@dataclass(frozen=True)
+class LLMRequest:
+    """One JSON generation request."""
+
+    kind: str
+    system: str
+    acknowledgement: str
+    prompt: str
+    temperature: float
+    timeout: float
+    response_schema: Optional[dict] = None
+
+
+class LLMProvider(ABC):
+    """Generates JSON completions for the clarification prompts."""
+
+    name: str  # Model identifier (part of cache keys and final output)
+
+    @abstractmethod
+    async def generate_json(self, request: LLMRequest) -> str:
+        """Run one generation and return the raw JSON response text."""
+
+
+# ============================================================================
+# GEMINI
+# ============================================================================
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini (JSON mode)."""
+
+    def __init__(self, model: "genai.GenerativeModel", name: str):
+        self.model = model
+        self.name = name
+
+    @classmethod
+    def create(cls, api_key: str, model_name: str) -> "GeminiProvider":
+        genai.configure(api_key=api_key)
+        return cls(genai.GenerativeModel(model_name), model_name)
+
+    async def generate_json(self, request: LLMRequest) -> str:
+        generation_config = {
+            "response_mime_type": "application/json",
+            "temperature": request.temperature,
+        }
+        if request.response_schema is not None:
+            generation_config["response_schema"] = request.response_schema
+
+        # gRPC channel is SDK-managed; only the per-host slots are shared
+        async with get_http_pool().host_slot(GEMINI_HOST):
+            response = await self.model.generate_content_async(
+                [
+                    {"role": "user", "parts": [request.system]},
+                    {"role": "model", "parts": [request.acknowledgement]},
+                    {"role": "user", "parts": [request.prompt]},
+                ],
+                generation_config=generation_config,
+                # Server-side deadline, so abandoned calls don't linger
+                request_options={"timeout": request.timeout},
+            )
+        return response.text
+
+
+# ============================================================================
+# FAKE (load testing)
+# ============================================================================
+
+class FakeLLMError(Exception):
+    """Failure injected by FakeLLMProvider."""
+
+
+@dataclass(frozen=True)
+class LatencyDistribution:
+    """Response latency model, in milliseconds.
+
+    Spec strings (Settings.llm_fake_latency):
+        "fixed:200"          always 200ms
+        "uniform:100,400"    uniform between 100 and 400ms
+        "lognormal:800,0.5"  lognormal with median 800ms and sigma 0.5
+    """
+
+    kind: str
+    params: tuple[float, ...]
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        kind, _, raw = spec.partition(":")
+        try:
+            params = tuple(float(p) for p in raw.split(",")) if raw else ()
+        except ValueError:
+            raise ValueError(f"Invalid latency spec: {spec!r}") from None
+
+        expected = {"fixed": 1, "uniform": 2, "lognormal": 2}.get(kind)
+        if expected is None or len(params) != expected:
+            raise ValueError(f"Invalid latency spec: {spec!r}")
+        return cls(kind, params)
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw a latency in seconds."""
+        if self.kind == "fixed":
+            ms = self.params[0]
+        elif self.kind == "uniform":
+            ms = rng.uniform(*self.params)
+        else:
+            median, sigma = self.params
+            ms = rng.lognormvariate(math.log(median), sigma)
+        return max(0.0, ms) / 1000
+
+
+DEFAULT_FAKE_RESPONSES: dict[str, Any] = {
+    TRIGGER_DETECTION: {"has_issues": False, "issues": []},
+    QUESTION_GENERATION: FALLBACK_QUESTIONS["budget_range"],
+    COMBINED_ANALYSIS: {
+        "has_issues": False,
+        "issues": [],
+        "first_question": FALLBACK_QUESTIONS["budget_range"],
+    },
+    QUESTION_PLAN: {"next": {}},
+}
+
+_BATCH_FORM_HEADER = re.compile(r"^### Form (\d+)$", re.MULTILINE)
+
+
+class FakeLLMProvider(LLMProvider):
+    """Deterministic offline provider.
+
+    Each call sleeps for a sampled latency, then fails with probability
+    error_rate, returns unparseable text with probability malformed_rate,
+    or returns the canned response for the request kind. A canned response
+    may be a list, in which case one entry is picked per call. Batched
+    trigger detection answers every form in the prompt with the
+    trigger_detection response. All randomness comes from one seeded RNG.
+    """
+
+    def __init__(
+        self,
+        latency: LatencyDistribution = LatencyDistribution("fixed", (0.0,)),
+        error_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        responses: Optional[dict[str, Any]] = None,
+        seed: int = 0,
+        name: str = "fake-llm",
+    ):
+        self.name = name
+        self.latency = latency
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.responses = {**DEFAULT_FAKE_RESPONSES, **(responses or {})}
+        self._rng = random.Random(seed)
+        self.calls: dict[str, int] = {}
+
+    @classmethod
+    def from_settings(cls, settings) -> "FakeLLMProvider":
+        responses = None
+        if settings.llm_fake_responses_path:
+            with open(settings.llm_fake_responses_path, encoding="utf-8") as f:
+                responses = json.load(f)
+        return cls(
+            latency=LatencyDistribution.parse(settings.llm_fake_latency),
+            error_rate=settings.llm_fake_error_rate,
+            malformed_rate=settings.llm_fake_malformed_rate,
+            responses=responses,
+            seed=settings.llm_fake_seed,
+        )
+
+    async def generate_json(self, request: LLMRequest) -> str:
+        self.calls[request.kind] = self.calls.get(request.kind, 0) + 1
+        # Draw everything up front so a call's outcome doesn't depend on timing
+        delay = self.latency.sample(self._rng)
+        roll = self._rng.random()
+        response = self._response(request)
+
+        await asyncio.sleep(delay)
+        if roll < self.error_rate:
+            raise FakeLLMError(f"Injected {request.kind} failure")
+        if roll < self.error_rate + self.malformed_rate:
+            return "{not json"
+        return json.dumps(response)
+
+    def _response(self, request: LLMRequest) -> Any:
+        if request.kind == TRIGGER_DETECTION_BATCH:
+            return {"results": [
+                {"form_id": int(form_id), **self._pick(TRIGGER_DETECTION)}
+                for form_id in _BATCH_FORM_HEADER.findall(request.prompt)
+            ]}
+        return self._pick(request.kind)
+
+    def _pick(self, kind: str) -> Any:
+        response = self.responses.get(kind, {})
+        if isinstance(response, list):
+            return self._rng.choice(response) if response else {}
+        return response
+
+
+def create_llm_provider(settings) -> Optional[LLMProvider]:
+    """Build the configured provider (None if the LLM is disabled)."""
+    if settings.llm_provider == "fake":
+        print("Using fake LLM provider")
+        return FakeLLMProvider.from_settings(settings)
+    if settings.llm_provider != "gemini":
+        print(f"Unknown llm_provider {settings.llm_provider!r}; LLM disabled")
+        return None
+    if not settings.gemini_api_key:
+        return None
+    return GeminiProvider.create(settings.gemini_api_key, settings.gemini_model)
@@ -0,0 +1,165 @@
+"""Circuit breaker and request hedging for LLM calls.
+
+The breaker tracks a rolling window of recent Gemini calls. It opens when
+the error rate or the p95 latency crosses its threshold, so callers skip
+straight to their deterministic fallbacks instead of waiting out a
+degraded model. After a cool-down it lets a single probe call through
+(half-open) and closes again if the probe succeeds.
+
+While the breaker is closed, a slow call can be hedged: a second identical
+request fires after a delay and whichever finishes first wins.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Awaitable, Callable, Optional
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker state."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Rolling-window breaker on error rate and p95 latency."""
+
+    def __init__(
+        self,
+        name: str,
+        window_size: int,
+        min_calls: int,
+        error_rate_threshold: float,
+        p95_latency_threshold: float,
+        open_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate_threshold
+        self.p95_latency_threshold = p95_latency_threshold
+        self.open_seconds = open_seconds
+        self._clock = clock
+        self._calls: deque[tuple[bool, float]] = deque(maxlen=window_size)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state == CircuitState.OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            return CircuitState.HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may be made now (claims the probe when half-open)."""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+            self._state = CircuitState.HALF_OPEN
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self, latency: float) -> None:
+        self._record(True, latency)
+
+    def record_failure(self, latency: float) -> None:
+        self._record(False, latency)
+
+    def record_abandoned(self) -> None:
+        """The call was cancelled by its caller; it says nothing about health."""
+        self._probe_in_flight = False
+
+    def error_rate(self) -> float:
+        if not self._calls:
+            return 0.0
+        return sum(1 for ok, _ in self._calls if not ok) / len(self._calls)
+
+    def p95_latency(self) -> float:
+        if not self._calls:
+            return 0.0
+        latencies = sorted(latency for _, latency in self._calls)
+        return latencies[max(0, math.ceil(0.95 * len(latencies)) - 1)]
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current state and window statistics (for health checks)."""
+        return {
+            "state": self.state.value,
+            "calls": len(self._calls),
+            "error_rate": round(self.error_rate(), 3),
+            "p95_latency_seconds": round(self.p95_latency(), 3),
+        }
+
+    def _record(self, ok: bool, latency: float) -> None:
+        if self._state == CircuitState.HALF_OPEN:
+            self._probe_in_flight = False
+            if ok:
+                print(f"Circuit {self.name} closed after successful probe")
+                self._state = CircuitState.CLOSED
+                self._calls.clear()
+                self._calls.append((ok, latency))
+            else:
+                self._open()
+            return
+
+        self._calls.append((ok, latency))
+        if self._state == CircuitState.CLOSED and len(self._calls) >= self.min_calls:
+            if (
+                self.error_rate() >= self.error_rate_threshold
+                or self.p95_latency() >= self.p95_latency_threshold
+            ):
+                self._open()
+
+    def _open(self) -> None:
+        print(
+            f"Circuit {self.name} opened "
+            f"(error_rate={self.error_rate():.2f}, p95={self.p95_latency():.2f}s)"
+        )
+        self._state = CircuitState.OPEN
+        self._opened_at = self._clock()
+
+
+async def hedged(call: Callable[[], Awaitable[Any]], delay: Optional[float]) -> Any:
+    """Run call, firing a second identical call if the first is slow.
+
+    Args:
+        call: Factory for the request coroutine
+        delay: Seconds to wait before hedging (None or <= 0 disables)
+
+    Returns:
+        The result of whichever attempt succeeds first. If both fail, the
+        last error is raised. The losing attempt is cancelled.
+    """
+    if not delay or delay <= 0:
+        return await call()
+
+    attempts = [asyncio.create_task(call())]
+    try:
+        done, _ = await asyncio.wait(attempts, timeout=delay)
+        if done:
+            return attempts[0].result()
+
+        attempts.append(asyncio.create_task(call()))
+        pending = set(attempts)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in attempts:
+            if not task.done():
+                task.cancel()
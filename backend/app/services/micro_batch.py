@@ -0,0 +1,96 @@
+"""Micro-batching of concurrent requests.
+
+Callers submit one item each. Items arriving within a short window (or
+until the batch is full) are handed to a single batch function, and each
+caller gets back the result at its own position. Used to fold bursts of
+trigger-detection calls into one Gemini request.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """Collects submitted items into batches.
+
+    The batch function receives the items in submission order and returns
+    a list of the same length; an Exception in a position is raised to
+    that caller only. If the batch function itself raises, every caller
+    in the batch gets the error.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[list[T]], Awaitable[list[Any]]],
+        window_seconds: float,
+        max_batch_size: int,
+    ):
+        self.run_batch = run_batch
+        self.window_seconds = window_seconds
+        self.max_batch_size = max(1, max_batch_size)
+        self._pending: list[tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, item: T) -> R:
+        """Queue an item and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_seconds, self._flush)
+        return await future
+
+    async def aclose(self) -> None:
+        """Flush pending items and wait for in-flight batches."""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        # Callers that gave up while waiting don't need a slot
+        batch = [(item, future) for item, future in batch if not future.done()]
+        if not batch:
+            return
+
+        self.batches += 1
+        self.items += len(batch)
+        task = asyncio.create_task(self._run(batch), name=f"micro_batch:{len(batch)}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[T, asyncio.Future]]) -> None:
+        try:
+            results = await self.run_batch([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"Batch returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
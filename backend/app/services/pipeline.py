@@ -0,0 +1,149 @@
+"""Concurrent stage graph with per-stage timing.
+
+Request pipelines (intake submission, AI analysis) are expressed as named
+stages. A stage starts as soon as the stages it depends on have finished
+and receives their results as arguments, so independent stages overlap:
+
+    graph = StageGraph("intake")
+    graph.add("inquiry", lambda: supabase.create_inquiry_with_event(...))
+    graph.add("llm_triggers", lambda: ai._detect_llm_triggers(form))
+    graph.add("analysis", analyze, "inquiry", "llm_triggers")
+    result = await graph.get("analysis")
+
+Every stage records when it started and how long it ran (excluding time
+spent waiting for its dependencies), which gives the critical path and a
+Server-Timing header value.
+"""
+
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+@dataclass
+class StageTiming:
+    """Timing of one stage, in milliseconds relative to graph creation."""
+
+    start_ms: float
+    duration_ms: float = 0.0
+    finished: bool = False
+
+    @property
+    def end_ms(self) -> float:
+        return self.start_ms + self.duration_ms
+
+
+class StageGraph:
+    """Runs named async stages concurrently, ordered by their dependencies."""
+
+    def __init__(self, name: str, clock: Callable[[], float] = time.perf_counter):
+        self.name = name
+        self._clock = clock
+        self._origin = clock()
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._deps: dict[str, tuple[str, ...]] = {}
+        self.timings: dict[str, StageTiming] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tasks
+
+    def add(self, name: str, fn: Callable[..., Any], *depends_on: str) -> asyncio.Task:
+        """Schedule a stage.
+
+        Args:
+            name: Unique stage name
+            fn: Called with the results of depends_on (in order); may return
+                a value or an awaitable
+            depends_on: Names of stages that must finish first (must
+                already be added)
+
+        Returns:
+            The stage's task
+        """
+        if name in self._tasks:
+            raise ValueError(f"Stage already added: {name}")
+        deps = tuple(self._tasks[d] for d in depends_on)
+        self._deps[name] = depends_on
+        task = asyncio.create_task(self._run(name, fn, deps), name=f"{self.name}:{name}")
+        self._tasks[name] = task
+        return task
+
+    async def get(self, name: str) -> Any:
+        """Wait for a stage and return its result (re-raising its error)."""
+        return await self._tasks[name]
+
+    def cancel(self, *names: str) -> None:
+        """Cancel stages whose results are no longer needed."""
+        for name in names:
+            task = self._tasks.get(name)
+            if task is not None and not task.done():
+                task.cancel()
+
+    async def aclose(self) -> None:
+        """Cancel all unfinished stages and wait for them to unwind.
+
+        Errors of stages nobody awaited are consumed here.
+        """
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    def critical_path(self) -> list[str]:
+        """Chain of finished stages that determined the total latency.
+
+        Starts from the last stage to finish and walks back through the
+        dependency that finished last at each step.
+        """
+        finished = {n: t for n, t in self.timings.items() if t.finished}
+        if not finished:
+            return []
+
+        path = [max(finished, key=lambda n: finished[n].end_ms)]
+        while True:
+            deps = [d for d in self._deps.get(path[-1], ()) if d in finished]
+            if not deps:
+                break
+            path.append(max(deps, key=lambda n: finished[n].end_ms))
+        return list(reversed(path))
+
+    def server_timing(self) -> str:
+        """Format finished stage durations as a Server-Timing header value."""
+        return ", ".join(
+            f"{name};dur={t.duration_ms:.1f}"
+            for name, t in self.timings.items()
+            if t.finished
+        )
+
+    def summary(self) -> str:
+        """One-line timing summary for logs."""
+        stages = " ".join(
+            f"{name}={t.start_ms:.0f}+{t.duration_ms:.0f}ms"
+            for name, t in self.timings.items()
+            if t.finished
+        )
+        return f"[{self.name}] {stages} critical_path={'>'.join(self.critical_path())}"
+
+    async def _run(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        deps: tuple[asyncio.Task, ...],
+    ) -> Any:
+        args = [await dep for dep in deps]
+
+        timing = StageTiming(start_ms=self._elapsed_ms())
+        self.timings[name] = timing
+        try:
+            result = fn(*args)
+            if inspect.isawaitable(result):
+                result = await result
+            timing.finished = True
+            return result
+        finally:
+            timing.duration_ms = self._elapsed_ms() - timing.start_ms
+
+    def _elapsed_ms(self) -> float:
+        return (self._clock() - self._origin) * 1000
+
@@ -0,0 +1,141 @@
+"""Speculative prefetch of follow-up clarification questions.
+
+For a single_choice turn the possible answers are known as soon as the turn
+is created. While the user is deciding, the follow-up question for each
+likely option is generated in the background. When the answer arrives,
+process_answer claims the matching branch (if the re-gated form still
+matches what the branch assumed) and the other branches are cancelled.
+
+Branches are process-local: an answer served by another worker process
+simply misses and generates its question as usual.
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from app.schemas.ai_assistant import AIQuestion
+
+
+@dataclass
+class PrefetchBranch:
+    """A speculative next question for one answer option."""
+
+    fingerprint: Hashable  # State the question was generated for
+    task: asyncio.Task
+
+
+@dataclass
+class _TurnBranches:
+    created_at: float
+    branches: dict[str, PrefetchBranch] = field(default_factory=dict)
+
+    def cancel(self, keep: Optional[PrefetchBranch] = None) -> None:
+        for branch in self.branches.values():
+            if branch is not keep:
+                branch.task.cancel()
+
+
+class QuestionPrefetcher:
+    """Holds speculative next-question tasks per (session, turn, answer)."""
+
+    def __init__(
+        self,
+        capacity: int = 500,
+        ttl_seconds: float = 30 * 60,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.capacity = capacity
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._turns: OrderedDict[tuple[str, int], _TurnBranches] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def schedule(
+        self,
+        session_id: str,
+        turn_index: int,
+        branches: dict[Any, tuple[Hashable, Callable[[], Awaitable[AIQuestion]]]],
+    ) -> None:
+        """Start generating follow-up questions for a turn's options.
+
+        Args:
+            session_id: AI session ID
+            turn_index: Index of the turn awaiting an answer
+            branches: Answer value -> (fingerprint, question factory)
+        """
+        self._purge()
+        key = (session_id, turn_index)
+        self.discard(session_id, turn_index)
+
+        entry = _TurnBranches(created_at=self._clock())
+        for answer_value, (fingerprint, factory) in branches.items():
+            entry.branches[_answer_key(answer_value)] = PrefetchBranch(
+                fingerprint=fingerprint,
+                task=asyncio.create_task(
+                    factory(), name=f"prefetch:{session_id}:{turn_index}"
+                ),
+            )
+        self._turns[key] = entry
+
+    async def claim(
+        self,
+        session_id: str,
+        turn_index: int,
+        answer_value: Any,
+        fingerprint: Hashable,
+    ) -> Optional[AIQuestion]:
+        """Take the prefetched question for the given answer.
+
+        All other branches of the turn are cancelled. Returns None (the
+        caller generates the question itself) if there is no branch for
+        the answer, the branch was built for a different state, or it
+        failed.
+        """
+        entry = self._turns.pop((session_id, turn_index), None)
+        if entry is None:
+            return None
+
+        branch = entry.branches.get(_answer_key(answer_value))
+        if branch is None or branch.fingerprint != fingerprint:
+            entry.cancel()
+            self.misses += 1
+            return None
+
+        entry.cancel(keep=branch)
+        if branch.task.cancelled():
+            self.misses += 1
+            return None
+        try:
+            question = await branch.task
+        except Exception as e:
+            print(f"Prefetched question failed for session {session_id}: {e}")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return question
+
+    def discard(self, session_id: str, turn_index: int) -> None:
+        """Cancel all branches of a turn (e.g., the session completed)."""
+        entry = self._turns.pop((session_id, turn_index), None)
+        if entry is not None:
+            entry.cancel()
+
+    def _purge(self) -> None:
+        """Drop expired turns and keep the table within capacity."""
+        cutoff = self._clock() - self.ttl_seconds
+        while self._turns:
+            key, entry = next(iter(self._turns.items()))
+            if entry.created_at > cutoff and len(self._turns) < self.capacity:
+                break
+            del self._turns[key]
+            entry.cancel()
+
+
+def _answer_key(answer_value: Any) -> str:
+    return json.dumps(answer_value, sort_keys=True, default=str)
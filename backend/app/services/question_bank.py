@@ -0,0 +1,173 @@
+"""Precomputed clarification question bank.
+
+When the lead's context is below the minimum length (the context_raw
+ambiguity issue) and every other open issue is also an ambiguity in the
+structured form (unsure budget, unclear service type, unsure access
+model), there is no free text worth asking about: the question depends
+only on the enum fields, the issue set and which fields were already
+asked. That state space is finite, so scripts/build_question_bank.py
+generates and validates a question for every state offline and writes a
+compact artifact:
+
+    {"meta": {...}, "questions": [<AIQuestion>, ...], "index": {key: i}}
+
+(gzipped JSON; identical questions are stored once). The bank is loaded at
+startup and answers in a dict lookup. Submissions with a substantive
+context, and contradiction or budget/scope issues (judged against the
+context), still go to Gemini so the question reflects what the lead wrote.
+"""
+
+import gzip
+import json
+from typing import Any, Optional
+
+from app.schemas.ai_assistant import AIQuestion, AIQuestionType, AITriggerReason, DetectedIssue
+from app.schemas.intake import IntakeFormRequest
+from app.services.llm_cache import PROMPT_TEMPLATES_HASH
+
+BANK_FORMAT = 2  # 2: only brief-context states are banked
+
+# Form fields that make up a bank key, in key order
+KEY_ENUM_FIELDS = ("service_type", "budget_range", "access_model", "timeline", "role_title")
+
+# Fields an ambiguity question can target
+ASKABLE_FIELDS = ("budget_range", "service_type", "access_model", "context_raw")
+
+
+def bank_key(
+    form: IntakeFormRequest,
+    issues: list[DetectedIssue],
+    previous_turns: list[dict],
+) -> Optional[str]:
+    """Key of the bank entry for a question-generation state.
+
+    Returns:
+        The key, or None if the question depends on the free-text context
+    """
+    if any(issue.trigger_type != AITriggerReason.AMBIGUITY for issue in issues):
+        return None
+
+    issue_fields = sorted({issue.field for issue in issues if issue.field})
+    if "context_raw" not in issue_fields:
+        # The lead wrote enough context for the LLM to tailor the question
+        return None
+    asked_fields = sorted({t["target_field"] for t in previous_turns if t.get("target_field")})
+    parts = [getattr(form, field).value for field in KEY_ENUM_FIELDS]
+    return "|".join(parts + [",".join(issue_fields), ",".join(asked_fields)])
+
+
+def validate_question(question: AIQuestion) -> list[str]:
+    """Check a generated question is safe to serve from the bank.
+
+    Returns:
+        List of problems (empty if valid)
+    """
+    problems = []
+    if not question.question_text.strip():
+        problems.append("empty question_text")
+    if question.target_field and question.target_field not in ASKABLE_FIELDS:
+        problems.append(f"unknown target_field {question.target_field}")
+
+    if question.question_type == AIQuestionType.SINGLE_CHOICE:
+        if not question.options or len(question.options) < 2:
+            problems.append("single_choice needs at least two options")
+        for option in question.options or []:
+            if option.maps_to_field is None:
+                continue
+            field_type = IntakeFormRequest.model_fields.get(option.maps_to_field)
+            if option.maps_to_field not in KEY_ENUM_FIELDS or field_type is None:
+                problems.append(f"option maps to unknown field {option.maps_to_field}")
+                continue
+            try:
+                field_type.annotation(option.maps_to_value)
+            except ValueError:
+                problems.append(f"invalid {option.maps_to_field} value {option.maps_to_value!r}")
+
+    return problems
+
+
+class QuestionBank:
+    """In-memory question bank."""
+
+    def __init__(self, index: dict[str, int], questions: list[AIQuestion], meta: dict[str, Any]):
+        self.index = index
+        self.questions = questions
+        self.meta = meta
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def lookup(
+        self,
+        form: IntakeFormRequest,
+        issues: list[DetectedIssue],
+        previous_turns: list[dict],
+    ) -> Optional[AIQuestion]:
+        """Get the precomputed question for a state (None if not banked)."""
+        key = bank_key(form, issues, previous_turns)
+        if key is None:
+            return None
+
+        position = self.index.get(key)
+        if position is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return self.questions[position]
+
+    @classmethod
+    def load(cls, path: str) -> "QuestionBank":
+        """Load a bank artifact.
+
+        Raises:
+            ValueError: Unknown format or built from different prompt templates
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+
+        meta = data.get("meta", {})
+        if meta.get("format") != BANK_FORMAT:
+            raise ValueError(f"Unsupported question bank format: {meta.get('format')}")
+        if meta.get("templates_hash") != PROMPT_TEMPLATES_HASH:
+            raise ValueError("Question bank was built from different prompt templates; rebuild it")
+
+        questions = [AIQuestion.model_validate(q) for q in data["questions"]]
+        return cls(index=data["index"], questions=questions, meta=meta)
+
+    @staticmethod
+    def save(path: str, entries: dict[str, AIQuestion], meta: dict[str, Any]) -> None:
+        """Write a bank artifact, storing each distinct question once."""
+        questions: list[dict] = []
+        positions: dict[str, int] = {}
+        index: dict[str, int] = {}
+
+        for key in sorted(entries):
+            question = entries[key].model_dump(mode="json", exclude_none=True)
+            fingerprint = json.dumps(question, sort_keys=True)
+            if fingerprint not in positions:
+                positions[fingerprint] = len(questions)
+                questions.append(question)
+            index[key] = positions[fingerprint]
+
+        data = {
+            "meta": {**meta, "format": BANK_FORMAT, "templates_hash": PROMPT_TEMPLATES_HASH},
+            "questions": questions,
+            "index": index,
+        }
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+
+def load_question_bank(path: str) -> Optional[QuestionBank]:
+    """Load the question bank, or return None (and log) if it is unusable."""
+    try:
+        bank = QuestionBank.load(path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Question bank not loaded from {path}: {e}")
+        return None
+
+    print(f"Loaded question bank: {len(bank)} states, {len(bank.questions)} distinct questions")
+    return bank
@@ -0,0 +1,130 @@
+"""Whole-session clarification question plans.
+
+With Settings.ai_question_plan on, the model is asked once per session for
+the follow-up questions to every likely answer path, up to max_questions
+in total. The plan is a tree rooted at the first question:
+
+    {"format": 1,
+     "question": <AIQuestion>,
+     "next": {<option value or "*">: {"question": ..., "next": {...}}}}
+
+Branches of a single_choice question are keyed by option value; text and
+confirmation questions have one "*" branch for any answer. The plan is
+stored on ai_sessions.question_plan, so any worker can serve a later turn
+from it without an LLM call. An answer the plan didn't branch on (or a
+turn that wasn't served from the plan) ends the walk and the turn is
+generated as usual.
+"""
+
+from typing import Any, Optional
+
+from pydantic import ValidationError
+
+from app.schemas.ai_assistant import AIQuestion, AIQuestionType
+from app.services.question_bank import validate_question
+
+PLAN_FORMAT = 1
+
+# Branch key for "any answer" (text and confirmation questions)
+ANY_ANSWER = "*"
+
+
+def build_plan(
+    first_question: AIQuestion,
+    follow_ups: Any,
+    max_questions: int,
+) -> Optional[dict]:
+    """Validate a generated plan and attach its root question.
+
+    Invalid follow-ups (unknown answer keys, malformed or invalid
+    questions, paths longer than max_questions) are dropped.
+
+    Args:
+        first_question: The question asked on turn 0
+        follow_ups: The model's "next" mapping for the first question
+        max_questions: Session question limit
+
+    Returns:
+        The plan, or None if no usable follow-up remains
+    """
+    branches = _clean_branches(first_question, follow_ups, 1, max_questions)
+    if not branches:
+        return None
+    return {
+        "format": PLAN_FORMAT,
+        "question": _dump(first_question),
+        "next": branches,
+    }
+
+
+def next_planned_question(plan: Optional[dict], turns: list[dict]) -> Optional[AIQuestion]:
+    """Question the plan asks after the given (answered) turns.
+
+    Args:
+        plan: The session's question_plan
+        turns: Turn history, including the turn just answered
+
+    Returns:
+        The planned question, or None if the conversation left the plan
+    """
+    if not plan or plan.get("format") != PLAN_FORMAT or not turns:
+        return None
+
+    node = plan
+    asked_fields = set()
+    for turn in sorted(turns, key=lambda t: t["turn_index"]):
+        if turn.get("question_text") != node["question"].get("question_text"):
+            return None  # This turn wasn't served from the plan
+        if turn.get("target_field"):
+            asked_fields.add(turn["target_field"])
+
+        branches = node.get("next") or {}
+        answer = _answer_value(turn.get("answer_value"))
+        if isinstance(answer, str) and answer in branches:
+            node = branches[answer]
+        else:
+            node = branches.get(ANY_ANSWER)
+        if node is None:
+            return None
+
+    question = AIQuestion.model_validate(node["question"])
+    if question.target_field and question.target_field in asked_fields:
+        return None
+    return question
+
+
+def _clean_branches(question: AIQuestion, branches: Any, depth: int, max_questions: int) -> dict:
+    if depth >= max_questions or not isinstance(branches, dict):
+        return {}
+
+    if question.question_type == AIQuestionType.SINGLE_CHOICE:
+        allowed = {option.value for option in question.options or []}
+    else:
+        allowed = {ANY_ANSWER}
+
+    cleaned = {}
+    for answer, node in branches.items():
+        if answer not in allowed or not isinstance(node, dict):
+            continue
+        try:
+            follow_up = AIQuestion.model_validate(node.get("question"))
+        except ValidationError:
+            continue
+        if validate_question(follow_up):
+            continue
+        cleaned[answer] = {
+            "question": _dump(follow_up),
+            "next": _clean_branches(follow_up, node.get("next"), depth + 1, max_questions),
+        }
+    return cleaned
+
+
+def _answer_value(stored: Any) -> Any:
+    """Unwrap a scalar answer stored by record_clarification_answer."""
+    if isinstance(stored, dict) and set(stored) == {"value"}:
+        return stored["value"]
+    return stored
+
+
+def _dump(question: AIQuestion) -> dict:
+    return question.model_dump(mode="json", exclude_none=True)
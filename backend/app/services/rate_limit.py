@@ -0,0 +1,327 @@
+"""Rate limiting for intake submissions.
+
+Sliding-window counters replace the per-request COUNT queries against
+`inquiries`. Counters live in a pluggable backend:
+- "memory" (default): in-process, one set of counters per worker
+- other backends (e.g., a shared Redis) can be registered with
+  register_rate_limit_backend() and selected via Settings.rate_limit_backend
+
+A cold backend is seeded once from recent `inquiries` rows so a restart
+does not reset everyone's allowance.
+
+acquire() checks and counts a submission in one atomic backend step, so
+concurrent requests cannot both take the last slot. The returned
+reservation is released if the submission is not stored, so only stored
+submissions use up quota.
+"""
+
+import asyncio
+import math
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from app.config import get_settings
+from app.services.supabase import get_supabase_service
+
+
+class RateLimitBackend(ABC):
+    """Counter storage for the rate limiter.
+
+    Implementations must make incr() and incr_within_limit() atomic;
+    shared backends let all workers see the same counts.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> int:
+        """Get the current value of a counter (0 if missing or expired)."""
+
+    @abstractmethod
+    async def incr(self, key: str, amount: int, ttl_seconds: float) -> int:
+        """Increment a counter, (re)setting its TTL, and return the new value."""
+
+    @abstractmethod
+    async def incr_within_limit(
+        self,
+        key: str,
+        previous_key: str,
+        previous_weight: float,
+        limit: int,
+        ttl_seconds: float,
+    ) -> bool:
+        """Increment `key` by one only if that keeps the sliding count within `limit`.
+
+        The sliding count is key + previous_key * previous_weight. The check
+        and the increment must happen atomically.
+
+        Returns:
+            True if the counter was incremented
+        """
+
+    @abstractmethod
+    async def claim_seed(self) -> bool:
+        """Return True exactly once per cold backend (caller seeds it)."""
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Process-local counter storage.
+
+    Also the stand-in backend for tests.
+    """
+
+    # Purge expired keys once the table grows past this size
+    PURGE_THRESHOLD = 10_000
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._counters: dict[str, tuple[int, float]] = {}
+        self._seeded = False
+
+    async def get(self, key: str) -> int:
+        return self._get(key)
+
+    async def incr(self, key: str, amount: int, ttl_seconds: float) -> int:
+        return self._incr(key, amount, ttl_seconds)
+
+    async def incr_within_limit(
+        self,
+        key: str,
+        previous_key: str,
+        previous_weight: float,
+        limit: int,
+        ttl_seconds: float,
+    ) -> bool:
+        # No await between check and increment, so this is atomic on the event loop
+        if self._get(key) + self._get(previous_key) * previous_weight + 1 > limit:
+            return False
+        self._incr(key, 1, ttl_seconds)
+        return True
+
+    async def claim_seed(self) -> bool:
+        if self._seeded:
+            return False
+        self._seeded = True
+        return True
+
+    def _get(self, key: str) -> int:
+        entry = self._counters.get(key)
+        if entry is None:
+            return 0
+        count, expires_at = entry
+        if expires_at <= self._clock():
+            del self._counters[key]
+            return 0
+        return count
+
+    def _incr(self, key: str, amount: int, ttl_seconds: float) -> int:
+        now = self._clock()
+        count = max(self._get(key) + amount, 0)
+        self._counters[key] = (count, now + ttl_seconds)
+        if len(self._counters) > self.PURGE_THRESHOLD:
+            self._purge(now)
+        return count
+
+    def _purge(self, now: float) -> None:
+        expired = [k for k, (_, expires_at) in self._counters.items() if expires_at <= now]
+        for key in expired:
+            del self._counters[key]
+
+
+RATE_LIMIT_BACKENDS: dict[str, Callable[[], RateLimitBackend]] = {
+    "memory": InMemoryRateLimitBackend,
+}
+
+
+def register_rate_limit_backend(name: str, factory: Callable[[], RateLimitBackend]) -> None:
+    """Register a counter backend selectable via Settings.rate_limit_backend."""
+    RATE_LIMIT_BACKENDS[name] = factory
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """A sliding-window limit on one submission attribute."""
+
+    scope: str  # "email" or "ip"
+    limit: int
+    window_seconds: int
+    message: str
+
+
+@dataclass(frozen=True)
+class RateLimitReservation:
+    """Result of RateLimiter.acquire().
+
+    When allowed, the submission is already counted; release it with
+    RateLimiter.release() if the submission is not stored.
+    """
+
+    allowed: bool
+    reason: str = ""
+    keys: tuple[tuple[RateLimitRule, str], ...] = ()  # (rule, counter key) taken
+
+
+class RateLimiter:
+    """Sliding-window counter rate limiter.
+
+    Each rule keeps one counter per fixed window; the sliding count is the
+    current window plus the previous window weighted by how much of it still
+    overlaps the sliding window.
+    """
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        email_rule: RateLimitRule,
+        ip_rule: RateLimitRule,
+        seed_loader: Optional[Callable[[datetime], Awaitable[list[dict[str, Any]]]]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.backend = backend
+        self.email_rule = email_rule
+        self.ip_rule = ip_rule
+        self._seed_loader = seed_loader
+        self._clock = clock
+        self._seed_lock = asyncio.Lock()
+        self._seeded = False
+
+    async def acquire(
+        self, email: str, ip_address: Optional[str] = None
+    ) -> RateLimitReservation:
+        """Check limits and, if allowed, count this submission.
+
+        Each rule is checked and counted in one atomic backend call. If a
+        later rule rejects the submission, the counts already taken are
+        given back, so blocked attempts don't extend the block.
+
+        Args:
+            email: Email address of the submission
+            ip_address: Client IP address, if known
+
+        Returns:
+            The reservation (release it if the submission is not stored)
+        """
+        await self.ensure_seeded()
+        now = self._clock()
+
+        checks = [(self.email_rule, email.lower())]
+        if ip_address:
+            checks.append((self.ip_rule, ip_address))
+
+        taken: list[tuple[RateLimitRule, str]] = []
+        for rule, ident in checks:
+            window = math.floor(now / rule.window_seconds)
+            key = self._key(rule, ident, window)
+            allowed = await self.backend.incr_within_limit(
+                key,
+                self._key(rule, ident, window - 1),
+                previous_weight=1 - ((now / rule.window_seconds) - window),
+                limit=rule.limit,
+                ttl_seconds=self._ttl(rule, window, now),
+            )
+            if not allowed:
+                await self._give_back(taken, now)
+                return RateLimitReservation(False, rule.message)
+            taken.append((rule, key))
+
+        return RateLimitReservation(True, keys=tuple(taken))
+
+    async def release(self, reservation: RateLimitReservation) -> None:
+        """Give back the counts taken by acquire() (the submission was not stored)."""
+        await self._give_back(reservation.keys, self._clock())
+
+    async def _give_back(self, keys: Iterable[tuple[RateLimitRule, str]], now: float) -> None:
+        for rule, key in keys:
+            window = int(key.rsplit(":", 1)[1])
+            ttl = self._ttl(rule, window, now)
+            if ttl > 0:
+                await self.backend.incr(key, -1, ttl)
+
+    async def ensure_seeded(self) -> None:
+        """Seed a cold backend from recent submissions (once per process)."""
+        if self._seeded:
+            return
+        async with self._seed_lock:
+            if self._seeded:
+                return
+            if self._seed_loader and await self.backend.claim_seed():
+                try:
+                    await self.seed(await self._seed_loader(self._seed_since()))
+                except Exception as e:
+                    # Start with empty counters rather than failing submissions
+                    print(f"Rate limiter seeding failed: {e}")
+            self._seeded = True
+
+    async def seed(self, submissions: list[dict[str, Any]]) -> None:
+        """Count past submissions ({email, ip_address, created_at} rows)."""
+        now = self._clock()
+        for row in submissions:
+            created_at = _to_timestamp(row["created_at"])
+            if row.get("email"):
+                await self._incr(self.email_rule, row["email"].lower(), created_at, now)
+            if row.get("ip_address"):
+                await self._incr(self.ip_rule, str(row["ip_address"]), created_at, now)
+
+    def _seed_since(self) -> datetime:
+        longest = max(self.email_rule.window_seconds, self.ip_rule.window_seconds)
+        # Two windows: the sliding count reads the previous fixed window too
+        return datetime.fromtimestamp(self._clock(), tz=timezone.utc) - timedelta(seconds=2 * longest)
+
+    async def _incr(self, rule: RateLimitRule, ident: str, at: float, now: float) -> None:
+        window = math.floor(at / rule.window_seconds)
+        ttl = self._ttl(rule, window, now)
+        if ttl > 0:
+            await self.backend.incr(self._key(rule, ident, window), 1, ttl)
+
+    @staticmethod
+    def _ttl(rule: RateLimitRule, window: int, now: float) -> float:
+        # Keep each window until it can no longer be the "previous" window
+        return (window + 2) * rule.window_seconds - now
+
+    @staticmethod
+    def _key(rule: RateLimitRule, ident: str, window: int) -> str:
+        return f"intake:{rule.scope}:{ident}:{window}"
+
+
+def _to_timestamp(value: Any) -> float:
+    """Convert a datetime or ISO-8601 string to a UNIX timestamp."""
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+# Singleton instance
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the intake rate limiter singleton."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        settings = get_settings()
+        backend_factory = RATE_LIMIT_BACKENDS.get(settings.rate_limit_backend)
+        if backend_factory is None:
+            raise ValueError(f"Unknown rate limit backend: {settings.rate_limit_backend}")
+
+        _rate_limiter = RateLimiter(
+            backend=backend_factory(),
+            email_rule=RateLimitRule(
+                scope="email",
+                limit=settings.rate_limit_email_per_day,
+                window_seconds=24 * 60 * 60,
+                message="Maximum submissions per email reached for today",
+            ),
+            ip_rule=RateLimitRule(
+                scope="ip",
+                limit=settings.rate_limit_ip_per_hour,
+                window_seconds=60 * 60,
+                message="Too many submissions from this location",
+            ),
+            seed_loader=get_supabase_service().get_recent_submissions,
+        )
+    return _rate_limiter
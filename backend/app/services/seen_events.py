@@ -0,0 +1,84 @@
+"""In-memory filter of Stripe webhook events already handled.
+
+Stripe redelivers events (retries, replays from the dashboard). The
+webhook endpoint checks this filter before inserting into webhook_events,
+so a replay this process has already handled is answered without a failed
+insert. An event is only added once it has been processed or handed to the
+webhook outbox, so a Stripe retry of a failed event still gets through. The
+filter is a bounded LRU of exact event IDs (no false positives, so a new
+event is never dropped); it is warmed on startup from the most recently
+processed webhook_events rows.
+
+The unique index on webhook_events stays the source of truth: events
+stored by other processes, or evicted from the filter, are still caught by
+the insert.
+"""
+
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from app.config import get_settings
+from app.services.supabase import get_supabase_service
+
+
+class SeenEventFilter:
+    """Bounded LRU set of Stripe event IDs."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._ids: OrderedDict[str, None] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, event_id: str) -> bool:
+        return event_id in self._ids
+
+    def seen(self, event_id: str) -> bool:
+        """Check whether an event was already stored (counts as a use)."""
+        if event_id in self._ids:
+            self._ids.move_to_end(event_id)
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def add(self, event_id: str) -> None:
+        """Remember a stored event, evicting the least recently used."""
+        self._ids[event_id] = None
+        self._ids.move_to_end(event_id)
+        while len(self._ids) > self.capacity:
+            self._ids.popitem(last=False)
+
+    def warm(self, event_ids: Iterable[str]) -> None:
+        """Add event IDs given newest first (the newest end up most recent)."""
+        for event_id in reversed(list(event_ids)):
+            if event_id not in self._ids:
+                self.add(event_id)
+
+    async def load_recent(self) -> int:
+        """Warm the filter from the most recent webhook_events rows.
+
+        Returns:
+            Number of event IDs loaded
+        """
+        event_ids = await get_supabase_service().get_recent_webhook_event_ids(self.capacity)
+        self.warm(event_ids)
+        return len(event_ids)
+
+    def stats(self) -> dict:
+        return {"size": len(self._ids), "hits": self.hits, "misses": self.misses}
+
+
+# Singleton instance
+_seen_event_filter: Optional[SeenEventFilter] = None
+
+
+def get_seen_event_filter() -> SeenEventFilter:
+    """Get the seen-event filter singleton."""
+    global _seen_event_filter
+    if _seen_event_filter is None:
+        _seen_event_filter = SeenEventFilter(get_settings().webhook_seen_filter_size)
+    return _seen_event_filter
@@ -0,0 +1,258 @@
+"""Write-through cache of active clarification sessions and their turns.
+
+Sessions live for at most ai_session_ttl_minutes and only this backend
+writes them, so every write the service makes (session insert/update,
+turn insert, the record_clarification_answer result) is also applied here
+and resume/keepalive reads are served from memory. A record may also hold
+a snapshot of the inquiry's form (as submitted, plus the field updates of
+answered turns), so answers can be re-gated without reading the inquiry.
+
+Records are compact __slots__ objects holding only the columns the
+service reads. An entry expires at its session's expires_at (checked on
+read) and the table is a bounded LRU: once over capacity, the least
+recently used entries are dropped first.
+
+Every applied write bumps the entry's version. A writer that read version
+v and writes back expecting v, but finds the entry has moved on, made a
+stale write: the entry is invalidated so the next read goes to the
+database instead of serving state that may have been applied out of order.
+
+The cache is per process and opt-in (Settings.ai_session_cache_enabled).
+Its reads (resume, keepalive) assume a single worker, so only enable it
+when running one. Answers are safe either way: cached rejections only rely
+on state that never reverts (a closed session, an answered turn), and the
+form snapshot is only reused if the database's question_count shows no
+other answer was recorded since it was taken.
+"""
+
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Iterable, Optional
+
+SESSION_FIELDS = (
+    "id",
+    "inquiry_id",
+    "status",
+    "trigger_reasons",
+    "question_count",
+    "max_questions",
+    "field_updates",
+    "provisional_gate_status",
+    "latest_gate_status",
+    "latest_routing_result",
+    "question_plan",
+    "expires_at",
+)
+
+TURN_FIELDS = (
+    "id",
+    "session_id",
+    "turn_index",
+    "question_text",
+    "question_type",
+    "question_purpose",
+    "options",
+    "target_field",
+    "answer_value",
+    "answer_text",
+    "answered_at",
+    "field_updated",
+    "old_field_value",
+    "new_field_value",
+)
+
+
+class TurnRecord:
+    """Cached ai_turns row."""
+
+    __slots__ = TURN_FIELDS
+
+    def __init__(self, row: dict[str, Any]):
+        for name in TURN_FIELDS:
+            setattr(self, name, row.get(name))
+
+    def as_dict(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in TURN_FIELDS}
+
+
+class SessionRecord:
+    """Cached ai_sessions row plus its known turns and form snapshot."""
+
+    __slots__ = SESSION_FIELDS + ("version", "expires_ts", "turns", "form")
+
+    def __init__(self, row: dict[str, Any]):
+        for name in SESSION_FIELDS:
+            setattr(self, name, row.get(name))
+        self.version = 0
+        self.turns: dict[int, TurnRecord] = {}
+        self.form: Any = None  # IntakeFormRequest snapshot, if known
+        self.expires_ts = _timestamp(self.expires_at)
+
+    def apply(self, changes: dict[str, Any]) -> None:
+        for name, value in changes.items():
+            if name in SESSION_FIELDS:
+                setattr(self, name, value)
+        if "expires_at" in changes:
+            self.expires_ts = _timestamp(self.expires_at)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in SESSION_FIELDS}
+
+
+class SessionCache:
+    """Bounded in-process session/turn cache with expiry and versions."""
+
+    def __init__(self, capacity: int = 1000, clock: Callable[[], float] = time.time):
+        self.capacity = capacity
+        self._clock = clock
+        self._entries: OrderedDict[str, SessionRecord] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stale_writes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, session_id: str) -> Optional[SessionRecord]:
+        """Cached session, or None if unknown or past its expires_at."""
+        record = self._entries.get(session_id)
+        if record is None:
+            self.misses += 1
+            return None
+        if record.expires_ts <= self._clock():
+            del self._entries[session_id]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(session_id)
+        self.hits += 1
+        return record
+
+    def get_turn(self, session_id: str, turn_index: int) -> Optional[TurnRecord]:
+        """Cached turn of a cached session."""
+        record = self.get(session_id)
+        if record is None:
+            return None
+        return record.turns.get(turn_index)
+
+    def put_session(
+        self,
+        row: dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> Optional[SessionRecord]:
+        """Store a full session row (e.g., an insert or RPC result).
+
+        Known turns and the form snapshot of an existing entry are kept.
+
+        Args:
+            row: ai_sessions row
+            expected_version: Version the writer last read (None = don't check)
+
+        Returns:
+            The cached record, or None if the write was stale
+        """
+        session_id = row["id"]
+        existing = self._entries.get(session_id)
+        if not self._check_version(session_id, existing, expected_version):
+            return None
+
+        record = SessionRecord(row)
+        if existing is not None:
+            record.turns = existing.turns
+            record.form = existing.form
+            record.version = existing.version + 1
+        self._entries[session_id] = record
+        self._entries.move_to_end(session_id)
+        self._evict()
+        return record
+
+    def update_session(
+        self,
+        session_id: str,
+        changes: dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> bool:
+        """Apply a partial update to a cached session.
+
+        Returns:
+            True if applied; False if the session isn't cached or the write
+            was stale (the entry is then dropped)
+        """
+        record = self._entries.get(session_id)
+        if record is None:
+            return False
+        if not self._check_version(session_id, record, expected_version):
+            return False
+        record.apply(changes)
+        record.version += 1
+        return True
+
+    def extend(self, session_id: str, expires_at: datetime) -> None:
+        """Move a cached session's expiry (a keepalive, not a state change).
+
+        Doesn't bump the version, so it never makes another write stale.
+        """
+        record = self._entries.get(session_id)
+        if record is not None:
+            record.expires_at = expires_at.isoformat()
+            record.expires_ts = expires_at.timestamp()
+
+    def put_turns(self, session_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        """Store turn rows of a cached session (ignored if not cached)."""
+        record = self._entries.get(session_id)
+        if record is None:
+            return
+        for row in rows:
+            record.turns[row["turn_index"]] = TurnRecord(row)
+        record.version += 1
+
+    def set_form(self, session_id: str, form: Any) -> None:
+        """Store the form snapshot of a cached session (ignored if not cached)."""
+        record = self._entries.get(session_id)
+        if record is not None:
+            record.form = form
+
+    def invalidate(self, session_id: str) -> None:
+        self._entries.pop(session_id, None)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "sessions": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_writes": self.stale_writes,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def _check_version(
+        self,
+        session_id: str,
+        record: Optional[SessionRecord],
+        expected_version: Optional[int],
+    ) -> bool:
+        if expected_version is None or record is None or record.version == expected_version:
+            return True
+        print(
+            f"Stale session cache write for {session_id} "
+            f"(expected v{expected_version}, have v{record.version}); invalidating"
+        )
+        self.stale_writes += 1
+        del self._entries[session_id]
+        return False
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+
+def _timestamp(value: Any) -> float:
+    """expires_at (ISO string or datetime) as a Unix timestamp; 0 if unknown."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return 0.0
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return 0.0
@@ -0,0 +1,169 @@
+"""Keepalives for AI clarification sessions.
+
+Each open clarification tab pings /session/{id}/keepalive every few
+minutes. By default every ping writes the session's new expires_at.
+
+With Settings.ai_keepalive_batching (requires migration 008) the last
+activity per session is kept in memory instead, and the expiry is derived
+from it (last activity + ai_session_ttl_minutes) when needed. Pings for the
+same session coalesce, and every ai_keepalive_flush_seconds all pending
+expiries are written in one extend_ai_sessions call.
+
+A batched ping is flushed right away if the expiry this process last wrote
+for the session is unknown or within two flush intervals, so a sweeper in
+any process never expires a session on a stale expires_at.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from app.config import get_settings
+from app.services.ai_assistant import get_ai_assistant
+from app.services.session_cache import SessionCache
+from app.services.supabase import get_supabase_service
+
+
+class SessionKeepalive:
+    """In-memory last-activity tracker with batched expires_at writes."""
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        flush_interval_seconds: float,
+        batched: bool = True,
+        session_cache: Optional[SessionCache] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.flush_interval_seconds = flush_interval_seconds
+        self.batched = batched
+        self.session_cache = session_cache
+        self._clock = clock
+        self._last_activity: dict[str, float] = {}  # Pending flush
+        self._written: dict[str, float] = {}  # Last expiry written, by session
+        self._task: Optional[asyncio.Task] = None
+        self.touches = 0
+        self.flushes = 0
+        self.flushed_sessions = 0
+
+    def __len__(self) -> int:
+        return len(self._last_activity)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def touch(self, session_id: str) -> datetime:
+        """Record activity on a session.
+
+        Returns:
+            The session's new expires_at (written now, or on the next
+            flush when batched)
+        """
+        now = self._clock()
+        self.touches += 1
+        expires_at = self._expires_at(now)
+
+        if not self.batched:
+            await get_supabase_service().set_ai_session_expiry(session_id, expires_at)
+        else:
+            self._last_activity[session_id] = now
+            # The stored expiry may pass before the next flush: write it now
+            if self._written.get(session_id, 0.0) - now <= 2 * self.flush_interval_seconds:
+                try:
+                    await self.flush()
+                except Exception as e:
+                    print(f"Keepalive flush failed: {e}")
+
+        if self.session_cache is not None:
+            # Keep the cached entry alive (and its expires_at current) locally
+            self.session_cache.extend(session_id, expires_at)
+        return expires_at
+
+    async def flush(self) -> int:
+        """Write all pending expiries in one batch.
+
+        On failure the pending activity is kept (merged with newer pings)
+        for the next flush.
+
+        Returns:
+            Number of sessions in the batch
+        """
+        if not self._last_activity:
+            return 0
+        pending, self._last_activity = self._last_activity, {}
+
+        try:
+            await get_supabase_service().extend_ai_sessions({
+                session_id: self._expires_at(last_activity)
+                for session_id, last_activity in pending.items()
+            })
+        except Exception:
+            for session_id, last_activity in pending.items():
+                if last_activity > self._last_activity.get(session_id, 0.0):
+                    self._last_activity[session_id] = last_activity
+            raise
+
+        now = self._clock()
+        self._written = {s: ts for s, ts in self._written.items() if ts > now}
+        for session_id, last_activity in pending.items():
+            self._written[session_id] = last_activity + self.ttl_seconds
+
+        self.flushes += 1
+        self.flushed_sessions += len(pending)
+        return len(pending)
+
+    def start(self) -> None:
+        """Start the flush loop (called from lifespan startup)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="ai-session-keepalive")
+
+    async def stop(self) -> None:
+        """Cancel the flush loop and write whatever is pending."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"Final keepalive flush failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._last_activity),
+            "touches": self.touches,
+            "flushes": self.flushes,
+            "flushed_sessions": self.flushed_sessions,
+        }
+
+    def _expires_at(self, last_activity: float) -> datetime:
+        return datetime.fromtimestamp(last_activity, timezone.utc) + timedelta(seconds=self.ttl_seconds)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Keepalive flush failed: {e}")
+
+
+# Singleton instance
+_session_keepalive: Optional[SessionKeepalive] = None
+
+
+def get_session_keepalive() -> SessionKeepalive:
+    """Get the keepalive tracker singleton (shares the AI assistant's session cache)."""
+    global _session_keepalive
+    if _session_keepalive is None:
+        settings = get_settings()
+        _session_keepalive = SessionKeepalive(
+            ttl_seconds=settings.ai_session_ttl_minutes * 60,
+            flush_interval_seconds=settings.ai_keepalive_flush_seconds,
+            batched=settings.ai_keepalive_batching,
+            session_cache=get_ai_assistant().session_cache,
+        )
+    return _session_keepalive
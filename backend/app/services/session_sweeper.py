@@ -0,0 +1,164 @@
+"""Expiry sweeper for abandoned AI clarification sessions.
+
+Sessions the user walks away from stay 'active' until something closes
+them. The sweeper periodically runs the expire_ai_sessions database
+function, which expires overdue sessions in bounded, set-based batches and
+routes their inquiries to manual review (see migration 007). It runs in
+the app (started from lifespan) or once from scripts/sweep_sessions.py.
+
+The in-app sweeper first flushes the keepalives pending in this process,
+so a session pinged since the last flush isn't expired on a stale
+expires_at. If that flush fails, the run is skipped.
+"""
+
+import asyncio
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Optional
+
+from app.config import get_settings
+from app.services.ai_assistant import get_ai_assistant
+from app.services.session_cache import SessionCache
+from app.services.session_keepalive import SessionKeepalive, get_session_keepalive
+from app.services.supabase import get_supabase_service
+
+
+@dataclass
+class SweepResult:
+    """Counts for one sweep run."""
+
+    expired: int = 0
+    with_answers: int = 0  # Expired after answering at least one question
+    batches: int = 0
+    seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+async def sweep_expired_sessions(
+    batch_size: int,
+    max_batches: int,
+    session_cache: Optional[SessionCache] = None,
+) -> SweepResult:
+    """Expire overdue sessions, one bounded batch at a time.
+
+    Stops when a batch comes back short (nothing left that isn't locked)
+    or after max_batches, so a large backlog is spread over several runs.
+
+    Args:
+        batch_size: Sessions expired per database call
+        max_batches: Database calls per run
+        session_cache: Cache to drop the expired sessions from
+
+    Returns:
+        SweepResult with the run's counts
+    """
+    supabase = get_supabase_service()
+    result = SweepResult()
+    started = time.monotonic()
+
+    while result.batches < max_batches:
+        batch = await supabase.expire_ai_sessions(batch_size)
+        result.batches += 1
+        result.expired += batch["expired"]
+        result.with_answers += batch["with_answers"]
+        if session_cache is not None:
+            for session_id in batch["session_ids"]:
+                session_cache.invalidate(session_id)
+        if batch["expired"] < batch_size:
+            break
+
+    result.seconds = round(time.monotonic() - started, 3)
+    return result
+
+
+class SessionSweeper:
+    """Runs sweep_expired_sessions on an interval in the background."""
+
+    def __init__(
+        self,
+        interval_seconds: float,
+        batch_size: int,
+        max_batches: int,
+        session_cache: Optional[SessionCache] = None,
+        keepalive: Optional[SessionKeepalive] = None,
+    ):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.session_cache = session_cache
+        self.keepalive = keepalive
+        self.runs = 0
+        self.total_expired = 0
+        self.last_result: Optional[SweepResult] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        """Start the sweep loop (called from lifespan startup)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="ai-session-sweeper")
+
+    async def stop(self) -> None:
+        """Cancel the sweep loop."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def sweep(self) -> SweepResult:
+        """Run one sweep now (after writing pending keepalives)."""
+        if self.keepalive is not None:
+            await self.keepalive.flush()
+        result = await sweep_expired_sessions(self.batch_size, self.max_batches, self.session_cache)
+        self.runs += 1
+        self.total_expired += result.expired
+        self.last_result = result
+        if result.expired:
+            print(
+                f"Expired {result.expired} AI sessions ({result.with_answers} partly answered) "
+                f"in {result.batches} batches, {result.seconds}s"
+            )
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "total_expired": self.total_expired,
+            "last_run": self.last_result.as_dict() if self.last_result else None,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f"AI session sweep failed: {e}")
+
+
+# Singleton instance
+_session_sweeper: Optional[SessionSweeper] = None
+
+
+def get_session_sweeper() -> SessionSweeper:
+    """Get the session sweeper singleton.
+
+    Shares the AI assistant's session cache and this process's keepalives.
+    """
+    global _session_sweeper
+    if _session_sweeper is None:
+        settings = get_settings()
+        _session_sweeper = SessionSweeper(
+            interval_seconds=settings.ai_session_sweep_interval_seconds,
+            batch_size=settings.ai_session_sweep_batch_size,
+            max_batches=settings.ai_session_sweep_max_batches,
+            session_cache=get_ai_assistant().session_cache,
+            keepalive=get_session_keepalive(),
+        )
+    return _session_sweeper
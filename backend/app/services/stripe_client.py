@@ -0,0 +1,48 @@
+"""Stripe API client shared by the checkout endpoints.
+
+One stripe.StripeClient is built at startup with the secret key, its own
+timeout and retry policy, and an HTTP client on the shared outbound pool.
+Routes receive it as a dependency and call its async methods, so no
+request sets the global stripe.api_key or blocks the event loop.
+"""
+
+from typing import Optional
+
+import stripe
+
+from app.config import get_settings
+from app.services.http_pool import PooledStripeHTTPClient, get_http_pool
+
+
+def stripe_configured() -> bool:
+    """Whether a usable Stripe secret key is set."""
+    key = get_settings().stripe_secret_key
+    return bool(key) and "PLACEHOLDER" not in key
+
+
+# Singleton instance
+_stripe_client: Optional[stripe.StripeClient] = None
+
+
+def get_stripe_client() -> Optional[stripe.StripeClient]:
+    """Get the Stripe client singleton (None when Stripe is not configured)."""
+    global _stripe_client
+    if _stripe_client is None and stripe_configured():
+        settings = get_settings()
+        _stripe_client = stripe.StripeClient(
+            settings.stripe_secret_key,
+            http_client=PooledStripeHTTPClient(get_http_pool(), timeout=settings.stripe_timeout_seconds),
+            max_network_retries=settings.stripe_max_network_retries,
+        )
+    return _stripe_client
+
+
+async def stripe_client_dependency() -> Optional[stripe.StripeClient]:
+    """FastAPI dependency for the Stripe client (async, so it runs on the event loop)."""
+    return get_stripe_client()
+
+
+def close_stripe_client() -> None:
+    """Drop the Stripe client (its connections belong to the HTTP pool)."""
+    global _stripe_client
+    _stripe_client = None
@@ -1,27 +1,57 @@
 """Supabase client service for database operations."""
 
-from typing import Any, Optional
-from supabase import create_client, Client
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional
 from functools import lru_cache
 
+from postgrest import AsyncPostgrestClient
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_HEADERS
+from postgrest.exceptions import APIError
+
 from app.config import get_settings
+from app.services.http_pool import get_http_pool
+
+
+class _PooledPostgrestClient(AsyncPostgrestClient):
+    """PostgREST client whose session rides on the shared HTTP pool."""
+
+    def create_session(self, base_url, headers, timeout, verify=True, proxy=None):
+        return get_http_pool().client(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            follow_redirects=True,
+        )
 
 
 @lru_cache()
-def get_supabase_client() -> Client:
-    """Get cached Supabase client using service_role key."""
+def get_supabase_client() -> AsyncPostgrestClient:
+    """Get cached async PostgREST client using service_role key.
+
+    Only the REST (PostgREST) surface of Supabase is used by the backend, so
+    we talk to it directly with the async client. Every query is awaited and
+    never blocks the event loop. Connections come from the shared HTTP pool.
+    """
     settings = get_settings()
-    return create_client(
-        settings.supabase_url,
-        settings.supabase_service_role_key,
+    key = settings.supabase_service_role_key
+    return _PooledPostgrestClient(
+        f"{settings.supabase_url}/rest/v1",
+        headers={
+            **DEFAULT_POSTGREST_CLIENT_HEADERS,
+            "apiKey": key,
+            "Authorization": f"Bearer {key}",
+        },
+        timeout=settings.http_timeout_seconds,
     )
 
 
 class SupabaseService:
     """Service for Supabase database operations."""
 
-    def __init__(self):
-        self.client = get_supabase_client()
+    @property
+    def client(self) -> AsyncPostgrestClient:
+        # Resolved per use so holders of the service follow a rebuilt client
+        return get_supabase_client()
 
     async def create_inquiry(self, inquiry_data: dict[str, Any]) -> dict[str, Any]:
         """Create a new inquiry record.
@@ -35,7 +65,7 @@ class SupabaseService:
         Raises:
             Exception: If database insert fails
         """
-        result = (
+        result = await (
             self.client.table("inquiries")
             .insert(inquiry_data)
             .execute()
@@ -46,6 +76,47 @@ class SupabaseService:
 
         return result.data[0]
 
+    async def create_inquiry_with_event(
+        self,
+        inquiry_data: dict[str, Any],
+        event_type: str,
+        actor_type: str = "system",
+        new_value: Optional[str] = None,
+        reason: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """Create an inquiry and its audit event in one transaction.
+
+        Args:
+            inquiry_data: Dictionary containing all inquiry fields
+            event_type: Type of the audit event (e.g., "created")
+            actor_type: Who triggered the event (system/founder/webhook)
+            new_value: Event payload describing the new state
+            reason: Reason for the event
+
+        Returns:
+            The created inquiry record
+
+        Raises:
+            Exception: If the database function fails
+        """
+        result = await self.client.rpc(
+            "create_inquiry_with_event",
+            {
+                "p_inquiry": inquiry_data,
+                "p_event": {
+                    "event_type": event_type,
+                    "actor_type": actor_type,
+                    "new_value": new_value,
+                    "reason": reason,
+                },
+            },
+        ).execute()
+
+        if not result.data or not result.data.get("inquiry"):
+            raise Exception("Failed to create inquiry")
+
+        return result.data["inquiry"]
+
     async def get_inquiry(self, inquiry_id: str) -> Optional[dict[str, Any]]:
         """Get an inquiry by ID.
 
@@ -55,7 +126,7 @@ class SupabaseService:
         Returns:
             The inquiry record or None if not found
         """
-        result = (
+        result = await (
             self.client.table("inquiries")
             .select("*")
             .eq("id", inquiry_id)
@@ -76,7 +147,7 @@ class SupabaseService:
         Returns:
             The updated inquiry record
         """
-        result = (
+        result = await (
             self.client.table("inquiries")
             .update(updates)
             .eq("id", inquiry_id)
@@ -122,7 +193,7 @@ class SupabaseService:
             "reason": reason,
         }
 
-        result = (
+        result = await (
             self.client.table("inquiry_events")
             .insert(event_data)
             .execute()
@@ -133,48 +204,184 @@ class SupabaseService:
 
         return result.data[0]
 
-    async def check_rate_limit(
-        self, email: str, ip_address: Optional[str] = None
-    ) -> tuple[bool, str]:
-        """Check if submission is within rate limits.
+    async def get_latest_inquiry_event(
+        self, inquiry_id: str, event_type: str
+    ) -> Optional[dict[str, Any]]:
+        """Get the most recent event of a type for an inquiry.
 
         Args:
-            email: Email address to check
-            ip_address: IP address to check
+            inquiry_id: UUID of the inquiry
+            event_type: Type of event to look up
 
         Returns:
-            Tuple of (is_allowed, reason_if_blocked)
+            The event record or None if there is none
         """
-        from datetime import datetime, timedelta
-
-        # Check email rate limit: 3 per day
-        one_day_ago = (datetime.utcnow() - timedelta(days=1)).isoformat()
-        email_result = (
-            self.client.table("inquiries")
-            .select("id", count="exact")
-            .eq("email", email)
-            .gte("created_at", one_day_ago)
+        result = await (
+            self.client.table("inquiry_events")
+            .select("*")
+            .eq("inquiry_id", inquiry_id)
+            .eq("event_type", event_type)
+            .order("created_at", desc=True)
+            .limit(1)
             .execute()
         )
 
-        if email_result.count and email_result.count >= 3:
-            return False, "Maximum submissions per email reached for today"
+        return result.data[0] if result.data else None
+
+    async def get_recent_submissions(
+        self, since: datetime, page_size: int = 1000
+    ) -> list[dict[str, Any]]:
+        """Get email/IP/timestamp of inquiries created since a point in time.
+
+        Used to seed the rate limiter on a cold start.
+
+        Args:
+            since: Earliest created_at to include
+            page_size: Rows fetched per request
 
-        # Check IP rate limit: 10 per hour (if IP provided)
-        if ip_address:
-            one_hour_ago = (datetime.utcnow() - timedelta(hours=1)).isoformat()
-            ip_result = (
+        Returns:
+            List of {email, ip_address, created_at} rows
+        """
+        rows: list[dict[str, Any]] = []
+        offset = 0
+        while True:
+            result = await (
                 self.client.table("inquiries")
-                .select("id", count="exact")
-                .eq("ip_address", ip_address)
-                .gte("created_at", one_hour_ago)
+                .select("email, ip_address, created_at")
+                .gte("created_at", since.isoformat())
+                .order("created_at")
+                .range(offset, offset + page_size - 1)
                 .execute()
             )
+            rows.extend(result.data or [])
+            if len(result.data or []) < page_size:
+                return rows
+            offset += page_size
+
+    async def iter_inquiry_pages(
+        self, columns: str, page_size: int = 1000
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Stream all inquiries in pages (keyset pagination on id).
+
+        Used by offline tools (e.g. re-scoring past leads under new gate rules).
+
+        Args:
+            columns: PostgREST select list (must include id)
+            page_size: Rows fetched per request
 
-            if ip_result.count and ip_result.count >= 10:
-                return False, "Too many submissions from this location"
+        Yields:
+            Pages of inquiry rows, in id order
+        """
+        last_id = None
+        while True:
+            query = self.client.table("inquiries").select(columns).order("id").limit(page_size)
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            result = await query.execute()
+            rows = result.data or []
+            if rows:
+                yield rows
+                last_id = rows[-1]["id"]
+            if len(rows) < page_size:
+                return
+
+    # AI clarification methods
+    async def record_clarification_answer(
+        self,
+        session_id: str,
+        turn_index: int,
+        answer_value: Any,
+        return_inquiry: bool = True,
+    ) -> dict[str, Any]:
+        """Record a clarification answer in one transactional round trip.
+
+        Runs the record_clarification_answer database function, which
+        validates the session and turn, stores the answer, applies the
+        mapped field update and bumps question_count.
+
+        Args:
+            session_id: AI session ID
+            turn_index: Index of the turn being answered
+            answer_value: User's answer (option value, text, or bool)
+            return_inquiry: Include the inquiry's gate inputs (skip them when
+                the caller holds the form and applies the delta itself)
+
+        Returns:
+            Dict with refreshed session, turn, inquiry (None unless
+            return_inquiry), turns and the field_updated/old_value/new_value
+            of any field change
 
-        return True, ""
+        Raises:
+            ValueError: If the session/turn is missing, inactive or already answered
+        """
+        try:
+            result = await self.client.rpc(
+                "record_clarification_answer",
+                {
+                    "p_session_id": session_id,
+                    "p_turn_index": turn_index,
+                    "p_answer_value": answer_value,
+                    "p_return_inquiry": return_inquiry,
+                },
+            ).execute()
+        except APIError as e:
+            # P0001 = validation error raised by the function
+            if e.code == "P0001":
+                raise ValueError(e.message) from e
+            raise
+
+        return result.data
+
+    # AI session lifecycle methods
+    async def expire_ai_sessions(self, batch_size: int) -> dict[str, Any]:
+        """Expire one batch of overdue active AI sessions.
+
+        Runs the expire_ai_sessions database function, which closes the
+        sessions, routes them to manual review and records an audit event
+        per inquiry.
+
+        Args:
+            batch_size: Maximum sessions expired by this call
+
+        Returns:
+            Dict with expired and with_answers counts and the session_ids
+        """
+        result = await self.client.rpc(
+            "expire_ai_sessions", {"p_batch_size": batch_size}
+        ).execute()
+        return result.data
+
+    async def set_ai_session_expiry(self, session_id: str, expires_at: datetime) -> None:
+        """Set the expires_at of one AI session.
+
+        Args:
+            session_id: AI session ID
+            expires_at: New expiry
+        """
+        await (
+            self.client.table("ai_sessions")
+            .update({"expires_at": expires_at.isoformat()})
+            .eq("id", session_id)
+            .execute()
+        )
+
+    async def extend_ai_sessions(self, expires: dict[str, datetime]) -> int:
+        """Extend the expires_at of active AI sessions in one statement.
+
+        Args:
+            expires: New expires_at by session ID (never moves an expiry back)
+
+        Returns:
+            Number of sessions extended
+        """
+        result = await self.client.rpc(
+            "extend_ai_sessions",
+            {"p_sessions": [
+                {"id": session_id, "expires_at": expires_at.isoformat()}
+                for session_id, expires_at in expires.items()
+            ]},
+        ).execute()
+        return result.data
 
     # Webhook event methods
     async def create_webhook_event(
@@ -202,7 +409,7 @@ class SupabaseService:
             "status": "pending",
         }
 
-        result = (
+        result = await (
             self.client.table("webhook_events")
             .insert(event_data)
             .execute()
@@ -213,11 +420,73 @@ class SupabaseService:
 
         return result.data[0]
 
+    async def retry_failed_webhook_event(self, event_id: str) -> bool:
+        """Reset a failed webhook event to pending so it is processed again.
+
+        Only one of several concurrent retries of the same event wins.
+
+        Args:
+            event_id: Stripe event ID
+
+        Returns:
+            True if the event had failed and was reset
+        """
+        result = await (
+            self.client.table("webhook_events")
+            .update({"status": "pending", "error": None})
+            .eq("stripe_event_id", event_id)
+            .eq("status", "failed")
+            .execute()
+        )
+        return bool(result.data)
+
+    async def get_recent_webhook_event_ids(self, limit: int) -> list[str]:
+        """Get the Stripe event IDs of the most recently processed webhooks.
+
+        Used to warm the seen-event filter on startup (failed events are
+        left out so a Stripe retry processes them again).
+
+        Args:
+            limit: Maximum IDs returned
+
+        Returns:
+            Stripe event IDs, newest first
+        """
+        result = await (
+            self.client.table("webhook_events")
+            .select("stripe_event_id")
+            .eq("status", "processed")
+            .order("received_at", desc=True)
+            .limit(limit)
+            .execute()
+        )
+        return [row["stripe_event_id"] for row in result.data or []]
+
+    async def claim_webhook_events(
+        self, limit: int, lease_seconds: int
+    ) -> list[dict[str, Any]]:
+        """Lease a batch of due pending webhook events to this worker.
+
+        Args:
+            limit: Maximum events claimed
+            lease_seconds: How long the events are reserved for this worker
+
+        Returns:
+            The claimed webhook_events rows (attempts already incremented)
+        """
+        result = await self.client.rpc(
+            "claim_webhook_events",
+            {"p_limit": limit, "p_lease_seconds": lease_seconds},
+        ).execute()
+        return result.data or []
+
     async def update_webhook_event(
         self,
         event_id: str,
         status: str,
         error: Optional[str] = None,
+        retry_at: Optional[datetime] = None,
+        release_lease: bool = False,
     ) -> dict[str, Any]:
         """Update a webhook event status.
 
@@ -225,18 +494,25 @@ class SupabaseService:
             event_id: Stripe event ID
             status: New status (pending, processed, failed)
             error: Error message if failed
+            retry_at: Next attempt time when rescheduling a pending event
+            release_lease: Clear the webhook outbox worker's lease
+                (requires migration 009)
 
         Returns:
             The updated webhook event record
         """
         updates = {"status": status}
+        if release_lease:
+            updates["locked_until"] = None
         if error:
             updates["error"] = error
+        if retry_at is not None:
+            updates["next_attempt_at"] = retry_at.isoformat()
         if status == "processed":
             from datetime import datetime
             updates["processed_at"] = datetime.utcnow().isoformat()
 
-        result = (
+        result = await (
             self.client.table("webhook_events")
             .update(updates)
             .eq("stripe_event_id", event_id)
@@ -261,7 +537,7 @@ class SupabaseService:
         if "metadata" in payment_data and isinstance(payment_data["metadata"], dict):
             payment_data["metadata"] = json.dumps(payment_data["metadata"])
 
-        result = (
+        result = await (
             self.client.table("payments")
             .insert(payment_data)
             .execute()
@@ -272,6 +548,46 @@ class SupabaseService:
 
         return result.data[0]
 
+    async def complete_checkout(
+        self,
+        stripe_event_id: str,
+        payment_data: dict[str, Any],
+        inquiry_id: Optional[str] = None,
+        inquiry_updates: Optional[dict[str, Any]] = None,
+        event: Optional[dict[str, Any]] = None,
+    ) -> dict[str, Any]:
+        """Record a completed checkout atomically.
+
+        Inserts the payment, applies the inquiry status change, writes the
+        audit event and marks the webhook event processed in a single
+        transaction.
+
+        Args:
+            stripe_event_id: Stripe event ID of the webhook being handled
+            payment_data: Dictionary containing payment fields
+            inquiry_id: UUID of the linked inquiry, if any
+            inquiry_updates: Fields to update on the linked inquiry
+            event: Inquiry audit event fields (event_type, reason, ...)
+
+        Returns:
+            Dict with the created payment, updated inquiry and audit event
+        """
+        result = await self.client.rpc(
+            "complete_checkout",
+            {
+                "p_stripe_event_id": stripe_event_id,
+                "p_payment": payment_data,
+                "p_inquiry_id": inquiry_id,
+                "p_inquiry_updates": inquiry_updates,
+                "p_event": event,
+            },
+        ).execute()
+
+        if not result.data or not result.data.get("payment"):
+            raise Exception("Failed to record checkout")
+
+        return result.data
+
     async def get_payment_by_stripe_id(
         self, stripe_payment_id: str
     ) -> Optional[dict[str, Any]]:
@@ -283,7 +599,7 @@ class SupabaseService:
         Returns:
             The payment record or None if not found
         """
-        result = (
+        result = await (
             self.client.table("payments")
             .select("*")
             .eq("stripe_payment_id", stripe_payment_id)
@@ -304,7 +620,7 @@ class SupabaseService:
         Returns:
             The updated payment record
         """
-        result = (
+        result = await (
             self.client.table("payments")
             .update(updates)
             .eq("id", payment_id)
@@ -327,3 +643,14 @@ def get_supabase_service() -> SupabaseService:
     if _supabase_service is None:
         _supabase_service = SupabaseService()
     return _supabase_service
+
+
+def close_supabase_service() -> None:
+    """Drop the cached Supabase client (called before the HTTP pool closes).
+
+    The client holds a session on the current HTTP pool; the next query
+    builds a fresh one on the new pool.
+    """
+    global _supabase_service
+    _supabase_service = None
+    get_supabase_client.cache_clear()
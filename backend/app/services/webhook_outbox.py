@@ -0,0 +1,198 @@
+"""Background processing of stored webhook events.
+
+Opt-in via Settings.webhook_outbox_enabled (requires migration 009). The
+Stripe webhook endpoint then verifies the signature, stores the event in
+webhook_events (status 'pending') and acknowledges it. A bounded pool of
+workers here claims due pending events (claim_webhook_events, which leases
+rows with FOR UPDATE SKIP LOCKED; migration 009), runs the registered
+handler and marks the event processed. A failed attempt is rescheduled
+with exponential backoff; after webhook_max_attempts the event is marked
+failed for manual follow-up.
+
+Workers are woken as soon as this process stores an event and otherwise
+poll every webhook_poll_seconds (for events stored by other processes and
+for retries coming due).
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+from app.config import get_settings
+from app.services.supabase import get_supabase_service
+
+WebhookHandler = Callable[[dict, Any], Awaitable[None]]
+
+
+class WebhookOutbox:
+    """Worker pool processing pending webhook_events rows."""
+
+    def __init__(
+        self,
+        workers: int,
+        claim_batch_size: int,
+        poll_seconds: float,
+        lease_seconds: int,
+        max_attempts: int,
+        backoff_base_seconds: float,
+        backoff_max_seconds: float,
+    ):
+        self.workers = workers
+        self.claim_batch_size = claim_batch_size
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        # event_type -> (handler, whether the handler marks the event processed itself)
+        self._handlers: dict[str, tuple[WebhookHandler, bool]] = {}
+        self._wake = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self.processed = 0
+        self.retried = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def register(self, event_type: str, handler: WebhookHandler, marks_processed: bool = False) -> None:
+        """Register the handler for an event type.
+
+        Args:
+            event_type: Stripe event type (e.g. "checkout.session.completed")
+            handler: async handler(event, supabase)
+            marks_processed: The handler sets status 'processed' itself
+                (e.g. inside its own transaction)
+        """
+        self._handlers[event_type] = (handler, marks_processed)
+
+    def notify(self) -> None:
+        """Wake idle workers (an event was just stored)."""
+        self._wake.set()
+
+    def start(self) -> None:
+        """Start the workers (called from lifespan startup)."""
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._run(), name=f"webhook-outbox-{i}")
+                for i in range(self.workers)
+            ]
+
+    async def stop(self) -> None:
+        """Cancel the workers; claimed events are retried after their lease."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before the next attempt after `attempts` failed ones."""
+        return min(self.backoff_base_seconds * 2 ** (attempts - 1), self.backoff_max_seconds)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "workers": len(self._tasks),
+            "processed": self.processed,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+    async def process_due(self) -> int:
+        """Claim and process one batch of due events.
+
+        Returns:
+            Number of events claimed
+        """
+        rows = await get_supabase_service().claim_webhook_events(
+            self.claim_batch_size, self.lease_seconds
+        )
+        for row in rows:
+            await self._process(row)
+        return len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                claimed = await self.process_due()
+            except Exception as e:
+                print(f"Webhook claim failed: {e}")
+                claimed = 0
+            if claimed:
+                continue
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _process(self, row: dict[str, Any]) -> None:
+        supabase = get_supabase_service()
+        event_id = row["stripe_event_id"]
+        event_type = row["event_type"]
+
+        try:
+            payload = row["payload"]
+            event = json.loads(payload) if isinstance(payload, str) else payload
+
+            handler, marks_processed = self._handlers.get(event_type, (None, False))
+            if handler is None:
+                print(f"Unhandled webhook event type: {event_type}")
+            else:
+                # Finish well within the lease so no other worker reclaims it
+                await asyncio.wait_for(handler(event, supabase), timeout=self.lease_seconds / 2)
+
+            if not marks_processed:
+                await supabase.update_webhook_event(event_id, status="processed", release_lease=True)
+            self.processed += 1
+        except Exception as e:
+            await self._record_failure(row, e)
+
+    async def _record_failure(self, row: dict[str, Any], error: Exception) -> None:
+        event_id = row["stripe_event_id"]
+        attempts = row.get("attempts", 1)
+        message = str(error) or type(error).__name__
+        try:
+            if attempts >= self.max_attempts:
+                print(f"Webhook {event_id} failed after {attempts} attempts: {message}")
+                await get_supabase_service().update_webhook_event(
+                    event_id, status="failed", error=message, release_lease=True
+                )
+                self.failed += 1
+            else:
+                delay = self.backoff(attempts)
+                print(f"Webhook {event_id} attempt {attempts} failed ({message}); retrying in {delay:.0f}s")
+                await get_supabase_service().update_webhook_event(
+                    event_id,
+                    status="pending",
+                    error=message,
+                    retry_at=datetime.now(timezone.utc) + timedelta(seconds=delay),
+                    release_lease=True,
+                )
+                self.retried += 1
+        except Exception as e:
+            # The lease runs out and the event is claimed again
+            print(f"Failed to record webhook {event_id} failure: {e}")
+
+
+# Singleton instance
+_webhook_outbox: Optional[WebhookOutbox] = None
+
+
+def get_webhook_outbox() -> WebhookOutbox:
+    """Get the webhook outbox singleton."""
+    global _webhook_outbox
+    if _webhook_outbox is None:
+        settings = get_settings()
+        _webhook_outbox = WebhookOutbox(
+            workers=settings.webhook_workers,
+            claim_batch_size=settings.webhook_claim_batch_size,
+            poll_seconds=settings.webhook_poll_seconds,
+            lease_seconds=settings.webhook_lease_seconds,
+            max_attempts=settings.webhook_max_attempts,
+            backoff_base_seconds=settings.webhook_backoff_base_seconds,
+            backoff_max_seconds=settings.webhook_backoff_max_seconds,
+        )
+    return _webhook_outbox
@@ -3,7 +3,9 @@
 Apply SQL migrations to Supabase database.
 
 Usage:
-    python scripts/apply_migration.py
+    python scripts/apply_migration.py [migration_file]
+
+    migration_file defaults to 002_ai_assistant.sql
 
 This script reads the migration file and prints it for manual execution
 in the Supabase SQL editor, since the PostgREST API doesn't support raw SQL.
@@ -17,11 +19,12 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
 def main():
+    migration_name = sys.argv[1] if len(sys.argv) > 1 else "002_ai_assistant.sql"
     migration_path = os.path.join(
         os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
         "supabase",
         "migrations",
-        "002_ai_assistant.sql",
+        os.path.basename(migration_name),
     )
 
     if not os.path.exists(migration_path):
@@ -29,11 +32,9 @@ def main():
         sys.exit(1)
 
     print("=" * 70)
-    print("AI ASSISTANT MIGRATION")
+    print(f"MIGRATION: {os.path.basename(migration_path)}")
     print("=" * 70)
     print()
-    print("The ai_sessions and ai_turns tables need to be created in Supabase.")
-    print()
     print("To apply this migration:")
     print("1. Go to your Supabase dashboard: https://supabase.com/dashboard")
     print("2. Select your project")
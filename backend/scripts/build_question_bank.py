@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Build the precomputed clarification question bank.
+
+Usage:
+    python scripts/build_question_bank.py [--output PATH] [--concurrency N] [--fallback-only] [--fresh]
+
+Enumerates every bankable question-generation state (brief context x enum
+combination x ambiguity issue set x already-asked fields), generates the
+question with Gemini, validates it, and writes a gzipped artifact for
+Settings.ai_question_bank_path. Questions that fail generation or
+validation use the deterministic fallback question for that state.
+
+Cost: one Gemini call per state, about 26,000 states with the default
+ai_max_questions=3 (the script prints the exact count first). At the
+default concurrency of 8 that is on the order of an hour of model time.
+
+The build is resumable: every generated question is appended to
+<output>.partial.jsonl, and a rerun skips the states already in it
+(questions that failed are retried). The checkpoint is removed once the
+artifact is written; --fresh ignores it.
+
+Requires the backend environment (.env.local) and, unless --fallback-only,
+GEMINI_API_KEY. Rebuild whenever app/prompts/clarification.py changes;
+the service refuses to load a bank built from other templates.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import get_settings  # noqa: E402
+from app.schemas.ai_assistant import AIQuestion, AITriggerReason  # noqa: E402
+from app.schemas.intake import (  # noqa: E402
+    AccessModel,
+    BudgetRange,
+    IntakeFormRequest,
+    RoleTitle,
+    ServiceType,
+    Timeline,
+)
+from app.services.ai_assistant import AIAssistantService  # noqa: E402
+from app.services.llm_cache import PROMPT_TEMPLATES_HASH  # noqa: E402
+from app.services.question_bank import (  # noqa: E402
+    ASKABLE_FIELDS,
+    QuestionBank,
+    bank_key,
+    validate_question,
+)
+
+DEFAULT_OUTPUT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "question_bank.json.gz",
+)
+
+# Neutral stand-in below the minimum context length: only brief-context
+# states are banked (the LLM sees any substantive context at runtime)
+BRIEF_CONTEXT = "Not sure yet."
+
+
+def iter_states(service: AIAssistantService, max_questions: int):
+    """Yield (key, form, issues, previous_turns) for every bankable state."""
+    for service_type, budget, access, timeline, role in itertools.product(
+        ServiceType, BudgetRange, AccessModel, Timeline, RoleTitle
+    ):
+        form = IntakeFormRequest(
+            name="Prospect",
+            email="prospect@example.com",
+            role_title=role,
+            service_type=service_type,
+            context_raw=BRIEF_CONTEXT,
+            access_model=access,
+            timeline=timeline,
+            budget_range=budget,
+        )
+        issues = service._triggers_to_issues([AITriggerReason.AMBIGUITY], form)
+        if not issues:
+            continue
+
+        for asked_count in range(max_questions):
+            for asked in itertools.combinations(ASKABLE_FIELDS, asked_count):
+                previous_turns = [
+                    {
+                        "turn_index": i,
+                        "question_text": f"(Earlier question about {field})",
+                        "answer_text": "(Answered)",
+                        "target_field": field,
+                    }
+                    for i, field in enumerate(asked)
+                ]
+                key = bank_key(form, issues, previous_turns)
+                if key is not None:
+                    yield key, form, issues, previous_turns
+
+
+def load_checkpoint(path: str, max_questions: int) -> dict[str, AIQuestion]:
+    """Read generated questions from an earlier, interrupted build.
+
+    A checkpoint from other prompt templates or settings is ignored.
+    """
+    if not os.path.exists(path):
+        return {}
+
+    entries: dict[str, AIQuestion] = {}
+    with open(path, encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+        if header != {"templates_hash": PROMPT_TEMPLATES_HASH, "max_questions": max_questions}:
+            print(f"Ignoring checkpoint {path} (built with other templates or settings)")
+            return {}
+        for line in f:
+            try:
+                record = json.loads(line)
+                entries[record["key"]] = AIQuestion.model_validate(record["question"])
+            except (ValueError, KeyError):
+                continue  # Line cut off by the interruption
+    return entries
+
+
+async def build(output: str, concurrency: int, fallback_only: bool, fresh: bool) -> None:
+    settings = get_settings()
+    service = AIAssistantService()
+    service.question_bank = None  # Never answer from an existing bank
+    if fallback_only:
+        service.llm = None
+    elif service.llm is None:
+        print("ERROR: GEMINI_API_KEY is not configured (use --fallback-only to build without it)")
+        sys.exit(1)
+
+    max_questions = settings.ai_max_questions
+    states = list(iter_states(service, max_questions))
+
+    checkpoint_path = f"{output}.partial.jsonl"
+    if fresh and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    entries = {} if fallback_only else load_checkpoint(checkpoint_path, max_questions)
+    resumed = len(entries)
+    remaining = [state for state in states if state[0] not in entries]
+    print(
+        f"Building question bank for {len(states)} states "
+        f"({resumed} from checkpoint, {len(remaining)} to generate, concurrency={concurrency})"
+    )
+
+    checkpoint = None
+    if not fallback_only:
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        new_checkpoint = not os.path.exists(checkpoint_path) or resumed == 0
+        checkpoint = open(checkpoint_path, "w" if new_checkpoint else "a", encoding="utf-8")
+        if new_checkpoint:
+            checkpoint.write(json.dumps({"templates_hash": PROMPT_TEMPLATES_HASH, "max_questions": max_questions}) + "\n")
+
+    counts = {"llm": resumed, "fallback": 0, "invalid": 0}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def generate(key, form, issues, previous_turns) -> None:
+        session = {"question_count": len(previous_turns), "max_questions": max_questions}
+        question = None
+        if service.llm is not None:
+            async with semaphore:
+                try:
+                    question = await service._generate_question_llm(session, form, issues, previous_turns)
+                except Exception as e:
+                    print(f"  {key}: generation failed ({e})")
+
+        if question is not None:
+            problems = validate_question(question)
+            if problems:
+                print(f"  {key}: invalid ({'; '.join(problems)})")
+                counts["invalid"] += 1
+                question = None
+            else:
+                counts["llm"] += 1
+                checkpoint.write(json.dumps({"key": key, "question": question.model_dump(mode="json")}) + "\n")
+                checkpoint.flush()
+
+        if question is None:
+            question = service._get_fallback_question(form, issues, previous_turns)
+            counts["fallback"] += 1
+
+        entries[key] = question
+        if len(entries) % 500 == 0:
+            print(f"  {len(entries)}/{len(states)}")
+
+    started = time.monotonic()
+    try:
+        await asyncio.gather(*(generate(*state) for state in remaining))
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    QuestionBank.save(output, entries, meta={
+        "model": service.llm.name if service.llm else None,
+        "max_questions": max_questions,
+        "built_at": datetime.now(timezone.utc).isoformat(),
+    })
+    if checkpoint is not None:
+        os.remove(checkpoint_path)
+
+    print()
+    print(f"Wrote {output} in {time.monotonic() - started:.0f}s")
+    print(f"  states:   {len(entries)}")
+    print(f"  llm:      {counts['llm']}")
+    print(f"  fallback: {counts['fallback']} ({counts['invalid']} failed validation)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Artifact path (.json.gz)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent Gemini calls")
+    parser.add_argument("--fallback-only", action="store_true", help="Use deterministic questions only")
+    parser.add_argument("--fresh", action="store_true", help="Ignore the checkpoint of an interrupted build")
+    args = parser.parse_args()
+
+    asyncio.run(build(args.output, args.concurrency, args.fallback_only, args.fresh))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Re-score past inquiries under a set of gate rules and report routing changes.
+
+Usage:
+    python scripts/rescore_inquiries.py [--rules PATH] [--min-budget-threshold B]
+        [--min-context-length N] [--page-size N] [--output PATH]
+
+Streams every inquiry from Supabase page by page, evaluates the gate for
+each page at once (app/services/gate_batch.py) and compares the result with
+the routing stored at submission time. The JSON report groups the changes
+by the rules_version each inquiry was originally scored with, e.g.
+
+    {"by_rules_version": {"1.0.0": {"inquiries": 812, "routing_changed": 37,
+        "routing_changes": {"paid_advisory -> calendly_strategy_free": 37}, ...}}}
+
+Rules default to the current Settings; --rules loads a rules document (the
+format of Settings.gate_rules_path) and the threshold flags override either.
+
+Requires the backend environment (.env.local).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import get_settings  # noqa: E402
+from app.services.gate import CompiledGate, GateRules, load_gate_rules  # noqa: E402
+from app.services.gate_batch import (  # noqa: E402
+    GATE_STATUSES,
+    ROUTING_RESULTS,
+    GateColumns,
+    decode,
+    encode,
+    evaluate_gate_many,
+)
+from app.services.supabase import get_supabase_service  # noqa: E402
+
+INQUIRY_COLUMNS = (
+    "id, email_domain, role_title, service_type, access_model, timeline, budget_range, "
+    "context_raw, rules_version, gate_status, routing_result, "
+    "is_decision_maker:answers_raw->extended->is_decision_maker"
+)
+
+
+def build_rules(rules_path: str, min_budget_threshold: str, min_context_length: int) -> GateRules:
+    """The rules to re-score with (Settings, a rules document, then flag overrides)."""
+    rules = load_gate_rules(rules_path) if rules_path else GateRules.from_settings(get_settings())
+
+    overrides = {}
+    if min_budget_threshold:
+        overrides["min_budget_threshold"] = min_budget_threshold
+    if min_context_length is not None:
+        overrides["min_context_length"] = min_context_length
+    if overrides:
+        rules = GateRules.from_dict({"rules_version": f"{rules.version}+what-if", **overrides}, base=rules)
+    return rules
+
+
+class RoutingDiff:
+    """Routing and gate status changes, grouped by original rules_version."""
+
+    def __init__(self):
+        self.inquiries: Counter = Counter()
+        self.unscorable: Counter = Counter()
+        self.routing_changes: dict[str, Counter] = defaultdict(Counter)
+        self.gate_status_changes: dict[str, Counter] = defaultdict(Counter)
+
+    def add_page(self, rows: list[dict], engine: CompiledGate) -> None:
+        columns = GateColumns.from_inquiries(rows, engine.rules.personal_email_domains)
+        result = evaluate_gate_many(columns, engine)
+
+        versions = [row.get("rules_version") or "unknown" for row in rows]
+        self.inquiries.update(versions)
+        for i in np.flatnonzero(~columns.valid).tolist():
+            self.unscorable[versions[i]] += 1
+
+        old_routing = encode(ROUTING_RESULTS, (row.get("routing_result") for row in rows))
+        old_status = encode(GATE_STATUSES, (row.get("gate_status") for row in rows))
+        self._count(self.routing_changes, versions, ROUTING_RESULTS, old_routing, result.routing_result)
+        self._count(self.gate_status_changes, versions, GATE_STATUSES, old_status, result.gate_status)
+
+    @staticmethod
+    def _count(changes, versions, enum_values, old: np.ndarray, new: np.ndarray) -> None:
+        changed = np.flatnonzero((new >= 0) & (old != new))
+        if not len(changed):
+            return
+        old_values = decode(enum_values, old[changed])
+        new_values = decode(enum_values, new[changed])
+        for i, before, after in zip(changed.tolist(), old_values, new_values):
+            changes[versions[i]][f"{before} -> {after}"] += 1
+
+    def report(self, rules: GateRules) -> dict:
+        by_version = {}
+        for version in sorted(self.inquiries):
+            routing = self.routing_changes.get(version, Counter())
+            gate_status = self.gate_status_changes.get(version, Counter())
+            by_version[version] = {
+                "inquiries": self.inquiries[version],
+                "unscorable": self.unscorable[version],
+                "routing_changed": sum(routing.values()),
+                "gate_status_changed": sum(gate_status.values()),
+                "routing_changes": dict(routing.most_common()),
+                "gate_status_changes": dict(gate_status.most_common()),
+            }
+        return {
+            "rules_version": rules.version,
+            "rules": {
+                "min_context_length": rules.min_context_length,
+                "min_budget_threshold": rules.min_budget.value,
+            },
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "totals": {
+                key: sum(v[key] for v in by_version.values())
+                for key in ("inquiries", "unscorable", "routing_changed", "gate_status_changed")
+            },
+            "by_rules_version": by_version,
+        }
+
+
+async def rescore(rules: GateRules, page_size: int, output: str) -> None:
+    engine = CompiledGate(rules)
+    supabase = get_supabase_service()
+    diff = RoutingDiff()
+
+    print(f"Re-scoring inquiries under gate rules {rules.version}")
+    started = time.monotonic()
+    async for page in supabase.iter_inquiry_pages(INQUIRY_COLUMNS, page_size=page_size):
+        diff.add_page(page, engine)
+        print(f"  {sum(diff.inquiries.values())} inquiries")
+
+    report = diff.report(rules)
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"Wrote {output}")
+    else:
+        print(text)
+
+    totals = report["totals"]
+    print()
+    print(f"Done in {time.monotonic() - started:.1f}s")
+    print(f"  inquiries:       {totals['inquiries']} ({totals['unscorable']} unscorable)")
+    print(f"  routing changed: {totals['routing_changed']}")
+    print(f"  status changed:  {totals['gate_status_changed']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rules", default="", help="Gate rules document (JSON)")
+    parser.add_argument("--min-budget-threshold", default="", help="Override gate_min_budget_threshold")
+    parser.add_argument("--min-context-length", type=int, default=None, help="Override gate_min_context_length")
+    parser.add_argument("--page-size", type=int, default=1000, help="Inquiries fetched per request")
+    parser.add_argument("--output", default="", help="Report path (default: stdout)")
+    args = parser.parse_args()
+
+    rules = build_rules(args.rules, args.min_budget_threshold, args.min_context_length)
+    asyncio.run(rescore(rules, args.page_size, args.output))
+
+
+if __name__ == "__main__":
+    main()
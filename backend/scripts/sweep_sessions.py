@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Expire abandoned AI clarification sessions.
+
+Usage:
+    python scripts/sweep_sessions.py [--batch-size N] [--max-batches N]
+
+Runs one sweep (the same one the app runs every
+ai_session_sweep_interval_seconds): active sessions past expires_at are
+expired in batches and their inquiries routed to manual review. Useful
+from cron when the in-app sweeper is disabled, or to drain a backlog after
+applying migration 007.
+
+Requires the backend environment (.env.local).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import get_settings  # noqa: E402
+from app.services.session_sweeper import sweep_expired_sessions  # noqa: E402
+
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.ai_session_sweep_batch_size, help="Sessions per database call"
+    )
+    parser.add_argument(
+        "--max-batches", type=int, default=1000, help="Database calls before stopping"
+    )
+    args = parser.parse_args()
+
+    result = asyncio.run(sweep_expired_sessions(args.batch_size, args.max_batches))
+    print(json.dumps(result.as_dict()))
+
+
+if __name__ == "__main__":
+    main()
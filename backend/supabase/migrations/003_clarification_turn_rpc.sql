@@ -0,0 +1,163 @@
+-- Migration: 003_clarification_turn_rpc
+-- Description: Single round-trip, transactional processing of a clarification answer
+-- Created: 2026-10-17
+
+-- ============================================================================
+-- FUNCTIONS
+-- ============================================================================
+
+-- Record a user's answer to a clarification turn.
+--
+-- In one transaction:
+--   1. Locks and validates the session (must exist and be active)
+--   2. Locks and validates the turn (must exist and be unanswered)
+--   3. Records the answer (answer_value, answer_text, answered_at)
+--   4. Applies the option's maps_to_field update (or appends to context_raw
+--      for text answers) to the inquiry
+--   5. Increments question_count and merges field_updates on the session
+--
+-- Returns the refreshed session, turn, inquiry and full turn history so the
+-- caller can re-gate without further reads.
+--
+-- Validation failures raise P0001 with a user-facing message
+-- ("Session not found", "Question already answered", ...).
+CREATE OR REPLACE FUNCTION record_clarification_answer(
+  p_session_id UUID,
+  p_turn_index INTEGER,
+  p_answer_value JSONB
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_session ai_sessions%ROWTYPE;
+  v_turn ai_turns%ROWTYPE;
+  v_option JSONB;
+  v_answer_text TEXT;
+  v_field TEXT;
+  v_old_value JSONB;
+  v_new_value JSONB;
+BEGIN
+  -- 1. Session
+  SELECT * INTO v_session FROM ai_sessions WHERE id = p_session_id FOR UPDATE;
+  IF NOT FOUND THEN
+    RAISE EXCEPTION 'Session not found' USING ERRCODE = 'P0001';
+  END IF;
+  IF v_session.status <> 'active' THEN
+    RAISE EXCEPTION 'Session is %, not active', v_session.status USING ERRCODE = 'P0001';
+  END IF;
+
+  -- 2. Turn (row lock closes the race between duplicate submissions)
+  SELECT * INTO v_turn
+  FROM ai_turns
+  WHERE session_id = p_session_id AND turn_index = p_turn_index
+  FOR UPDATE;
+  IF NOT FOUND THEN
+    RAISE EXCEPTION 'Turn not found' USING ERRCODE = 'P0001';
+  END IF;
+  IF v_turn.answered_at IS NOT NULL THEN
+    RAISE EXCEPTION 'Question already answered' USING ERRCODE = 'P0001';
+  END IF;
+
+  -- 3. Resolve the selected option and display text
+  v_answer_text := CASE jsonb_typeof(p_answer_value)
+    WHEN 'string' THEN p_answer_value #>> '{}'
+    ELSE p_answer_value::text
+  END;
+
+  IF v_turn.options IS NOT NULL THEN
+    SELECT opt INTO v_option
+    FROM jsonb_array_elements(v_turn.options) AS opt
+    WHERE opt -> 'value' = p_answer_value
+    LIMIT 1;
+
+    IF v_option IS NOT NULL THEN
+      v_answer_text := COALESCE(v_option ->> 'label', v_answer_text);
+    END IF;
+  END IF;
+
+  -- 4. Field update
+  IF v_turn.options IS NULL THEN
+    -- Text answer to a context question appends to context_raw
+    IF v_turn.target_field = 'context_raw' AND jsonb_typeof(p_answer_value) = 'string' THEN
+      v_field := 'context_raw';
+      SELECT to_jsonb(context_raw) INTO v_old_value
+      FROM inquiries WHERE id = v_session.inquiry_id FOR UPDATE;
+
+      v_new_value := to_jsonb(
+        CASE
+          WHEN COALESCE(v_old_value #>> '{}', '') = '' THEN p_answer_value #>> '{}'
+          ELSE (v_old_value #>> '{}') || E'\n\n' || (p_answer_value #>> '{}')
+        END
+      );
+
+      UPDATE inquiries SET context_raw = v_new_value #>> '{}'
+      WHERE id = v_session.inquiry_id;
+    END IF;
+  ELSIF v_option IS NOT NULL
+    AND v_option ->> 'maps_to_field' IS NOT NULL
+    AND jsonb_typeof(v_option -> 'maps_to_value') <> 'null'
+  THEN
+    v_field := v_option ->> 'maps_to_field';
+    v_new_value := v_option -> 'maps_to_value';
+
+    -- Only enum form fields may be rewritten; their type names match the column names
+    IF v_field IN ('budget_range', 'service_type', 'access_model', 'timeline', 'role_title') THEN
+      EXECUTE format(
+        'SELECT to_jsonb(%1$I) FROM inquiries WHERE id = $1 FOR UPDATE',
+        v_field
+      ) INTO v_old_value USING v_session.inquiry_id;
+
+      EXECUTE format(
+        'UPDATE inquiries SET %1$I = ($1 #>> ''{}'')::%1$I WHERE id = $2',
+        v_field
+      ) USING v_new_value, v_session.inquiry_id;
+    ELSE
+      v_field := NULL;
+      v_new_value := NULL;
+    END IF;
+  END IF;
+
+  UPDATE ai_turns SET
+    answer_value = CASE
+      WHEN jsonb_typeof(p_answer_value) IN ('object', 'array') THEN p_answer_value
+      ELSE jsonb_build_object('value', p_answer_value)
+    END,
+    answer_text = v_answer_text,
+    answered_at = now(),
+    field_updated = (v_field IS NOT NULL),
+    old_field_value = CASE WHEN v_field IS NOT NULL THEN v_old_value END,
+    new_field_value = CASE WHEN v_field IS NOT NULL THEN v_new_value END
+  WHERE id = v_turn.id
+  RETURNING * INTO v_turn;
+
+  -- 5. Session progress
+  UPDATE ai_sessions SET
+    question_count = question_count + 1,
+    field_updates = CASE
+      WHEN v_field IS NULL THEN field_updates
+      ELSE field_updates || jsonb_build_object(
+        v_field,
+        jsonb_build_object('old', v_old_value, 'new', v_new_value, 'turn_index', v_turn.turn_index)
+      )
+    END
+  WHERE id = p_session_id
+  RETURNING * INTO v_session;
+
+  RETURN jsonb_build_object(
+    'session', to_jsonb(v_session),
+    'turn', to_jsonb(v_turn),
+    'inquiry', (SELECT to_jsonb(i) FROM inquiries i WHERE i.id = v_session.inquiry_id),
+    'turns', (
+      SELECT COALESCE(jsonb_agg(to_jsonb(t) ORDER BY t.turn_index), '[]'::jsonb)
+      FROM ai_turns t WHERE t.session_id = p_session_id
+    ),
+    'field_updated', v_field,
+    'old_value', CASE WHEN v_field IS NOT NULL THEN v_old_value END,
+    'new_value', CASE WHEN v_field IS NOT NULL THEN v_new_value END
+  );
+END;
+$$;
+
+COMMENT ON FUNCTION record_clarification_answer(UUID, INTEGER, JSONB) IS
+  'Validates and records a clarification answer, applies its field update and returns refreshed state';
@@ -0,0 +1,145 @@
+-- Migration: 004_transactional_writes
+-- Description: Atomic multi-write functions for intake creation and Stripe checkout completion
+-- Created: 2026-10-17
+
+-- ============================================================================
+-- HELPERS
+-- ============================================================================
+
+-- Comma-separated, quoted column list for the keys of a JSON object.
+-- Used to insert only the supplied columns so table defaults still apply.
+CREATE OR REPLACE FUNCTION jsonb_column_list(p_row JSONB)
+RETURNS TEXT
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT string_agg(quote_ident(key), ', ')
+  FROM jsonb_object_keys(p_row) AS key;
+$$;
+
+-- ============================================================================
+-- FUNCTIONS
+-- ============================================================================
+
+-- Create an inquiry and its "created" audit event in one transaction.
+--
+-- p_inquiry: inquiry columns (same shape as a PostgREST insert)
+-- p_event:   inquiry_events columns except inquiry_id
+--
+-- Returns {"inquiry": {...}, "event": {...}}
+CREATE OR REPLACE FUNCTION create_inquiry_with_event(
+  p_inquiry JSONB,
+  p_event JSONB
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_cols TEXT := jsonb_column_list(p_inquiry);
+  v_inquiry inquiries%ROWTYPE;
+  v_event inquiry_events%ROWTYPE;
+BEGIN
+  EXECUTE format(
+    'INSERT INTO inquiries (%1$s) SELECT %1$s FROM jsonb_populate_record(NULL::inquiries, $1) RETURNING *',
+    v_cols
+  ) INTO v_inquiry USING p_inquiry;
+
+  INSERT INTO inquiry_events (inquiry_id, event_type, actor_type, actor_id, old_value, new_value, reason)
+  VALUES (
+    v_inquiry.id,
+    p_event ->> 'event_type',
+    COALESCE(p_event ->> 'actor_type', 'system')::actor_type,
+    p_event ->> 'actor_id',
+    p_event ->> 'old_value',
+    p_event ->> 'new_value',
+    p_event ->> 'reason'
+  )
+  RETURNING * INTO v_event;
+
+  RETURN jsonb_build_object('inquiry', to_jsonb(v_inquiry), 'event', to_jsonb(v_event));
+END;
+$$;
+
+-- Record a completed Stripe checkout in one transaction:
+--   1. Insert the payment
+--   2. Apply p_inquiry_updates to the linked inquiry (if any)
+--   3. Insert the payment audit event (if linked to an inquiry)
+--   4. Mark the webhook event processed
+--
+-- A failure at any step rolls back all of them, so a payment can never be
+-- recorded without its inquiry status change (or vice versa). The webhook
+-- handler then marks the event failed; a Stripe retry resets it to pending
+-- (SupabaseService.retry_failed_webhook_event) and runs this again from a
+-- clean slate.
+--
+-- Returns {"payment": {...}, "inquiry": {...} | null, "event": {...} | null}
+CREATE OR REPLACE FUNCTION complete_checkout(
+  p_stripe_event_id TEXT,
+  p_payment JSONB,
+  p_inquiry_id UUID DEFAULT NULL,
+  p_inquiry_updates JSONB DEFAULT NULL,
+  p_event JSONB DEFAULT NULL
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_payment payments%ROWTYPE;
+  v_inquiry JSONB;
+  v_event JSONB;
+  v_cols TEXT;
+BEGIN
+  -- 1. Payment
+  EXECUTE format(
+    'INSERT INTO payments (%1$s) SELECT %1$s FROM jsonb_populate_record(NULL::payments, $1) RETURNING *',
+    jsonb_column_list(p_payment)
+  ) INTO v_payment USING p_payment;
+
+  IF p_inquiry_id IS NOT NULL THEN
+    -- 2. Inquiry status change
+    IF p_inquiry_updates IS NOT NULL AND p_inquiry_updates <> '{}'::jsonb THEN
+      v_cols := jsonb_column_list(p_inquiry_updates);
+      EXECUTE format(
+        'UPDATE inquiries SET (%1$s) = (SELECT %1$s FROM jsonb_populate_record(NULL::inquiries, $1)) '
+        'WHERE id = $2 RETURNING to_jsonb(inquiries.*)',
+        v_cols
+      ) INTO v_inquiry USING p_inquiry_updates, p_inquiry_id;
+
+      IF v_inquiry IS NULL THEN
+        RAISE EXCEPTION 'Failed to update inquiry %', p_inquiry_id;
+      END IF;
+    END IF;
+
+    -- 3. Audit event
+    IF p_event IS NOT NULL THEN
+      INSERT INTO inquiry_events (inquiry_id, event_type, actor_type, actor_id, old_value, new_value, reason)
+      VALUES (
+        p_inquiry_id,
+        p_event ->> 'event_type',
+        COALESCE(p_event ->> 'actor_type', 'system')::actor_type,
+        p_event ->> 'actor_id',
+        p_event ->> 'old_value',
+        p_event ->> 'new_value',
+        p_event ->> 'reason'
+      )
+      RETURNING to_jsonb(inquiry_events.*) INTO v_event;
+    END IF;
+  END IF;
+
+  -- 4. Webhook bookkeeping
+  UPDATE webhook_events
+  SET status = 'processed', processed_at = now()
+  WHERE stripe_event_id = p_stripe_event_id;
+
+  RETURN jsonb_build_object(
+    'payment', to_jsonb(v_payment),
+    'inquiry', v_inquiry,
+    'event', v_event
+  );
+END;
+$$;
+
+COMMENT ON FUNCTION create_inquiry_with_event(JSONB, JSONB) IS
+  'Atomically creates an inquiry and its audit event';
+COMMENT ON FUNCTION complete_checkout(TEXT, JSONB, UUID, JSONB, JSONB) IS
+  'Atomically records a checkout payment, inquiry status change, audit event and webhook status';
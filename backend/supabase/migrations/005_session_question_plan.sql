@@ -0,0 +1,17 @@
+-- Migration: 005_session_question_plan
+-- Description: Whole-session clarification question plan on ai_sessions
+-- Created: 2026-10-17
+
+-- ============================================================================
+-- COLUMNS
+-- ============================================================================
+
+-- Planned follow-up questions, keyed by answer value (see
+-- app/services/question_plan.py). Written once in the background after the
+-- session is created; NULL until then or if planning is disabled/failed.
+-- record_clarification_answer returns it with the session row, so later
+-- turns can be served without an LLM call.
+ALTER TABLE ai_sessions ADD COLUMN question_plan JSONB;
+
+COMMENT ON COLUMN ai_sessions.question_plan IS
+  'Question tree for the session: {format, question, next: {answer_value: {question, next}}}';
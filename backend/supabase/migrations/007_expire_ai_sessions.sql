@@ -0,0 +1,104 @@
+-- Migration: 007_expire_ai_sessions
+-- Description: Bulk expiry of abandoned AI clarification sessions
+-- Created: 2026-10-17
+
+-- ============================================================================
+-- FUNCTIONS
+-- ============================================================================
+
+-- Expire up to p_batch_size active sessions whose expires_at has passed.
+--
+-- Expired sessions are closed the way the backend closes a session that
+-- runs out of questions (AIAssistantService._complete_session with status
+-- manual): latest gate status and routing become 'manual' and final_output
+-- holds the clarifications made so far. Each inquiry gets an
+-- 'ai_session_expired' audit event so it shows up for manual review.
+--
+-- Candidates come from idx_ai_sessions_active_expires, oldest first; rows
+-- locked by a concurrent answer or keepalive are skipped (SKIP LOCKED) and
+-- picked up by a later run if still overdue. Call repeatedly until
+-- 'expired' < p_batch_size to drain a backlog.
+--
+-- Returns {"expired": n, "with_answers": n, "session_ids": [...]}
+CREATE OR REPLACE FUNCTION expire_ai_sessions(p_batch_size INTEGER DEFAULT 500)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_result JSONB;
+BEGIN
+  WITH due AS (
+    SELECT id
+    FROM ai_sessions
+    WHERE status = 'active' AND expires_at < now()
+    ORDER BY expires_at
+    LIMIT p_batch_size
+    FOR UPDATE SKIP LOCKED
+  ),
+  turn_summary AS (
+    SELECT
+      t.session_id,
+      count(*) AS questions_asked,
+      count(t.answered_at) AS answered,
+      COALESCE(
+        jsonb_agg(
+          jsonb_build_object(
+            'field', t.target_field,
+            'old_value', t.old_field_value,
+            'new_value', t.new_field_value,
+            'turn_index', t.turn_index,
+            'user_confirmed', true,
+            'trigger_reason', 'user_clarification'
+          ) ORDER BY t.turn_index
+        ) FILTER (WHERE t.field_updated AND t.target_field IS NOT NULL),
+        '[]'::jsonb
+      ) AS clarifications
+    FROM ai_turns t
+    JOIN due ON due.id = t.session_id
+    GROUP BY t.session_id
+  ),
+  expired AS (
+    UPDATE ai_sessions s SET
+      status = 'expired',
+      latest_gate_status = 'manual',
+      latest_routing_result = 'manual',
+      final_output = jsonb_build_object(
+        'clarifications', COALESCE(ts.clarifications, '[]'::jsonb),
+        'intelligence_gathered', '{}'::jsonb,
+        'ai_pre_call_notes', jsonb_build_object(
+          'session_status', 'expired',
+          'questions_asked', COALESCE(ts.questions_asked, 0),
+          'final_gate_status', 'manual',
+          'final_routing', 'manual'
+        )
+      )
+    FROM due
+    LEFT JOIN turn_summary ts ON ts.session_id = due.id
+    WHERE s.id = due.id
+    RETURNING s.id, s.inquiry_id, COALESCE(ts.answered, 0) AS answered
+  ),
+  events AS (
+    INSERT INTO inquiry_events (inquiry_id, event_type, actor_type, old_value, new_value, reason)
+    SELECT
+      inquiry_id,
+      'ai_session_expired',
+      'system',
+      id::text,
+      jsonb_build_object('gate_status', 'manual', 'routing_result', 'manual')::text,
+      'AI clarification session expired before completion'
+    FROM expired
+  )
+  SELECT jsonb_build_object(
+    'expired', count(*),
+    'with_answers', count(*) FILTER (WHERE answered > 0),
+    'session_ids', COALESCE(jsonb_agg(id), '[]'::jsonb)
+  )
+  INTO v_result
+  FROM expired;
+
+  RETURN v_result;
+END;
+$$;
+
+COMMENT ON FUNCTION expire_ai_sessions(INTEGER) IS
+  'Expires a bounded batch of overdue active AI sessions, routing them to manual review';
@@ -0,0 +1,34 @@
+-- Migration: 008_extend_ai_sessions
+-- Description: Batched expires_at extension for session keepalives
+-- Created: 2026-10-17
+
+-- ============================================================================
+-- FUNCTIONS
+-- ============================================================================
+
+-- Apply a batch of coalesced keepalives in one statement.
+--
+-- p_sessions: [{"id": "<uuid>", "expires_at": "<timestamptz>"}, ...]
+--
+-- Only active sessions are extended, and expires_at never moves backwards
+-- (a late flush from one worker can't undo a newer one from another).
+--
+-- Returns the number of sessions extended.
+CREATE OR REPLACE FUNCTION extend_ai_sessions(p_sessions JSONB)
+RETURNS INTEGER
+LANGUAGE sql
+AS $$
+  WITH extended AS (
+    UPDATE ai_sessions s
+    SET expires_at = v.expires_at
+    FROM jsonb_to_recordset(p_sessions) AS v(id UUID, expires_at TIMESTAMPTZ)
+    WHERE s.id = v.id
+      AND s.status = 'active'
+      AND s.expires_at < v.expires_at
+    RETURNING 1
+  )
+  SELECT count(*)::integer FROM extended;
+$$;
+
+COMMENT ON FUNCTION extend_ai_sessions(JSONB) IS
+  'Extends expires_at of active AI sessions from a batch of keepalives';
@@ -0,0 +1,69 @@
+-- Migration: 009_webhook_outbox
+-- Description: Process Stripe webhooks from webhook_events in the background
+-- Created: 2026-10-17
+
+-- The webhook endpoint only verifies and stores the event (status
+-- 'pending'); workers claim pending rows, run the handlers and retry
+-- failures with exponential backoff. See app/services/webhook_outbox.py.
+
+-- ============================================================================
+-- COLUMNS
+-- ============================================================================
+
+ALTER TABLE webhook_events
+  ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0,
+  ADD COLUMN next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  ADD COLUMN locked_until TIMESTAMPTZ;
+
+COMMENT ON COLUMN webhook_events.attempts IS 'Processing attempts so far (incremented on claim)';
+COMMENT ON COLUMN webhook_events.next_attempt_at IS 'Earliest time a worker may (re)try the event';
+COMMENT ON COLUMN webhook_events.locked_until IS 'Lease of the worker processing the event; reclaimable after this';
+
+-- ============================================================================
+-- INDEXES
+-- ============================================================================
+
+-- Pending events in claim order
+CREATE INDEX idx_webhook_events_pending_next_attempt
+  ON webhook_events(next_attempt_at)
+  WHERE status = 'pending';
+
+-- ============================================================================
+-- FUNCTIONS
+-- ============================================================================
+
+-- Claim up to p_limit due pending events for one worker.
+--
+-- Rows being claimed by another worker are skipped (SKIP LOCKED) and a
+-- claimed row is leased for p_lease_seconds, so each event is processed
+-- by one worker at a time; if the worker dies the lease runs out and the
+-- event is claimed again. Claiming counts as an attempt.
+--
+-- Returns the claimed rows.
+CREATE OR REPLACE FUNCTION claim_webhook_events(
+  p_limit INTEGER,
+  p_lease_seconds INTEGER
+)
+RETURNS SETOF webhook_events
+LANGUAGE sql
+AS $$
+  WITH due AS (
+    SELECT id
+    FROM webhook_events
+    WHERE status = 'pending'
+      AND next_attempt_at <= now()
+      AND (locked_until IS NULL OR locked_until < now())
+    ORDER BY next_attempt_at
+    LIMIT p_limit
+    FOR UPDATE SKIP LOCKED
+  )
+  UPDATE webhook_events w
+  SET attempts = w.attempts + 1,
+      locked_until = now() + make_interval(secs => p_lease_seconds)
+  FROM due
+  WHERE w.id = due.id
+  RETURNING w.*;
+$$;
+
+COMMENT ON FUNCTION claim_webhook_events(INTEGER, INTEGER) IS
+  'Leases a batch of due pending webhook events to a worker';
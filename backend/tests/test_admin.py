@@ -0,0 +1,36 @@
+"""Unit tests for the admin endpoint guard.
+
+Tests cover:
+1. Admin endpoints are hidden while no token is configured
+2. Requests need the configured token
+"""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import Settings
+from app.routers.admin import _require_admin
+
+
+def _settings(token: str) -> Settings:
+    return Settings(supabase_url="http://localhost", supabase_service_role_key="test", admin_api_token=token)
+
+
+class TestRequireAdmin:
+    """Tests for _require_admin."""
+
+    def test_disabled_without_token(self):
+        with patch("app.routers.admin.get_settings", return_value=_settings("")):
+            with pytest.raises(HTTPException) as exc:
+                _require_admin("anything")
+        assert exc.value.status_code == 404
+
+    def test_requires_matching_token(self):
+        with patch("app.routers.admin.get_settings", return_value=_settings("s3cret")):
+            for token in (None, "", "wrong"):
+                with pytest.raises(HTTPException) as exc:
+                    _require_admin(token)
+                assert exc.value.status_code == 401
+            _require_admin("s3cret")
@@ -36,11 +36,16 @@ from app.schemas.ai_assistant import (
 def mock_settings():
     """Create mock settings for testing."""
     settings = MagicMock()
+    settings.llm_provider = "gemini"
     settings.gemini_api_key = ""  # No API key = use fallbacks
     settings.gemini_model = "gemini-3-flash-preview"
     settings.ai_max_questions = 3
     settings.ai_session_ttl_minutes = 30
+    settings.ai_session_cache_enabled = True
+    settings.ai_session_cache_size = 100
+    settings.ai_llm_hedge_delay_seconds = 0.0
     settings.gate_min_context_length = 100
+    settings.ai_question_bank_path = ""
     return settings
 
 
@@ -496,3 +501,644 @@ class TestAnalyzeSubmissionFlow:
         assert result.needs_clarification is True
         assert result.session_id is not None
         assert result.first_question is not None
+
+
+# =============================================================================
+# PROCESS ANSWER TESTS
+# =============================================================================
+
+@pytest.fixture
+def gate_settings():
+    """Real settings for gate evaluation (no env file required)."""
+    from app.config import Settings
+
+    return Settings(supabase_url="http://localhost", supabase_service_role_key="test")
+
+
+def _recorded_answer(budget_range: str, question_count: int = 1) -> dict:
+    """Build a record_clarification_answer RPC payload."""
+    return {
+        "session": {
+            "id": "session-123",
+            "inquiry_id": "inquiry-123",
+            "status": "active",
+            "trigger_reasons": ["ambiguity"],
+            "question_count": question_count,
+            "max_questions": 3,
+        },
+        "turn": {"id": "turn-0", "turn_index": 0},
+        "inquiry": {
+            "name": "Jane Smith",
+            "email": "jane@company.com",
+            "role_title": "vp_director",
+            "service_type": "project",
+            "context_raw": "We need help building an AI-powered recommendation engine. The project involves processing user behavior data and generating personalized suggestions.",
+            "access_model": "remote_access",
+            "timeline": "soon",
+            "budget_range": budget_range,
+            "answers_raw": {},
+        },
+        "turns": [
+            {
+                "turn_index": 0,
+                "question_text": "Which budget range best fits your project?",
+                "target_field": "budget_range",
+                "answer_text": "$25,000 - $50,000",
+                "field_updated": True,
+                "old_field_value": "unsure",
+                "new_field_value": budget_range,
+            }
+        ],
+        "field_updated": "budget_range",
+        "old_value": "unsure",
+        "new_value": budget_range,
+    }
+
+
+class TestProcessAnswerFlow:
+    """Tests for process_answer using the single round-trip RPC."""
+
+    @pytest.mark.asyncio
+    async def test_resolving_answer_completes_session(self, mock_settings, gate_settings):
+        """Answer that makes the gate pass should resolve without extra reads."""
+        from app.services.ai_assistant import AIAssistantService
+        from app.schemas.ai_assistant import AISessionStatus
+
+        mock_supabase = MagicMock()
+        mock_supabase.record_clarification_answer = AsyncMock(
+            return_value=_recorded_answer("25k_50k")
+        )
+
+        with patch('app.services.ai_assistant.get_settings', return_value=mock_settings):
+            with patch('app.services.gate.get_settings', return_value=gate_settings):
+                with patch('app.services.ai_assistant.get_supabase_service', return_value=mock_supabase):
+                    service = AIAssistantService()
+                    service._update_session = AsyncMock()
+                    service._get_all_turns = AsyncMock()
+
+                    result = await service.process_answer("session-123", 0, "25k_50k")
+
+        assert result.session_status == AISessionStatus.RESOLVED
+        assert result.gate_status == "pass"
+        assert result.field_updated == "budget_range"
+        assert result.field_new_value == "25k_50k"
+        mock_supabase.record_clarification_answer.assert_awaited_once_with(
+            "session-123", 0, "25k_50k", return_inquiry=True
+        )
+        service._get_all_turns.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unresolved_answer_creates_next_turn(self, mock_settings, gate_settings):
+        """Answer that leaves the gate failing should ask the next question."""
+        from app.services.ai_assistant import AIAssistantService
+        from app.schemas.ai_assistant import AISessionStatus
+
+        mock_supabase = MagicMock()
+        mock_supabase.record_clarification_answer = AsyncMock(
+            return_value=_recorded_answer("unsure")
+        )
+
+        with patch('app.services.ai_assistant.get_settings', return_value=mock_settings):
+            with patch('app.services.gate.get_settings', return_value=gate_settings):
+                with patch('app.services.ai_assistant.get_supabase_service', return_value=mock_supabase):
+                    service = AIAssistantService()
+                    service._update_session = AsyncMock()
+                    service._create_turn = AsyncMock()
+
+                    result = await service.process_answer("session-123", 0, "keep_current")
+
+        assert result.session_status == AISessionStatus.ACTIVE
+        assert result.next_question is not None
+        assert result.questions_remaining == 2
+        service._create_turn.assert_awaited_once()
+        assert service._create_turn.await_args.args[1] == 1
+
+    @pytest.mark.asyncio
+    async def test_planned_question_is_served(self, mock_settings, gate_settings):
+        """An answer covered by the session's question plan needs no generation."""
+        from app.services.ai_assistant import AIAssistantService
+
+        recorded = _recorded_answer("unsure")
+        recorded["turns"][0]["answer_value"] = {"value": "keep_current"}
+        recorded["session"]["question_plan"] = {
+            "format": 1,
+            "question": {"question_text": "Which budget range best fits your project?", "question_type": "single_choice"},
+            "next": {"keep_current": {
+                "question": {"question_text": "Planned follow-up?", "question_type": "text", "target_field": "context_raw"},
+                "next": {},
+            }},
+        }
+        mock_supabase = MagicMock()
+        mock_supabase.record_clarification_answer = AsyncMock(return_value=recorded)
+
+        with patch('app.services.ai_assistant.get_settings', return_value=mock_settings):
+            with patch('app.services.gate.get_settings', return_value=gate_settings):
+                with patch('app.services.ai_assistant.get_supabase_service', return_value=mock_supabase):
+                    service = AIAssistantService()
+                    service._update_session = AsyncMock()
+                    service._create_turn = AsyncMock()
+                    service._generate_question = AsyncMock()
+
+                    result = await service.process_answer("session-123", 0, "keep_current")
+
+        assert result.next_question.question_text == "Planned follow-up?"
+        service._generate_question.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_prefetched_question_is_served(self, mock_settings, gate_settings):
+        """A question prefetched for the chosen option skips generation."""
+        from app.services.ai_assistant import AIAssistantService
+        from app.schemas.ai_assistant import AIQuestion, AISessionStatus
+
+        mock_settings.ai_prefetch_max_options = 3
+        mock_supabase = MagicMock()
+        mock_supabase.record_clarification_answer = AsyncMock(
+            return_value=_recorded_answer("under_10k")
+        )
+        follow_up = AIQuestion(
+            question_text="What outcome matters most?",
+            question_type=AIQuestionType.TEXT,
+            target_field="context_raw",
+        )
+
+        with patch('app.services.ai_assistant.get_settings', return_value=mock_settings):
+            with patch('app.services.gate.get_settings', return_value=gate_settings):
+                with patch('app.services.ai_assistant.get_supabase_service', return_value=mock_supabase):
+                    service = AIAssistantService()
+                    service.llm = MagicMock()
+                    service._generate_question = AsyncMock(return_value=follow_up)
+                    service._update_session = AsyncMock()
+                    service._create_turn = AsyncMock()
+
+                    form = service._inquiry_to_form(_recorded_answer("unsure")["inquiry"])
+                    first_question = service._get_fallback_question(form, [], [])
+                    service._prefetch_next_questions(
+                        session_id="session-123",
+                        turn_index=0,
+                        max_questions=3,
+                        form=form,
+                        triggers=[AITriggerReason.AMBIGUITY],
+                        previous_turns=[],
+                        question=first_question,
+                    )
+
+                    result = await service.process_answer("session-123", 0, "under_10k")
+
+        assert result.session_status == AISessionStatus.ACTIVE
+        assert result.next_question == follow_up
+        assert service.prefetcher.hits == 1
+        # Only the prefetch branches generated questions, not process_answer
+        prefetched_forms = [c.kwargs["form"].budget_range.value for c in service._generate_question.await_args_list]
+        assert "under_10k" in prefetched_forms
+        assert "25k_50k" not in prefetched_forms  # Would resolve the session
+
+    @pytest.mark.asyncio
+    async def test_cached_form_snapshot_skips_inquiry(self, mock_settings, gate_settings):
+        """With a cached form snapshot only the field delta comes back from the RPC."""
+        from datetime import datetime, timedelta, timezone
+        from app.services.ai_assistant import AIAssistantService
+        from app.schemas.ai_assistant import AISessionStatus
+
+        recorded = _recorded_answer("25k_50k")
+        submitted = recorded.pop("inquiry")
+        recorded["inquiry"] = None
+        expires_at = datetime.now(timezone.utc) + timedelta(minutes=30)
+        recorded["session"]["expires_at"] = expires_at.isoformat()
+        mock_supabase = MagicMock()
+        mock_supabase.record_clarification_answer = AsyncMock(return_value=recorded)
+        mock_supabase.get_inquiry = AsyncMock()
+
+        with patch('app.services.ai_assistant.get_settings', return_value=mock_settings):
+            with patch('app.services.gate.get_settings', return_value=gate_settings):
+                with patch('app.services.ai_assistant.get_supabase_service', return_value=mock_supabase):
+                    service = AIAssistantService()
+                    service._update_session = AsyncMock()
+                    service.session_cache.put_session({**recorded["session"], "question_count": 0})
+                    form = service._inquiry_to_form({**submitted, "budget_range": "unsure"})
+                    service.session_cache.set_form("session-123", form)
+
+                    result = await service.process_answer("session-123", 0, "25k_50k")
+
+        assert result.session_status == AISessionStatus.RESOLVED
+        mock_supabase.record_clarification_answer.assert_awaited_once_with(
+            "session-123", 0, "25k_50k", return_inquiry=False
+        )
+        mock_supabase.get_inquiry.assert_not_awaited()
+        cached = service.session_cache.get("session-123")
+        assert cached.form.budget_range.value == "25k_50k"
+        assert service._update_session.await_args.kwargs["expected_version"] == cached.version
+
+    @pytest.mark.asyncio
+    async def test_snapshot_ignored_after_answer_elsewhere(self, mock_settings, gate_settings):
+        """If the database counted another answer since the snapshot, the inquiry is re-read."""
+        from datetime import datetime, timedelta, timezone
+        from app.services.ai_assistant import AIAssistantService
+
+        recorded = _recorded_answer("25k_50k", question_count=2)
+        submitted = recorded.pop("inquiry")
+        recorded["inquiry"] = None
+        expires_at = datetime.now(timezone.utc) + timedelta(minutes=30)
+        recorded["session"]["expires_at"] = expires_at.isoformat()
+        mock_supabase = MagicMock()
+        mock_supabase.record_clarification_answer = AsyncMock(return_value=recorded)
+        mock_supabase.get_inquiry = AsyncMock(return_value=submitted)
+
+        with patch('app.services.ai_assistant.get_settings', return_value=mock_settings):
+            with patch('app.services.gate.get_settings', return_value=gate_settings):
+                with patch('app.services.ai_assistant.get_supabase_service', return_value=mock_supabase):
+                    service = AIAssistantService()
+                    service._update_session = AsyncMock()
+                    service.session_cache.put_session({**recorded["session"], "question_count": 0})
+                    form = service._inquiry_to_form({**submitted, "budget_range": "unsure"})
+                    service.session_cache.set_form("session-123", form)
+
+                    await service.process_answer("session-123", 0, "25k_50k")
+
+        mock_supabase.get_inquiry.assert_awaited_once_with("inquiry-123")
+
+    @pytest.mark.asyncio
+    async def test_invalid_turn_raises_value_error(self, mock_settings):
+        """Validation errors from the RPC surface as ValueError."""
+        from app.services.ai_assistant import AIAssistantService
+
+        mock_supabase = MagicMock()
+        mock_supabase.record_clarification_answer = AsyncMock(
+            side_effect=ValueError("Question already answered")
+        )
+
+        with patch('app.services.ai_assistant.get_settings', return_value=mock_settings):
+            with patch('app.services.ai_assistant.get_supabase_service', return_value=mock_supabase):
+                service = AIAssistantService()
+                with pytest.raises(ValueError, match="already answered"):
+                    await service.process_answer("session-123", 0, "25k_50k")
+
+
+# =============================================================================
+# LLM DEADLINE TESTS
+# =============================================================================
+
+class TestLLMDeadline:
+    """Tests for per-call Gemini deadlines."""
+
+    @pytest.mark.asyncio
+    async def test_slow_question_generation_uses_fallback(self, mock_settings, ambiguous_budget_form):
+        """A question call that misses its deadline falls back without blocking."""
+        import asyncio
+        from app.services.ai_assistant import AIAssistantService
+        from app.services.llm_provider import GeminiProvider
+
+        async def slow_generate(*args, **kwargs):
+            await asyncio.sleep(5)
+
+        mock_settings.ai_llm_timeout_seconds = 0.05
+        mock_pool = MagicMock()
+        mock_pool.host_slot.return_value = asyncio.Semaphore(1)
+
+        with patch('app.services.ai_assistant.get_settings', return_value=mock_settings):
+            with patch('app.services.ai_assistant.get_supabase_service'):
+                with patch('app.services.llm_provider.get_http_pool', return_value=mock_pool):
+                    service = AIAssistantService()
+                    service.llm = GeminiProvider(MagicMock(generate_content_async=slow_generate), "gemini-test")
+
+                    question = await asyncio.wait_for(
+                        service._generate_question(
+                            session={"question_count": 0, "max_questions": 3},
+                            form=ambiguous_budget_form,
+                            issues=[],
+                            previous_turns=[],
+                        ),
+                        timeout=1,
+                    )
+
+        assert question.target_field == "budget_range"
+        # The slot is released when the call is cancelled
+        assert not mock_pool.host_slot.return_value.locked()
+
+    @pytest.mark.asyncio
+    async def test_hedging_works_without_breaker(self, mock_settings):
+        """A hedge delay applies even with the breaker disabled."""
+        import asyncio
+        from app.services.ai_assistant import AIAssistantService
+
+        calls = []
+
+        async def generate_json(request):
+            calls.append(request)
+            await asyncio.sleep(5 if len(calls) == 1 else 0.01)
+            return '{"attempt": %d}' % len(calls)
+
+        mock_settings.ai_llm_hedge_delay_seconds = 0.02
+        mock_settings.ai_llm_timeout_seconds = 1.0
+        with patch('app.services.ai_assistant.get_settings', return_value=mock_settings):
+            with patch('app.services.ai_assistant.get_supabase_service'):
+                service = AIAssistantService()
+                service.llm = MagicMock(generate_json=generate_json)
+                assert service.breaker is None
+
+                result = await service._generate_json(
+                    kind="test", system="s", acknowledgement="a", prompt="p", temperature=0.3,
+                )
+
+        assert result == {"attempt": 2}
+
+    @pytest.mark.asyncio
+    async def test_malformed_question_is_not_cached(self, mock_settings, ambiguous_budget_form):
+        """A question response that doesn't parse is not replayed from the LLM cache."""
+        from app.services.ai_assistant import AIAssistantService
+        from app.services.llm_cache import LLMResponseCache, MemoryLRUCache
+
+        responses = [
+            '{"question_text": "Which budget?", "question_type": "not_a_type"}',
+            '{"question_text": "Which budget?", "question_type": "text"}',
+        ]
+        generate_json = AsyncMock(side_effect=responses)
+        session = {"question_count": 0, "max_questions": 3}
+        mock_settings.ai_llm_timeout_seconds = 1.0
+        with patch('app.services.ai_assistant.get_settings', return_value=mock_settings):
+            with patch('app.services.ai_assistant.get_supabase_service'):
+                service = AIAssistantService()
+                service.llm = MagicMock(generate_json=generate_json)
+                service.llm.name = "gemini-test"
+                service.llm_cache = LLMResponseCache(MemoryLRUCache(10, 60))
+
+                with pytest.raises(ValueError):
+                    await service._generate_question_llm(session, ambiguous_budget_form, [], [])
+                question = await service._generate_question_llm(session, ambiguous_budget_form, [], [])
+                cached = await service._generate_question_llm(session, ambiguous_budget_form, [], [])
+
+        assert generate_json.await_count == 2
+        assert question == cached and question.question_type == AIQuestionType.TEXT
+        assert service.llm_cache.stats.rejected == 1
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_llm(self, mock_settings, ambiguous_budget_form):
+        """With the Gemini circuit open, no call is made and fallbacks are used."""
+        from app.services.ai_assistant import AIAssistantService
+        from app.services.llm_provider import GeminiProvider
+        from app.services.llm_resilience import CircuitBreaker
+
+        with patch('app.services.ai_assistant.get_settings', return_value=mock_settings):
+            with patch('app.services.ai_assistant.get_supabase_service'):
+                service = AIAssistantService()
+                service.llm = GeminiProvider(MagicMock(generate_content_async=AsyncMock()), "gemini-test")
+                service.breaker = CircuitBreaker(
+                    name="gemini", window_size=10, min_calls=1,
+                    error_rate_threshold=0.5, p95_latency_threshold=5.0, open_seconds=30,
+                )
+                service.breaker.record_failure(1.0)
+
+                triggers = await service._detect_llm_triggers(ambiguous_budget_form)
+                question = await service._generate_question(
+                    session={"question_count": 0, "max_questions": 3},
+                    form=ambiguous_budget_form,
+                    issues=[],
+                    previous_turns=[],
+                )
+
+        assert triggers.llm_available is False
+        assert "circuit" in triggers.llm_error
+        assert question.target_field == "budget_range"
+        service.llm.model.generate_content_async.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_slow_trigger_detection_reports_unavailable(self, mock_settings, ambiguous_budget_form):
+        """A trigger call that misses its deadline is treated as LLM unavailable."""
+        import asyncio
+        from app.services.ai_assistant import AIAssistantService
+        from app.services.llm_provider import GeminiProvider
+
+        async def slow_generate(*args, **kwargs):
+            await asyncio.sleep(5)
+
+        mock_settings.ai_llm_timeout_seconds = 0.05
+        mock_pool = MagicMock()
+        mock_pool.host_slot.return_value = asyncio.Semaphore(1)
+
+        with patch('app.services.ai_assistant.get_settings', return_value=mock_settings):
+            with patch('app.services.ai_assistant.get_supabase_service'):
+                with patch('app.services.llm_provider.get_http_pool', return_value=mock_pool):
+                    service = AIAssistantService()
+                    service.llm = GeminiProvider(MagicMock(generate_content_async=slow_generate), "gemini-test")
+
+                    result = await service._detect_llm_triggers(ambiguous_budget_form)
+
+        assert result.llm_available is False
+        assert "timed out" in result.llm_error
+
+
+# =============================================================================
+# ANALYSIS STAGE TESTS
+# =============================================================================
+
+class TestAnalysisStages:
+    """Tests for the concurrent analyze_submission stages."""
+
+    def _service(self, llm_result):
+        from app.services.ai_assistant import AIAssistantService
+
+        service = AIAssistantService()
+        service._detect_llm_triggers = AsyncMock(return_value=llm_result)
+        service._generate_question = AsyncMock(wraps=service._generate_question)
+        service._create_session = AsyncMock(return_value={"id": "session-123"})
+        service._create_turn = AsyncMock()
+        return service
+
+    @pytest.mark.asyncio
+    async def test_speculative_question_used_when_llm_adds_nothing(self, mock_settings, ambiguous_budget_form):
+        """The question drafted from rule triggers is served as-is."""
+        from app.schemas.ai_assistant import TriggerAnalysisResult
+
+        mock_settings.ai_speculative_question = True
+        with patch('app.services.ai_assistant.get_settings', return_value=mock_settings):
+            with patch('app.services.ai_assistant.get_supabase_service'):
+                service = self._service(TriggerAnalysisResult(has_triggers=False))
+                result = await service.analyze_submission(
+                    form=ambiguous_budget_form,
+                    inquiry_id="test-inquiry-456",
+                    gate_result=MagicMock(gate_status=GateStatus.MANUAL),
+                )
+
+        assert result.needs_clarification is True
+        assert result.first_question.target_field == "budget_range"
+        service._generate_question.assert_awaited_once()
+        service._create_turn.assert_awaited_once_with("session-123", 0, result.first_question)
+
+    @pytest.mark.asyncio
+    async def test_speculative_question_replaced_when_llm_adds_triggers(self, mock_settings, ambiguous_budget_form):
+        """New LLM triggers discard the draft and generate a fresh question."""
+        from app.schemas.ai_assistant import TriggerAnalysisResult
+
+        mock_settings.ai_speculative_question = True
+        llm_result = TriggerAnalysisResult(
+            has_triggers=True,
+            triggers=[AITriggerReason.CONTRADICTION],
+        )
+        with patch('app.services.ai_assistant.get_settings', return_value=mock_settings):
+            with patch('app.services.ai_assistant.get_supabase_service'):
+                service = self._service(llm_result)
+                result = await service.analyze_submission(
+                    form=ambiguous_budget_form,
+                    inquiry_id="test-inquiry-456",
+                    gate_result=MagicMock(gate_status=GateStatus.MANUAL),
+                )
+
+        assert set(result.trigger_reasons) == {AITriggerReason.AMBIGUITY, AITriggerReason.CONTRADICTION}
+        issue_sets = [
+            {i.trigger_type for i in call.kwargs["issues"]}
+            for call in service._generate_question.await_args_list
+        ]
+        assert AITriggerReason.CONTRADICTION in issue_sets[-1]
+
+
+class TestTriggerBatching:
+    """Tests for micro-batched LLM trigger detection."""
+
+    @staticmethod
+    def _issue(issue_type):
+        return {"type": issue_type, "field": None, "description": "x", "confidence": 0.9}
+
+    @pytest.mark.asyncio
+    async def test_batched_results_are_split_per_form(self, mock_settings, ambiguous_budget_form):
+        """One call covers both forms and each caller gets its own result."""
+        import asyncio
+        from app.services.ai_assistant import AIAssistantService
+        from app.services.micro_batch import MicroBatcher
+
+        with patch('app.services.ai_assistant.get_settings', return_value=mock_settings):
+            with patch('app.services.ai_assistant.get_supabase_service'):
+                service = AIAssistantService()
+                service.llm = MagicMock()
+                service._generate_json = AsyncMock(return_value={"results": [
+                    {"form_id": 2, "has_issues": True, "issues": [self._issue("budget_scope_mismatch")]},
+                    {"form_id": 1, "has_issues": False, "issues": []},
+                ]})
+                service.trigger_batcher = MicroBatcher(
+                    service._request_llm_triggers_batch, window_seconds=0.01, max_batch_size=8,
+                )
+
+                first, second = await asyncio.gather(
+                    service._detect_llm_triggers(ambiguous_budget_form.model_copy(update={"name": "Jane"})),
+                    service._detect_llm_triggers(ambiguous_budget_form),
+                )
+
+        service._generate_json.assert_awaited_once()
+        assert "Form 2" in service._generate_json.await_args.kwargs["prompt"]
+        assert first.llm_available and not first.has_triggers
+        assert second.triggers == [AITriggerReason.BUDGET_SCOPE_MISMATCH]
+
+    @pytest.mark.asyncio
+    async def test_missing_batch_result_falls_back_to_single_call(self, mock_settings, ambiguous_budget_form):
+        """A form left out of the batched response is retried on its own."""
+        from app.services.ai_assistant import AIAssistantService
+
+        with patch('app.services.ai_assistant.get_settings', return_value=mock_settings):
+            with patch('app.services.ai_assistant.get_supabase_service'):
+                service = AIAssistantService()
+                service.llm = MagicMock()
+                service._generate_json = AsyncMock(side_effect=[
+                    {"results": [{"form_id": 1, "has_issues": False, "issues": []}]},
+                    {"has_issues": True, "issues": [self._issue("contradiction")]},
+                ])
+
+                results = await service._request_llm_triggers_batch([ambiguous_budget_form.model_copy(update={"name": "Jane"}), ambiguous_budget_form])
+
+        assert service._generate_json.await_count == 2
+        assert not results[0].has_triggers
+        assert results[1].triggers == [AITriggerReason.CONTRADICTION]
+
+    @pytest.mark.asyncio
+    async def test_batching_takes_precedence_over_combined_analysis(self, mock_settings, ambiguous_budget_form):
+        """With batching on, trigger detection goes through the batcher, not the combined call."""
+        from app.services.ai_assistant import AIAssistantService
+        from app.services.micro_batch import MicroBatcher
+        from app.services.pipeline import StageGraph
+
+        mock_settings.ai_combined_analysis = True
+        with patch('app.services.ai_assistant.get_settings', return_value=mock_settings):
+            with patch('app.services.ai_assistant.get_supabase_service'):
+                service = AIAssistantService()
+                service.llm = MagicMock()
+                service._generate_json = AsyncMock(return_value={"has_issues": False, "issues": []})
+                service.trigger_batcher = MicroBatcher(
+                    service._request_llm_triggers_batch, window_seconds=0.01, max_batch_size=8,
+                )
+
+                graph = StageGraph("analysis")
+                service.start_analysis(graph, ambiguous_budget_form)
+                result = await graph.get("llm_triggers")
+
+        assert "combined_analysis" not in graph
+        assert result.llm_available and not result.has_triggers
+        assert "response_schema" not in service._generate_json.await_args.kwargs
+
+
+class TestCombinedAnalysis:
+    """Tests for single-call trigger detection + first question."""
+
+    QUESTION = {
+        "question_text": "Which budget range fits?",
+        "question_type": "single_choice",
+        "options": [
+            {"value": "under_10k", "label": "Under $10,000", "maps_to_field": "budget_range", "maps_to_value": "under_10k"},
+            {"value": "over_50k", "label": "Over $50,000", "maps_to_field": "budget_range", "maps_to_value": "over_50k"},
+        ],
+        "target_field": "budget_range",
+    }
+
+    def _service(self, mock_settings, responses):
+        from app.services.ai_assistant import AIAssistantService
+
+        mock_settings.ai_combined_analysis = True
+        mock_settings.ai_prefetch_enabled = False
+        mock_settings.ai_question_plan = False
+        service = AIAssistantService()
+        service.llm = MagicMock()
+        service._generate_json = AsyncMock(side_effect=responses)
+        service._create_session = AsyncMock(return_value={"id": "session-123"})
+        service._create_turn = AsyncMock()
+        return service
+
+    @pytest.mark.asyncio
+    async def test_one_call_returns_triggers_and_question(self, mock_settings, ambiguous_budget_form):
+        """The combined response supplies both the triggers and the first question."""
+        from app.prompts.clarification import COMBINED_ANALYSIS_SCHEMA
+
+        response = {
+            "has_issues": True,
+            "issues": [{"type": "budget_scope_mismatch", "field": "budget_range", "description": "x", "confidence": 0.9}],
+            "first_question": self.QUESTION,
+        }
+        with patch('app.services.ai_assistant.get_settings', return_value=mock_settings):
+            with patch('app.services.ai_assistant.get_supabase_service'):
+                service = self._service(mock_settings, [response])
+                result = await service.analyze_submission(
+                    form=ambiguous_budget_form,
+                    inquiry_id="test-inquiry-456",
+                    gate_result=MagicMock(gate_status=GateStatus.MANUAL),
+                )
+
+        service._generate_json.assert_awaited_once()
+        assert service._generate_json.await_args.kwargs["response_schema"] == COMBINED_ANALYSIS_SCHEMA
+        assert AITriggerReason.BUDGET_SCOPE_MISMATCH in result.trigger_reasons
+        assert result.first_question.question_text == "Which budget range fits?"
+
+    @pytest.mark.asyncio
+    async def test_unusable_response_degrades_to_two_step(self, mock_settings, ambiguous_budget_form):
+        """A malformed combined response falls back to separate trigger and question calls."""
+        responses = [
+            {"has_issues": True, "issues": "not a list", "first_question": None},
+            {"has_issues": False, "issues": []},
+            {**self.QUESTION, "question_text": "Two-step question?"},
+        ]
+        with patch('app.services.ai_assistant.get_settings', return_value=mock_settings):
+            with patch('app.services.ai_assistant.get_supabase_service'):
+                service = self._service(mock_settings, responses)
+                result = await service.analyze_submission(
+                    form=ambiguous_budget_form,
+                    inquiry_id="test-inquiry-456",
+                    gate_result=MagicMock(gate_status=GateStatus.MANUAL),
+                )
+
+        assert service._generate_json.await_count == 3
+        assert result.trigger_reasons == [AITriggerReason.AMBIGUITY]
+        assert result.first_question.question_text == "Two-step question?"
@@ -0,0 +1,127 @@
+"""Unit tests for the background AI analysis worker.
+
+Tests cover:
+1. Queued submissions are analyzed and their status becomes pollable
+2. Submissions are refused when the worker is stopped or the queue is full
+3. Polling falls back to the recorded inquiry event
+"""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.schemas.ai_assistant import (
+    AIAnalysisStatus,
+    AIQuestion,
+    AIQuestionType,
+    AISessionStartResponse,
+)
+from app.schemas.intake import GateStatus, RoutingResult
+from app.services.analysis_worker import ANALYSIS_EVENT_TYPE, AnalysisWorker
+
+
+@pytest.fixture
+def gate_result():
+    result = MagicMock()
+    result.gate_status = GateStatus.PASS
+    result.routing_result = RoutingResult.PAID_ADVISORY
+    return result
+
+
+@pytest.fixture
+def mock_supabase():
+    supabase = MagicMock()
+    supabase.create_inquiry_event = AsyncMock(return_value={})
+    supabase.get_latest_inquiry_event = AsyncMock(return_value=None)
+    with patch("app.services.analysis_worker.get_supabase_service", return_value=supabase):
+        yield supabase
+
+
+class TestAnalysisWorker:
+    """Tests for AnalysisWorker."""
+
+    @pytest.mark.asyncio
+    async def test_submit_and_poll(self, gate_result, mock_supabase):
+        """A queued submission is analyzed and its result recorded."""
+        assistant = MagicMock()
+        assistant.analyze_submission = AsyncMock(return_value=AISessionStartResponse(
+            needs_clarification=True,
+            session_id="session-1",
+            first_question=AIQuestion(
+                question_text="What is your budget?",
+                question_type=AIQuestionType.TEXT,
+            ),
+        ))
+
+        worker = AnalysisWorker(concurrency=2, queue_size=10)
+        with patch("app.services.analysis_worker.get_ai_assistant", return_value=assistant):
+            worker.start()
+            assert worker.submit("inq-1", MagicMock(), gate_result)
+
+            pending = await worker.get_status("inq-1")
+            assert pending.status in (AIAnalysisStatus.PENDING, AIAnalysisStatus.COMPLETE)
+
+            await worker.stop()
+
+        status = await worker.get_status("inq-1")
+        assert status.status == AIAnalysisStatus.COMPLETE
+        assert status.needs_clarification is True
+        assert status.ai_session_id == "session-1"
+        assert status.first_question.question_text == "What is your budget?"
+
+        event = mock_supabase.create_inquiry_event.call_args.kwargs
+        assert event["event_type"] == ANALYSIS_EVENT_TYPE
+        assert json.loads(event["new_value"])["ai_session_id"] == "session-1"
+
+        # Another process serves the poll from the recorded event
+        mock_supabase.get_latest_inquiry_event.return_value = {"new_value": event["new_value"]}
+        from_event = await AnalysisWorker(concurrency=1, queue_size=1).get_status("inq-1")
+        assert from_event.first_question.question_text == "What is your budget?"
+
+    @pytest.mark.asyncio
+    async def test_analysis_failure(self, gate_result, mock_supabase):
+        """A failed analysis keeps the provisional routing."""
+        assistant = MagicMock()
+        assistant.analyze_submission = AsyncMock(side_effect=RuntimeError("boom"))
+
+        worker = AnalysisWorker(concurrency=1, queue_size=10)
+        with patch("app.services.analysis_worker.get_ai_assistant", return_value=assistant):
+            worker.start()
+            worker.submit("inq-1", MagicMock(), gate_result)
+            await worker.stop()
+
+        status = await worker.get_status("inq-1")
+        assert status.status == AIAnalysisStatus.FAILED
+        assert status.routing_result == RoutingResult.PAID_ADVISORY.value
+
+    @pytest.mark.asyncio
+    async def test_submit_refused(self, gate_result, mock_supabase):
+        """Submissions are refused when not running or when the queue is full."""
+        worker = AnalysisWorker(concurrency=1, queue_size=1)
+        assert worker.submit("inq-1", MagicMock(), gate_result) is False
+
+        # Fill the queue without workers consuming it
+        worker._tasks = [MagicMock()]
+        assert worker.submit("inq-1", MagicMock(), gate_result) is True
+        assert worker.submit("inq-2", MagicMock(), gate_result) is False
+
+    @pytest.mark.asyncio
+    async def test_status_from_event(self, mock_supabase):
+        """Polling another worker's inquiry reads the recorded event."""
+        mock_supabase.get_latest_inquiry_event.return_value = {
+            "new_value": json.dumps({
+                "status": "complete",
+                "needs_clarification": False,
+                "gate_status": "pass",
+                "routing_result": "paid_advisory",
+            }),
+        }
+
+        worker = AnalysisWorker(concurrency=1, queue_size=1)
+        status = await worker.get_status("inq-9")
+
+        assert status.inquiry_id == "inq-9"
+        assert status.status == AIAnalysisStatus.COMPLETE
+        mock_supabase.get_latest_inquiry_event.assert_awaited_once_with(
+            "inq-9", ANALYSIS_EVENT_TYPE
+        )
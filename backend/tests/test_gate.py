@@ -0,0 +1,129 @@
+"""Unit tests for the compiled gate engine.
+
+Tests cover:
+1. Special-case status rules from the decision table
+2. Publishing a new rules version swaps the active engine
+3. Invalid rules never become active
+4. Rules documents override the Settings rules
+"""
+
+import json
+
+import pytest
+
+from app.config import Settings
+from app.schemas.intake import (
+    AccessModel,
+    AnswersRaw,
+    BudgetRange,
+    GateStatus,
+    IntakeFormRequest,
+    RoleTitle,
+    RoutingResult,
+    ServiceType,
+    Timeline,
+)
+from app.services import gate
+from app.services.gate import CompiledGate, GateRules, StatusRule
+
+
+@pytest.fixture
+def rules():
+    settings = Settings(supabase_url="http://localhost", supabase_service_role_key="test")
+    return GateRules.from_settings(settings)
+
+
+@pytest.fixture(autouse=True)
+def restore_engine(monkeypatch):
+    monkeypatch.setattr(gate, "_engine", None)
+
+
+def _form(**overrides) -> IntakeFormRequest:
+    data = {
+        "name": "Jane Smith",
+        "email": "jane@company.com",
+        "role_title": RoleTitle.VP_DIRECTOR,
+        "service_type": ServiceType.PROJECT,
+        "context_raw": "We need help building an AI-powered recommendation engine for our product. " * 2,
+        "access_model": AccessModel.REMOTE_ACCESS,
+        "timeline": Timeline.SOON,
+        "budget_range": BudgetRange.TWENTY_FIVE_TO_50K,
+    }
+    return IntakeFormRequest(**{**data, **overrides})
+
+
+class TestCompiledGate:
+    """Tests for CompiledGate decisions."""
+
+    def test_strong_submission_passes(self, rules):
+        result = CompiledGate(rules).evaluate(_form())
+        assert result.gate_status == GateStatus.PASS
+        assert result.routing_result == RoutingResult.CALENDLY_STRATEGY_FREE
+        assert result.gate_details.failed == []
+        assert result.rules_version == rules.version
+
+    def test_ic_without_authority_goes_to_manual_review(self, rules):
+        engine = CompiledGate(rules)
+        ic = _form(role_title=RoleTitle.IC_ENGINEER)
+        assert engine.evaluate(ic).gate_status == GateStatus.MANUAL
+
+        owner = ic.model_copy(update={"answers_raw": AnswersRaw(is_decision_maker=True)})
+        assert engine.evaluate(owner).gate_status == GateStatus.PASS
+
+    def test_flags_and_qualification(self, rules):
+        result = CompiledGate(rules).evaluate(
+            _form(email="jane@gmail.com", context_raw="Help", timeline=Timeline.EXPLORING)
+        )
+        assert result.flags == ["personal_email", "very_short_context", "just_exploring"]
+        assert result.qualification.value == "low_quality"
+        assert result.gate_status == GateStatus.FAIL
+
+    def test_unknown_fact_is_rejected(self, rules):
+        bad = GateRules(
+            version="bad",
+            min_context_length=100,
+            min_budget=BudgetRange.TEN_TO_25K,
+            personal_email_domains=(),
+            status_rules=(StatusRule(GateStatus.PASS, frozenset({"typo"})),),
+        )
+        with pytest.raises(ValueError, match="typo"):
+            CompiledGate(bad)
+
+
+class TestRulesPublishing:
+    """Tests for hot-swapping rules versions."""
+
+    def test_publish_swaps_active_engine(self, rules):
+        gate.publish_gate_rules(rules)
+        form = _form(budget_range=BudgetRange.TEN_TO_25K)
+        assert gate.evaluate_gate(form).gate_status == GateStatus.PASS
+
+        stricter = GateRules.from_dict(
+            {"rules_version": "2.0.0", "min_budget_threshold": "25k_50k"}, base=rules
+        )
+        gate.publish_gate_rules(stricter)
+        result = gate.evaluate_gate(form)
+        assert result.gate_status == GateStatus.FAIL
+        assert result.rules_version == "2.0.0"
+
+    def test_invalid_rules_keep_previous_version(self, rules):
+        active = gate.publish_gate_rules(rules)
+        invalid = GateRules.from_dict(
+            {"rules_version": "2.0.0", "status_rules": [{"status": "pass", "requires": ["typo"]}]},
+            base=rules,
+        )
+        with pytest.raises(ValueError):
+            gate.publish_gate_rules(invalid)
+        assert gate.get_gate_engine() is active
+
+    def test_rules_file_overrides_settings(self, rules, tmp_path, monkeypatch):
+        path = tmp_path / "gate_rules.json"
+        path.write_text(json.dumps({"rules_version": "1.1.0", "min_context_length": 20}))
+        monkeypatch.setattr(gate, "get_settings", lambda: Settings(
+            supabase_url="http://localhost", supabase_service_role_key="test"
+        ))
+
+        loaded = gate.load_gate_rules(str(path))
+        assert loaded.version == "1.1.0"
+        assert loaded.min_context_length == 20
+        assert loaded.personal_email_domains == rules.personal_email_domains
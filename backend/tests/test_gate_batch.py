@@ -0,0 +1,103 @@
+"""Unit tests for vectorized gate evaluation.
+
+Tests cover:
+1. evaluate_gate_many agrees with the per-form engine
+2. Rows with unknown enum values are marked unscorable
+"""
+
+import itertools
+
+import pytest
+
+from app.config import Settings
+from app.schemas.intake import (
+    AccessModel,
+    AnswersRaw,
+    BudgetRange,
+    IntakeFormRequest,
+    RoleTitle,
+    ServiceType,
+    Timeline,
+)
+from app.services.gate import CompiledGate, GateRules
+from app.services.gate_batch import (
+    GATE_STATUSES,
+    QUALIFICATIONS,
+    ROUTING_RESULTS,
+    GateColumns,
+    decode,
+    evaluate_gate_many,
+)
+
+
+@pytest.fixture
+def engine():
+    settings = Settings(supabase_url="http://localhost", supabase_service_role_key="test")
+    return CompiledGate(GateRules.from_settings(settings))
+
+
+def _row(**overrides) -> dict:
+    return {
+        "service_type": "project",
+        "access_model": "remote_access",
+        "timeline": "soon",
+        "budget_range": "25k_50k",
+        "role_title": "vp_director",
+        "is_decision_maker": None,
+        "email_domain": "company.com",
+        "context_raw": "x" * 150,
+        **overrides,
+    }
+
+
+class TestEvaluateGateMany:
+    """Tests for evaluate_gate_many."""
+
+    def test_matches_single_evaluation(self, engine):
+        rows, expected = [], []
+        for service, access, budget, role, dm, domain, length in itertools.product(
+            ServiceType, AccessModel, BudgetRange, RoleTitle, (True, False, None),
+            ("company.com", "gmail.com"), (10, 60, 150),
+        ):
+            row = _row(
+                service_type=service.value,
+                access_model=access.value,
+                budget_range=budget.value,
+                role_title=role.value,
+                is_decision_maker=dm,
+                email_domain=domain,
+                context_raw="x" * length,
+            )
+            form = IntakeFormRequest(
+                name="Jane",
+                email=f"jane@{domain}",
+                role_title=role,
+                service_type=service,
+                context_raw=row["context_raw"],
+                access_model=access,
+                timeline=Timeline.SOON,
+                budget_range=budget,
+                answers_raw=AnswersRaw(is_decision_maker=dm) if dm is not None else None,
+            )
+            single = engine.evaluate(form)
+            rows.append(row)
+            expected.append((single.gate_status.value, single.qualification.value, single.routing_result.value))
+
+        result = evaluate_gate_many(GateColumns.from_inquiries(rows, engine.rules.personal_email_domains), engine)
+
+        actual = list(zip(
+            decode(GATE_STATUSES, result.gate_status),
+            decode(QUALIFICATIONS, result.qualification),
+            decode(ROUTING_RESULTS, result.routing_result),
+        ))
+        assert actual == expected
+        assert result.rules_version == engine.rules.version
+
+    def test_unknown_enum_value_is_unscorable(self, engine):
+        rows = [_row(), _row(role_title="retired_role")]
+        columns = GateColumns.from_inquiries(rows, engine.rules.personal_email_domains)
+
+        result = evaluate_gate_many(columns, engine)
+
+        assert columns.valid.tolist() == [True, False]
+        assert decode(ROUTING_RESULTS, result.routing_result) == ["calendly_strategy_free", None]
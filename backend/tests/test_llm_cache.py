@@ -0,0 +1,153 @@
+"""Unit tests for the LLM response cache.
+
+Tests cover:
+1. Key normalization and template salting
+2. LRU/TTL memory tier and SQLite disk tier
+3. Hit/miss accounting and in-flight coalescing
+4. Errors and rejected values are not cached
+"""
+
+import asyncio
+import pytest
+
+from app.services import llm_cache
+from app.services.llm_cache import (
+    LLMResponseCache,
+    MemoryLRUCache,
+    SQLiteLLMCache,
+    make_cache_key,
+)
+
+
+class FakeClock:
+    """Controllable clock for TTL checks."""
+
+    def __init__(self, now: float = 1_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCacheKey:
+    """Tests for make_cache_key."""
+
+    def test_whitespace_is_normalized(self):
+        """Re-wrapped prompts share a key; different models do not."""
+        key = make_cache_key("gemini", "system", "Budget:  unsure\n\nContext: x ", 0.3)
+
+        assert key == make_cache_key("gemini", "system", "Budget: unsure Context: x", 0.3)
+        assert key != make_cache_key("other-model", "system", "Budget: unsure Context: x", 0.3)
+        assert key != make_cache_key("gemini", "system", "Budget: unsure Context: x", 0.5)
+
+    def test_template_change_invalidates(self, monkeypatch):
+        """Editing a prompt template changes every key."""
+        before = make_cache_key("gemini", "prompt")
+        monkeypatch.setattr(llm_cache, "PROMPT_TEMPLATES_HASH", "changed")
+
+        assert make_cache_key("gemini", "prompt") != before
+
+
+class TestTiers:
+    """Tests for the memory and disk tiers."""
+
+    def test_memory_lru_and_ttl(self):
+        """Least recently used entries are evicted and expired ones dropped."""
+        clock = FakeClock()
+        cache = MemoryLRUCache(capacity=2, ttl_seconds=60, clock=clock)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+
+        clock.now += 61
+        assert cache.get("a") is None
+
+    def test_disk_survives_reopen(self, tmp_path):
+        """Entries written to SQLite are readable by a new instance."""
+        path = str(tmp_path / "llm_cache.sqlite3")
+        disk = SQLiteLLMCache(path, ttl_seconds=60)
+        disk.set("k", {"has_issues": False})
+        disk.close()
+
+        reopened = SQLiteLLMCache(path, ttl_seconds=60)
+        assert reopened.get("k") == {"has_issues": False}
+        reopened.close()
+
+
+class TestLLMResponseCache:
+    """Tests for get_or_compute."""
+
+    @pytest.mark.asyncio
+    async def test_hits_and_misses(self, tmp_path):
+        """A miss computes once; later lookups hit memory, then disk."""
+        disk = SQLiteLLMCache(str(tmp_path / "c.sqlite3"), ttl_seconds=60)
+        cache = LLMResponseCache(MemoryLRUCache(10, 60), disk)
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return {"question_text": "Q?"}
+
+        assert await cache.get_or_compute("k", compute) == {"question_text": "Q?"}
+        assert await cache.get_or_compute("k", compute) == {"question_text": "Q?"}
+        cache.memory.clear()
+        assert await cache.get_or_compute("k", compute) == {"question_text": "Q?"}
+
+        assert len(calls) == 1
+        stats = cache.stats.as_dict()
+        assert (stats["misses"], stats["memory_hits"], stats["disk_hits"]) == (1, 1, 1)
+        disk.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_call(self):
+        """Identical in-flight requests wait for the first call."""
+        cache = LLMResponseCache(MemoryLRUCache(10, 60))
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"ok": True}
+
+        results = await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(5)))
+
+        assert results == [{"ok": True}] * 5
+        assert len(calls) == 1
+        assert cache.stats.coalesced == 4
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self):
+        """A failed call is retried on the next lookup."""
+        cache = LLMResponseCache(MemoryLRUCache(10, 60))
+
+        async def fail():
+            raise asyncio.TimeoutError()
+
+        async def succeed():
+            return {"ok": True}
+
+        with pytest.raises(asyncio.TimeoutError):
+            await cache.get_or_compute("k", fail)
+        assert await cache.get_or_compute("k", succeed) == {"ok": True}
+
+    @pytest.mark.asyncio
+    async def test_rejected_values_are_not_cached(self):
+        """A value the validator rejects is returned but computed again next time."""
+        cache = LLMResponseCache(MemoryLRUCache(10, 60))
+        responses = [{"question_text": None}, {"question_text": "Q?"}]
+
+        async def compute():
+            return responses.pop(0)
+
+        def valid(value):
+            return value["question_text"] is not None
+
+        assert await cache.get_or_compute("k", compute, validate=valid) == {"question_text": None}
+        assert await cache.get_or_compute("k", compute, validate=valid) == {"question_text": "Q?"}
+        assert await cache.get_or_compute("k", compute, validate=valid) == {"question_text": "Q?"}
+        assert cache.stats.rejected == 1
+        assert cache.stats.memory_hits == 1
@@ -0,0 +1,112 @@
+"""Unit tests for LLM providers.
+
+Tests cover:
+1. Latency spec parsing
+2. Fake provider determinism, error injection and batched responses
+3. The service running fully offline on the fake provider
+"""
+
+import json
+import random
+from unittest.mock import patch
+
+import pytest
+
+from app.services.llm_provider import (
+    TRIGGER_DETECTION,
+    TRIGGER_DETECTION_BATCH,
+    FakeLLMError,
+    FakeLLMProvider,
+    LatencyDistribution,
+    LLMRequest,
+)
+
+
+def _request(kind: str, prompt: str = "prompt") -> LLMRequest:
+    return LLMRequest(
+        kind=kind, system="system", acknowledgement="ok", prompt=prompt, temperature=0.3, timeout=5,
+    )
+
+
+class TestLatencyDistribution:
+    """Tests for LatencyDistribution."""
+
+    def test_parse_and_sample(self):
+        rng = random.Random(1)
+        assert LatencyDistribution.parse("fixed:250").sample(rng) == 0.25
+        assert 0.1 <= LatencyDistribution.parse("uniform:100,400").sample(rng) <= 0.4
+        assert LatencyDistribution.parse("lognormal:800,0.5").sample(rng) > 0
+
+    @pytest.mark.parametrize("spec", ["", "fixed", "uniform:100", "gamma:1,2", "fixed:abc"])
+    def test_invalid_spec(self, spec):
+        with pytest.raises(ValueError):
+            LatencyDistribution.parse(spec)
+
+
+class TestFakeLLMProvider:
+    """Tests for FakeLLMProvider."""
+
+    @pytest.mark.asyncio
+    async def test_same_seed_same_outcomes(self):
+        async def outcomes(seed):
+            provider = FakeLLMProvider(error_rate=0.3, malformed_rate=0.2, seed=seed)
+            results = []
+            for _ in range(20):
+                try:
+                    results.append(await provider.generate_json(_request(TRIGGER_DETECTION)))
+                except FakeLLMError:
+                    results.append("error")
+            return results
+
+        first = await outcomes(7)
+        assert first == await outcomes(7)
+        assert "error" in first and "{not json" in first
+
+    @pytest.mark.asyncio
+    async def test_batched_trigger_detection_answers_every_form(self):
+        provider = FakeLLMProvider(responses={
+            TRIGGER_DETECTION: {"has_issues": True, "issues": []},
+        })
+        text = await provider.generate_json(
+            _request(TRIGGER_DETECTION_BATCH, "### Form 1\n...\n\n### Form 2\n...")
+        )
+
+        results = json.loads(text)["results"]
+        assert [r["form_id"] for r in results] == [1, 2]
+        assert all(r["has_issues"] for r in results)
+
+
+@pytest.mark.asyncio
+async def test_service_runs_offline_on_fake_provider():
+    """Trigger detection and question generation go through the fake provider."""
+    from app.config import Settings
+    from app.schemas.intake import AccessModel, BudgetRange, IntakeFormRequest, RoleTitle, ServiceType, Timeline
+    from app.services.ai_assistant import AIAssistantService
+
+    settings = Settings(
+        supabase_url="http://localhost",
+        supabase_service_role_key="test",
+        llm_provider="fake",
+        llm_fake_latency="fixed:1",
+        ai_llm_cache_enabled=False,
+    )
+    form = IntakeFormRequest(
+        name="Jane Smith",
+        email="jane@company.com",
+        role_title=RoleTitle.FOUNDER_CSUITE,
+        service_type=ServiceType.PROJECT,
+        context_raw="We need help building an AI-powered recommendation engine.",
+        access_model=AccessModel.REMOTE_ACCESS,
+        timeline=Timeline.URGENT,
+        budget_range=BudgetRange.UNSURE,
+    )
+
+    with patch('app.services.ai_assistant.get_settings', return_value=settings):
+        with patch('app.services.ai_assistant.get_supabase_service'):
+            service = AIAssistantService()
+            triggers = await service._detect_llm_triggers(form)
+            question = await service._first_question(form, [])
+
+    assert triggers.llm_available is True
+    assert question.target_field == "budget_range"
+    assert service.llm.calls == {"trigger_detection": 1, "question_generation": 1}
@@ -0,0 +1,155 @@
+"""Unit tests for the LLM circuit breaker and hedged requests.
+
+Tests cover:
+1. Opening on error rate and p95 latency (but not on healthy slow calls)
+2. Half-open probe and recovery
+3. Hedged requests
+"""
+
+import asyncio
+import pytest
+
+from app.services.llm_resilience import CircuitBreaker, CircuitState, hedged
+
+
+class FakeClock:
+    """Controllable clock for cool-down checks."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_breaker(clock) -> CircuitBreaker:
+    return CircuitBreaker(
+        name="test",
+        window_size=10,
+        min_calls=4,
+        error_rate_threshold=0.5,
+        p95_latency_threshold=5.0,
+        open_seconds=30,
+        clock=clock,
+    )
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker."""
+
+    def test_opens_on_error_rate(self):
+        """Half the window failing opens the circuit."""
+        breaker = make_breaker(FakeClock())
+        for ok in (True, False, True, False):
+            assert breaker.allow()
+            (breaker.record_success if ok else breaker.record_failure)(0.5)
+
+        assert breaker.state == CircuitState.OPEN
+        assert not breaker.allow()
+
+    def test_opens_on_p95_latency(self):
+        """Consistently slow successes also open the circuit."""
+        breaker = make_breaker(FakeClock())
+        for _ in range(4):
+            breaker.record_success(6.0)
+
+        assert breaker.state == CircuitState.OPEN
+
+    def test_default_threshold_tolerates_slow_healthy_calls(self):
+        """Calls well inside the deadline (e.g. 3-4s of 6s) don't open the default breaker."""
+        from app.config import Settings
+
+        settings = Settings(supabase_url="http://localhost", supabase_service_role_key="test")
+        breaker = CircuitBreaker(
+            name="test",
+            window_size=settings.ai_breaker_window,
+            min_calls=settings.ai_breaker_min_calls,
+            error_rate_threshold=settings.ai_breaker_error_rate,
+            p95_latency_threshold=settings.ai_breaker_p95_ratio * settings.ai_llm_timeout_seconds,
+            open_seconds=settings.ai_breaker_open_seconds,
+            clock=FakeClock(),
+        )
+        for i in range(settings.ai_breaker_window):
+            breaker.record_success(3.0 + (i % 3) * 0.5)
+
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_stays_closed_below_min_calls(self):
+        """A couple of early failures are not enough to judge."""
+        breaker = make_breaker(FakeClock())
+        breaker.record_failure(0.5)
+        breaker.record_failure(0.5)
+
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_half_open_probe(self):
+        """After the cool-down one probe is allowed; success closes."""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(4):
+            breaker.record_failure(0.5)
+        clock.now += 31
+
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()  # Only one probe at a time
+
+        breaker.record_success(0.5)
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.error_rate() == 0.0
+
+    def test_failed_probe_reopens(self):
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(4):
+            breaker.record_failure(0.5)
+        clock.now += 31
+        breaker.allow()
+
+        breaker.record_failure(0.5)
+        assert breaker.state == CircuitState.OPEN
+
+
+class TestHedged:
+    """Tests for hedged()."""
+
+    @pytest.mark.asyncio
+    async def test_fast_call_is_not_hedged(self):
+        calls = []
+
+        async def call():
+            calls.append(1)
+            return "ok"
+
+        assert await hedged(call, 0.05) == "ok"
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_call_is_hedged(self):
+        """The second attempt wins when the first stalls; the first is cancelled."""
+        attempts = []
+
+        async def call():
+            attempt = len(attempts)
+            attempts.append(asyncio.current_task())
+            await asyncio.sleep(5 if attempt == 0 else 0.01)
+            return attempt
+
+        assert await asyncio.wait_for(hedged(call, 0.02), timeout=1) == 1
+        await asyncio.sleep(0)
+        assert attempts[0].cancelled()
+
+    @pytest.mark.asyncio
+    async def test_hedge_survives_one_failure(self):
+        """If the hedge fails, the original can still win."""
+        attempts = []
+
+        async def call():
+            attempt = len(attempts)
+            attempts.append(attempt)
+            if attempt == 1:
+                raise RuntimeError("hedge failed")
+            await asyncio.sleep(0.05)
+            return "original"
+
+        assert await hedged(call, 0.01) == "original"
@@ -0,0 +1,62 @@
+"""Unit tests for request micro-batching.
+
+Tests cover:
+1. Concurrent submissions share one batch call
+2. Per-item errors reach only their caller
+"""
+
+import asyncio
+import pytest
+
+from app.services.micro_batch import MicroBatcher
+
+
+class TestMicroBatcher:
+    """Tests for MicroBatcher."""
+
+    @pytest.mark.asyncio
+    async def test_window_collects_concurrent_items(self):
+        """Items submitted within the window go out in one batch."""
+        calls = []
+
+        async def run_batch(items):
+            calls.append(list(items))
+            return [item * 10 for item in items]
+
+        batcher = MicroBatcher(run_batch, window_seconds=0.01, max_batch_size=8)
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+
+        assert results == [0, 10, 20]
+        assert calls == [[0, 1, 2]]
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_without_waiting(self):
+        """Reaching max_batch_size sends the batch before the window ends."""
+        calls = []
+
+        async def run_batch(items):
+            calls.append(list(items))
+            return items
+
+        batcher = MicroBatcher(run_batch, window_seconds=60, max_batch_size=2)
+        results = await asyncio.wait_for(
+            asyncio.gather(batcher.submit("a"), batcher.submit("b")),
+            timeout=1,
+        )
+
+        assert results == ["a", "b"]
+        assert calls == [["a", "b"]]
+
+    @pytest.mark.asyncio
+    async def test_errors_are_delivered_per_item(self):
+        """An exception in one position fails only that caller."""
+        async def run_batch(items):
+            return [ValueError("bad") if item == "bad" else item for item in items]
+
+        batcher = MicroBatcher(run_batch, window_seconds=0.01, max_batch_size=8)
+        good, bad = await asyncio.gather(
+            batcher.submit("good"), batcher.submit("bad"), return_exceptions=True,
+        )
+
+        assert good == "good"
+        assert isinstance(bad, ValueError)
@@ -0,0 +1,75 @@
+"""Unit tests for the concurrent stage graph.
+
+Tests cover:
+1. Independent stages overlap; dependent stages receive their inputs
+2. Errors and cancellation propagate
+3. Critical path and Server-Timing output
+"""
+
+import asyncio
+import pytest
+
+from app.services.pipeline import StageGraph
+
+
+async def _sleep_then(value, delay):
+    await asyncio.sleep(delay)
+    return value
+
+
+class TestStageGraph:
+    """Tests for StageGraph."""
+
+    @pytest.mark.asyncio
+    async def test_independent_stages_run_concurrently(self):
+        """Two 50ms stages and their 0ms join finish in about 50ms."""
+        graph = StageGraph("test")
+        graph.add("a", lambda: _sleep_then(1, 0.05))
+        graph.add("b", lambda: _sleep_then(2, 0.05))
+        graph.add("sum", lambda a, b: a + b, "a", "b")
+
+        assert await graph.get("sum") == 3
+        assert graph.timings["sum"].end_ms < 90
+        assert graph.timings["sum"].start_ms >= graph.timings["a"].end_ms
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_dependents(self):
+        """A failed stage fails the stages that depend on it."""
+        async def boom():
+            raise RuntimeError("boom")
+
+        graph = StageGraph("test")
+        graph.add("a", boom)
+        graph.add("b", lambda a: a, "a")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await graph.get("b")
+        await graph.aclose()
+
+    @pytest.mark.asyncio
+    async def test_cancel_and_aclose(self):
+        """Cancelled and unfinished stages never report as finished."""
+        graph = StageGraph("test")
+        graph.add("slow", lambda: _sleep_then(1, 5))
+        graph.add("spare", lambda: _sleep_then(2, 5))
+        await asyncio.sleep(0)
+
+        graph.cancel("spare")
+        with pytest.raises(asyncio.CancelledError):
+            await graph.get("spare")
+        await graph.aclose()
+
+        assert not any(t.finished for t in graph.timings.values())
+        assert graph.server_timing() == ""
+
+    @pytest.mark.asyncio
+    async def test_critical_path(self):
+        """The critical path follows the slowest dependency chain."""
+        graph = StageGraph("test")
+        graph.add("fast", lambda: _sleep_then(None, 0.01))
+        graph.add("slow", lambda: _sleep_then(None, 0.05))
+        graph.add("join", lambda *_: None, "fast", "slow")
+        await graph.get("join")
+
+        assert graph.critical_path() == ["slow", "join"]
+        assert "slow;dur=" in graph.server_timing()
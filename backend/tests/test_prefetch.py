@@ -0,0 +1,70 @@
+"""Unit tests for speculative question prefetch.
+
+Tests cover:
+1. Claiming the branch for the chosen answer cancels the others
+2. Branches built for a different form state are not served
+"""
+
+import asyncio
+import pytest
+
+from app.schemas.ai_assistant import AIQuestion, AIQuestionType
+from app.services.prefetch import QuestionPrefetcher
+
+
+def _question(text: str) -> AIQuestion:
+    return AIQuestion(question_text=text, question_type=AIQuestionType.TEXT)
+
+
+async def _slow(text: str) -> AIQuestion:
+    await asyncio.sleep(5)
+    return _question(text)
+
+
+async def _fast(text: str) -> AIQuestion:
+    return _question(text)
+
+
+class TestQuestionPrefetcher:
+    """Tests for QuestionPrefetcher."""
+
+    @pytest.mark.asyncio
+    async def test_claim_cancels_other_branches(self):
+        """The chosen branch is served and the rest are cancelled."""
+        prefetcher = QuestionPrefetcher()
+        prefetcher.schedule("s1", 0, {
+            "a": ("state", lambda: _fast("after a")),
+            "b": ("state", lambda: _slow("after b")),
+        })
+        other = prefetcher._turns[("s1", 0)].branches['"b"'].task
+
+        question = await prefetcher.claim("s1", 0, "a", "state")
+        await asyncio.sleep(0)
+
+        assert question.question_text == "after a"
+        assert other.cancelled()
+        assert prefetcher.hits == 1
+        # A turn can only be claimed once
+        assert await prefetcher.claim("s1", 0, "a", "state") is None
+
+    @pytest.mark.asyncio
+    async def test_fingerprint_mismatch_misses(self):
+        """A branch predicted for a different form state is discarded."""
+        prefetcher = QuestionPrefetcher()
+        prefetcher.schedule("s1", 0, {"a": ("predicted", lambda: _fast("after a"))})
+
+        assert await prefetcher.claim("s1", 0, "a", "actual") is None
+        assert prefetcher.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_capacity_evicts_oldest_turn(self):
+        """Old turns are cancelled once the table is full."""
+        prefetcher = QuestionPrefetcher(capacity=1)
+        prefetcher.schedule("s1", 0, {"a": ("state", lambda: _slow("s1"))})
+        first = prefetcher._turns[("s1", 0)].branches['"a"'].task
+        prefetcher.schedule("s2", 0, {"a": ("state", lambda: _slow("s2"))})
+        await asyncio.sleep(0)
+
+        assert first.cancelled()
+        assert ("s1", 0) not in prefetcher._turns
+        prefetcher.discard("s2", 0)
@@ -0,0 +1,146 @@
+"""Unit tests for the precomputed question bank.
+
+Tests cover:
+1. Keys for brief-context ambiguity states only
+2. Artifact round trip and stale-template rejection
+3. Validation of generated questions
+"""
+
+import gzip
+import json
+import pytest
+
+from app.schemas.ai_assistant import (
+    AIQuestion,
+    AIQuestionType,
+    AITriggerReason,
+    DetectedIssue,
+    QuestionOption,
+)
+from app.schemas.intake import (
+    AccessModel,
+    BudgetRange,
+    IntakeFormRequest,
+    RoleTitle,
+    ServiceType,
+    Timeline,
+)
+from app.services.question_bank import QuestionBank, bank_key, validate_question
+
+
+@pytest.fixture
+def form():
+    return IntakeFormRequest(
+        name="Jane Smith",
+        email="jane@company.com",
+        role_title=RoleTitle.VP_DIRECTOR,
+        service_type=ServiceType.PROJECT,
+        context_raw="Not sure yet.",
+        access_model=AccessModel.REMOTE_ACCESS,
+        timeline=Timeline.SOON,
+        budget_range=BudgetRange.UNSURE,
+    )
+
+
+BUDGET_ISSUE = DetectedIssue(
+    trigger_type=AITriggerReason.AMBIGUITY,
+    field="budget_range",
+    description="User unsure of budget",
+    priority=1,
+)
+
+CONTEXT_ISSUE = DetectedIssue(
+    trigger_type=AITriggerReason.AMBIGUITY,
+    field="context_raw",
+    description="Brief context",
+    priority=3,
+)
+
+ISSUES = [BUDGET_ISSUE, CONTEXT_ISSUE]
+
+BUDGET_QUESTION = AIQuestion(
+    question_text="Which budget range fits?",
+    question_type=AIQuestionType.SINGLE_CHOICE,
+    target_field="budget_range",
+    options=[
+        QuestionOption(value="25k_50k", label="$25k-$50k", maps_to_field="budget_range", maps_to_value="25k_50k"),
+        QuestionOption(value="keep_current", label="Keep current"),
+    ],
+)
+
+
+class TestBankKey:
+    """Tests for bank_key."""
+
+    def test_ambiguity_state_is_keyed(self, form):
+        """The key covers enums, issue fields and asked fields, not context."""
+        turns = [{"target_field": "service_type"}]
+        key = bank_key(form, ISSUES, turns)
+
+        assert key == "project|unsure|remote_access|soon|vp_director|budget_range,context_raw|service_type"
+        other_context = form.model_copy(update={"context_raw": "Idk"})
+        assert bank_key(other_context, ISSUES, turns) == key
+
+    def test_substantive_context_is_not_banked(self, form):
+        """Without the brief-context issue the LLM tailors the question to the context."""
+        assert bank_key(form, [BUDGET_ISSUE], []) is None
+
+    def test_context_dependent_issues_are_not_banked(self, form):
+        """Contradictions depend on the free text, so they go to the LLM."""
+        contradiction = DetectedIssue(
+            trigger_type=AITriggerReason.CONTRADICTION,
+            description="Conflict",
+            priority=2,
+        )
+        assert bank_key(form, ISSUES + [contradiction], []) is None
+
+
+class TestQuestionBank:
+    """Tests for QuestionBank save/load/lookup."""
+
+    def test_round_trip(self, tmp_path, form):
+        """Saved questions are served by key and stored once."""
+        path = str(tmp_path / "bank.json.gz")
+        key = bank_key(form, ISSUES, [])
+        other = bank_key(form.model_copy(update={"timeline": Timeline.URGENT}), ISSUES, [])
+        QuestionBank.save(path, {key: BUDGET_QUESTION, other: BUDGET_QUESTION}, meta={})
+
+        bank = QuestionBank.load(path)
+
+        assert len(bank) == 2
+        assert len(bank.questions) == 1
+        assert bank.lookup(form, ISSUES, []) == BUDGET_QUESTION
+        assert bank.lookup(form, ISSUES, [{"target_field": "budget_range"}]) is None
+        assert (bank.hits, bank.misses) == (1, 1)
+
+    def test_stale_templates_rejected(self, tmp_path):
+        """A bank built from other prompt templates is refused."""
+        path = str(tmp_path / "bank.json.gz")
+        QuestionBank.save(path, {}, meta={})
+        with gzip.open(path, "rt") as f:
+            data = json.load(f)
+        data["meta"]["templates_hash"] = "stale"
+        with gzip.open(path, "wt") as f:
+            json.dump(data, f)
+
+        with pytest.raises(ValueError, match="rebuild"):
+            QuestionBank.load(path)
+
+
+class TestValidateQuestion:
+    """Tests for validate_question."""
+
+    def test_valid_question(self):
+        assert validate_question(BUDGET_QUESTION) == []
+
+    def test_invalid_option_mapping(self):
+        """Options must map to real enum values."""
+        question = BUDGET_QUESTION.model_copy(update={"options": [
+            QuestionOption(value="big", label="Big", maps_to_field="budget_range", maps_to_value="1m_plus"),
+            QuestionOption(value="x", label="X", maps_to_field="email", maps_to_value="x"),
+        ]})
+
+        problems = validate_question(question)
+
+        assert any("1m_plus" in p for p in problems)
+        assert any("unknown field email" in p for p in problems)
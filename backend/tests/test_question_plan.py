@@ -0,0 +1,89 @@
+"""Unit tests for whole-session question plans.
+
+Tests cover:
+1. Invalid follow-ups are dropped when a plan is built
+2. Later turns are served from the plan while answers stay on it
+"""
+
+from app.schemas.ai_assistant import AIQuestion, AIQuestionType, QuestionOption
+from app.services.question_plan import ANY_ANSWER, build_plan, next_planned_question
+
+FIRST = AIQuestion(
+    question_text="Which budget range best fits your project?",
+    question_type=AIQuestionType.SINGLE_CHOICE,
+    target_field="budget_range",
+    options=[
+        QuestionOption(value="under_10k", label="Under $10,000", maps_to_field="budget_range", maps_to_value="under_10k"),
+        QuestionOption(value="over_50k", label="Over $50,000", maps_to_field="budget_range", maps_to_value="over_50k"),
+    ],
+)
+
+ACCESS = {
+    "question_text": "How can we access your systems?",
+    "question_type": "text",
+    "target_field": "access_model",
+}
+
+CONTEXT = {
+    "question_text": "Tell us more about the project?",
+    "question_type": "text",
+    "target_field": "context_raw",
+}
+
+
+def _turn(index: int, question_text: str, answer, target_field: str) -> dict:
+    return {
+        "turn_index": index,
+        "question_text": question_text,
+        "answer_value": {"value": answer},
+        "target_field": target_field,
+    }
+
+
+class TestBuildPlan:
+    """Tests for build_plan."""
+
+    def test_drops_unknown_answers_and_invalid_questions(self):
+        plan = build_plan(FIRST, {
+            "over_50k": {"question": ACCESS, "next": {ANY_ANSWER: {"question": CONTEXT}}},
+            "not_an_option": {"question": ACCESS},
+            "under_10k": {"question": {"question_text": "", "question_type": "text"}},
+        }, max_questions=3)
+
+        assert set(plan["next"]) == {"over_50k"}
+        assert set(plan["next"]["over_50k"]["next"]) == {ANY_ANSWER}
+
+    def test_paths_are_capped_at_max_questions(self):
+        plan = build_plan(FIRST, {
+            "over_50k": {"question": ACCESS, "next": {ANY_ANSWER: {"question": CONTEXT}}},
+        }, max_questions=2)
+
+        assert plan["next"]["over_50k"]["next"] == {}
+
+    def test_no_usable_follow_ups_gives_no_plan(self):
+        assert build_plan(FIRST, None, max_questions=3) is None
+
+
+class TestNextPlannedQuestion:
+    """Tests for next_planned_question."""
+
+    def _plan(self):
+        return build_plan(FIRST, {
+            "over_50k": {"question": ACCESS, "next": {ANY_ANSWER: {"question": CONTEXT}}},
+        }, max_questions=3)
+
+    def test_follows_answers_down_the_plan(self):
+        turns = [_turn(0, FIRST.question_text, "over_50k", "budget_range")]
+        assert next_planned_question(self._plan(), turns).target_field == "access_model"
+
+        turns.append(_turn(1, ACCESS["question_text"], "Only via VPN", "access_model"))
+        assert next_planned_question(self._plan(), turns).target_field == "context_raw"
+
+    def test_unplanned_answer_or_question_leaves_the_plan(self):
+        assert next_planned_question(
+            self._plan(), [_turn(0, FIRST.question_text, "under_10k", "budget_range")]
+        ) is None
+        assert next_planned_question(
+            self._plan(), [_turn(0, "A different question?", "over_50k", "budget_range")]
+        ) is None
+        assert next_planned_question(None, [_turn(0, FIRST.question_text, "over_50k", "budget_range")]) is None
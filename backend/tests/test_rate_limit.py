@@ -0,0 +1,154 @@
+"""Unit tests for the intake rate limiter.
+
+Tests cover:
+1. Per-email and per-IP sliding-window limits
+2. Window expiry
+3. Released and concurrent submissions
+4. Cold-start seeding from recent submissions
+"""
+
+import asyncio
+
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+from app.services.rate_limit import (
+    InMemoryRateLimitBackend,
+    RateLimiter,
+    RateLimitRule,
+)
+
+
+DAY = 24 * 60 * 60
+HOUR = 60 * 60
+
+
+class FakeClock:
+    """Controllable clock for window arithmetic."""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    # Start at the beginning of a day window so the previous window is empty
+    return FakeClock(1_000 * DAY)
+
+
+def make_limiter(clock, seed_loader=None) -> RateLimiter:
+    return RateLimiter(
+        backend=InMemoryRateLimitBackend(clock=clock),
+        email_rule=RateLimitRule("email", 3, DAY, "email limit"),
+        ip_rule=RateLimitRule("ip", 10, HOUR, "ip limit"),
+        seed_loader=seed_loader,
+        clock=clock,
+    )
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter.acquire."""
+
+    @pytest.mark.asyncio
+    async def test_email_limit(self, clock):
+        """Fourth submission from the same email in a day is rejected."""
+        limiter = make_limiter(clock)
+
+        for i in range(3):
+            assert (await limiter.acquire("a@company.com", f"10.0.0.{i}")).allowed
+
+        reservation = await limiter.acquire("A@company.com", "10.0.0.9")
+        assert (reservation.allowed, reservation.reason) == (False, "email limit")
+
+    @pytest.mark.asyncio
+    async def test_ip_limit(self, clock):
+        """Eleventh submission from the same IP in an hour is rejected."""
+        limiter = make_limiter(clock)
+
+        for i in range(10):
+            assert (await limiter.acquire(f"user{i}@company.com", "10.0.0.1")).allowed
+
+        reservation = await limiter.acquire("other@company.com", "10.0.0.1")
+        assert (reservation.allowed, reservation.reason) == (False, "ip limit")
+        # Different IP is unaffected
+        assert (await limiter.acquire("other@company.com", "10.0.0.2")).allowed
+
+    @pytest.mark.asyncio
+    async def test_rejected_attempts_are_not_counted(self, clock):
+        """Blocked attempts don't consume allowance on other keys."""
+        limiter = make_limiter(clock)
+        for _ in range(3):
+            await limiter.acquire("a@company.com", "10.0.0.1")
+
+        for _ in range(20):
+            await limiter.acquire("a@company.com", "10.0.0.1")
+
+        # IP only counted the 3 accepted submissions
+        for i in range(7):
+            assert (await limiter.acquire(f"u{i}@company.com", "10.0.0.1")).allowed
+
+    @pytest.mark.asyncio
+    async def test_limit_resets_after_windows_pass(self, clock):
+        """Counts age out once the sliding window has moved past them."""
+        limiter = make_limiter(clock)
+        for _ in range(3):
+            await limiter.acquire("a@company.com")
+
+        clock.now += 2 * DAY
+
+        assert (await limiter.acquire("a@company.com")).allowed
+
+    @pytest.mark.asyncio
+    async def test_released_submissions_are_not_counted(self, clock):
+        """A submission that was not stored gives its quota back."""
+        limiter = make_limiter(clock)
+        for _ in range(2):
+            await limiter.acquire("a@company.com", "10.0.0.1")
+
+        await limiter.release(await limiter.acquire("a@company.com", "10.0.0.1"))
+
+        assert (await limiter.acquire("a@company.com", "10.0.0.1")).allowed
+        assert not (await limiter.acquire("a@company.com", "10.0.0.1")).allowed
+
+    @pytest.mark.asyncio
+    async def test_concurrent_acquires_cannot_overshoot(self, clock):
+        """Concurrent submissions cannot all pass the same last slot."""
+        limiter = make_limiter(clock)
+
+        results = await asyncio.gather(*(
+            limiter.acquire("a@company.com", f"10.0.0.{i}") for i in range(10)
+        ))
+
+        assert sum(r.allowed for r in results) == 3
+
+
+class TestSeeding:
+    """Tests for cold-start seeding."""
+
+    @pytest.mark.asyncio
+    async def test_seeds_from_recent_submissions_once(self, clock):
+        """Past submissions count against the limit after a restart."""
+        created_at = datetime.fromtimestamp(clock.now - 60, tz=timezone.utc).isoformat()
+        loader = AsyncMock(return_value=[
+            {"email": "a@company.com", "ip_address": "10.0.0.1", "created_at": created_at},
+            {"email": "a@company.com", "ip_address": "10.0.0.1", "created_at": created_at},
+            {"email": "a@company.com", "ip_address": None, "created_at": created_at},
+        ])
+        limiter = make_limiter(clock, seed_loader=loader)
+
+        reservation = await limiter.acquire("a@company.com")
+        assert (reservation.allowed, reservation.reason) == (False, "email limit")
+        await limiter.acquire("b@company.com")
+        loader.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_seed_failure_does_not_block_submissions(self, clock):
+        """Database errors during seeding fall back to empty counters."""
+        loader = AsyncMock(side_effect=Exception("db down"))
+        limiter = make_limiter(clock, seed_loader=loader)
+
+        assert (await limiter.acquire("a@company.com")).allowed
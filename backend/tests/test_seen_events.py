@@ -0,0 +1,42 @@
+"""Unit tests for the seen-event filter.
+
+Tests cover:
+1. Seen events are reported and the least recently used is evicted
+2. Warming keeps the newest events when over capacity
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.seen_events import SeenEventFilter
+
+
+class TestSeenEventFilter:
+    """Tests for SeenEventFilter."""
+
+    def test_evicts_least_recently_used(self):
+        seen = SeenEventFilter(capacity=2)
+        seen.add("evt_1")
+        seen.add("evt_2")
+
+        assert seen.seen("evt_1")  # Now most recent
+        seen.add("evt_3")
+
+        assert "evt_2" not in seen
+        assert not seen.seen("evt_2")
+        assert seen.seen("evt_1") and seen.seen("evt_3")
+        assert seen.stats() == {"size": 2, "hits": 3, "misses": 1}
+
+    @pytest.mark.asyncio
+    async def test_load_recent_keeps_newest(self):
+        supabase = MagicMock()
+        supabase.get_recent_webhook_event_ids = AsyncMock(return_value=["evt_3", "evt_2", "evt_1"])
+        seen = SeenEventFilter(capacity=2)
+
+        with patch("app.services.seen_events.get_supabase_service", return_value=supabase):
+            assert await seen.load_recent() == 3
+
+        supabase.get_recent_webhook_event_ids.assert_awaited_once_with(2)
+        assert "evt_3" in seen and "evt_2" in seen
+        assert "evt_1" not in seen
@@ -0,0 +1,141 @@
+"""Unit tests for the write-through session cache.
+
+Tests cover:
+1. Entries expire at the session's expires_at
+2. Stale writes invalidate the entry
+3. Resume reads are served without touching the database
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.session_cache import SessionCache, SessionRecord
+
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _session(session_id: str = "s1", minutes: int = 30, **extra) -> dict:
+    return {
+        "id": session_id,
+        "status": "active",
+        "trigger_reasons": ["ambiguity"],
+        "question_count": 0,
+        "max_questions": 3,
+        "field_updates": {},
+        "expires_at": (NOW + timedelta(minutes=minutes)).isoformat(),
+        "final_output": None,
+        **extra,
+    }
+
+
+class TestSessionCache:
+    """Tests for SessionCache."""
+
+    def test_records_are_slotted(self):
+        record = SessionRecord(_session())
+        assert not hasattr(record, "__dict__")
+        assert "final_output" not in record.as_dict()
+
+    def test_entry_expires_at_session_expiry(self):
+        clock = FakeClock(NOW.timestamp())
+        cache = SessionCache(clock=clock)
+        cache.put_session(_session(minutes=30))
+
+        clock.now += 29 * 60
+        assert cache.get("s1") is not None
+
+        # A keepalive written through moves the expiry
+        cache.update_session("s1", {"expires_at": (NOW + timedelta(minutes=60)).isoformat()})
+        clock.now += 2 * 60
+        assert cache.get("s1") is not None
+
+        clock.now += 30 * 60
+        assert cache.get("s1") is None
+
+    def test_stale_write_invalidates_entry(self):
+        cache = SessionCache(clock=FakeClock(NOW.timestamp()))
+        cache.put_session(_session())
+        version = cache.get("s1").version
+
+        cache.update_session("s1", {"question_count": 1})  # Concurrent writer
+        assert cache.put_session(_session(question_count=1), expected_version=version) is None
+
+        assert cache.get("s1") is None
+        assert cache.stale_writes == 1
+
+    def test_form_snapshot_survives_row_writes(self):
+        cache = SessionCache(clock=FakeClock(NOW.timestamp()))
+        cache.put_session(_session())
+        form = object()
+        cache.set_form("s1", form)
+
+        record = cache.put_session(_session(question_count=1), expected_version=cache.get("s1").version)
+        assert record.form is form
+
+    def test_capacity_drops_least_recently_used(self):
+        cache = SessionCache(capacity=2, clock=FakeClock(NOW.timestamp()))
+        cache.put_session(_session("a"))
+        cache.put_session(_session("b"))
+        cache.get("a")
+        cache.put_session(_session("c"))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+
+
+@pytest.mark.asyncio
+async def test_resume_is_served_from_cache(mock_settings_for_cache):
+    """Session state written by this process is read back without queries."""
+    from app.schemas.ai_assistant import AIQuestion, AIQuestionType
+    from app.schemas.intake import GateStatus
+    from app.services.ai_assistant import AIAssistantService
+
+    expires_at = (datetime.now(timezone.utc) + timedelta(minutes=30)).isoformat()
+    mock_supabase = MagicMock()
+    table = mock_supabase.client.table.return_value
+    table.insert.return_value.execute = AsyncMock(side_effect=[
+        MagicMock(data=[_session("s1", expires_at=expires_at)]),
+        MagicMock(data=[{
+            "session_id": "s1",
+            "turn_index": 0,
+            "question_text": "Tell us more?",
+            "question_type": "text",
+            "answered_at": None,
+        }]),
+    ])
+
+    with patch('app.services.ai_assistant.get_settings', return_value=mock_settings_for_cache):
+        with patch('app.services.ai_assistant.get_supabase_service', return_value=mock_supabase):
+            service = AIAssistantService()
+            await service._create_session("inquiry-1", [], GateStatus.MANUAL)
+            await service._create_turn(
+                "s1", 0, AIQuestion(question_text="Tell us more?", question_type=AIQuestionType.TEXT)
+            )
+            state = await service.get_session_state("s1")
+
+    assert state["current_question"].question_text == "Tell us more?"
+    table.select.assert_not_called()
+
+
+@pytest.fixture
+def mock_settings_for_cache():
+    settings = MagicMock()
+    settings.llm_provider = "gemini"
+    settings.gemini_api_key = ""
+    settings.ai_question_bank_path = ""
+    settings.ai_max_questions = 3
+    settings.ai_session_ttl_minutes = 30
+    settings.ai_session_cache_enabled = True
+    settings.ai_session_cache_size = 100
+    return settings
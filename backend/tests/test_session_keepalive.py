@@ -0,0 +1,119 @@
+"""Unit tests for session keepalives.
+
+Tests cover:
+1. Keepalives coalesce into one batched write per flush
+2. A failed flush keeps the pending activity
+3. Keepalives near the stored expiry are written right away
+4. Keepalives extend cached sessions without bumping their version
+5. Without batching every keepalive is written directly
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.session_cache import SessionCache
+from app.services.session_keepalive import SessionKeepalive
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def mock_supabase():
+    supabase = MagicMock()
+    supabase.extend_ai_sessions = AsyncMock(return_value=1)
+    with patch("app.services.session_keepalive.get_supabase_service", return_value=supabase):
+        yield supabase
+
+
+class TestSessionKeepalive:
+    """Tests for SessionKeepalive."""
+
+    @pytest.mark.asyncio
+    async def test_keepalives_coalesce_into_one_write(self, mock_supabase):
+        clock = FakeClock(NOW.timestamp())
+        keepalive = SessionKeepalive(ttl_seconds=1800, flush_interval_seconds=60, clock=clock)
+
+        # First pings are written right away (no expiry written yet)
+        await keepalive.touch("s1")
+        await keepalive.touch("s2")
+        assert mock_supabase.extend_ai_sessions.await_count == 2
+        mock_supabase.extend_ai_sessions.reset_mock()
+
+        clock.now += 30
+        await keepalive.touch("s1")
+        await keepalive.touch("s2")
+        clock.now += 30
+        expires_at = await keepalive.touch("s1")
+        mock_supabase.extend_ai_sessions.assert_not_awaited()
+
+        assert await keepalive.flush() == 2
+        mock_supabase.extend_ai_sessions.assert_awaited_once_with({
+            "s1": NOW + timedelta(seconds=60 + 1800),
+            "s2": NOW + timedelta(seconds=30 + 1800),
+        })
+        assert expires_at == NOW + timedelta(seconds=60 + 1800)
+        assert await keepalive.flush() == 0  # Nothing pending
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_pending(self, mock_supabase):
+        keepalive = SessionKeepalive(ttl_seconds=1800, flush_interval_seconds=60)
+        mock_supabase.extend_ai_sessions.side_effect = RuntimeError("database unavailable")
+        await keepalive.touch("s1")  # Immediate flush fails; logged, not raised
+
+        with pytest.raises(RuntimeError):
+            await keepalive.flush()
+
+        assert len(keepalive) == 1
+
+    @pytest.mark.asyncio
+    async def test_keepalive_near_expiry_is_written_now(self, mock_supabase):
+        clock = FakeClock(NOW.timestamp())
+        keepalive = SessionKeepalive(ttl_seconds=1800, flush_interval_seconds=60, clock=clock)
+        await keepalive.touch("s1")
+        mock_supabase.extend_ai_sessions.reset_mock()
+
+        clock.now += 1800 - 90  # Stored expiry passes within two flush intervals
+        await keepalive.touch("s1")
+
+        mock_supabase.extend_ai_sessions.assert_awaited_once_with({
+            "s1": NOW + timedelta(seconds=1800 - 90 + 1800),
+        })
+        assert len(keepalive) == 0
+
+    @pytest.mark.asyncio
+    async def test_touch_extends_cached_session_without_new_version(self, mock_supabase):
+        clock = FakeClock(NOW.timestamp())
+        cache = SessionCache(clock=clock)
+        cache.put_session({"id": "s1", "status": "active", "expires_at": (NOW + timedelta(minutes=30)).isoformat()})
+        version = cache.get("s1").version
+        keepalive = SessionKeepalive(ttl_seconds=1800, flush_interval_seconds=60, session_cache=cache, clock=clock)
+
+        clock.now += 20 * 60
+        await keepalive.touch("s1")
+        clock.now += 20 * 60
+
+        record = cache.get("s1")
+        assert record is not None  # Past the original expiry, kept alive
+        assert record.version == version
+
+    @pytest.mark.asyncio
+    async def test_unbatched_keepalive_is_written_directly(self, mock_supabase):
+        mock_supabase.set_ai_session_expiry = AsyncMock()
+        clock = FakeClock(NOW.timestamp())
+        keepalive = SessionKeepalive(ttl_seconds=1800, flush_interval_seconds=60, batched=False, clock=clock)
+
+        expires_at = await keepalive.touch("s1")
+
+        mock_supabase.set_ai_session_expiry.assert_awaited_once_with("s1", NOW + timedelta(seconds=1800))
+        mock_supabase.extend_ai_sessions.assert_not_awaited()
+        assert expires_at == NOW + timedelta(seconds=1800) and len(keepalive) == 0
@@ -0,0 +1,93 @@
+"""Unit tests for the AI session expiry sweeper.
+
+Tests cover:
+1. Batches are drained until one comes back short
+2. A run stops after max_batches
+3. Expired sessions are dropped from the session cache
+4. Pending keepalives are written before sessions are expired
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.session_cache import SessionCache
+from app.services.session_sweeper import SessionSweeper, sweep_expired_sessions
+
+
+def _batch(session_ids: list[str], with_answers: int = 0) -> dict:
+    return {"expired": len(session_ids), "with_answers": with_answers, "session_ids": session_ids}
+
+
+@pytest.fixture
+def mock_supabase():
+    supabase = MagicMock()
+    with patch("app.services.session_sweeper.get_supabase_service", return_value=supabase):
+        yield supabase
+
+
+class TestSweepExpiredSessions:
+    """Tests for sweep_expired_sessions."""
+
+    @pytest.mark.asyncio
+    async def test_drains_until_short_batch(self, mock_supabase):
+        mock_supabase.expire_ai_sessions = AsyncMock(side_effect=[
+            _batch(["s1", "s2"], with_answers=1),
+            _batch(["s3"]),
+        ])
+
+        result = await sweep_expired_sessions(batch_size=2, max_batches=10)
+
+        assert (result.expired, result.with_answers, result.batches) == (3, 1, 2)
+        mock_supabase.expire_ai_sessions.assert_awaited_with(2)
+
+    @pytest.mark.asyncio
+    async def test_stops_after_max_batches(self, mock_supabase):
+        mock_supabase.expire_ai_sessions = AsyncMock(return_value=_batch(["s1", "s2"]))
+
+        result = await sweep_expired_sessions(batch_size=2, max_batches=3)
+
+        assert result.batches == 3
+        assert result.expired == 6
+
+    @pytest.mark.asyncio
+    async def test_expired_sessions_leave_the_cache(self, mock_supabase):
+        cache = SessionCache()
+        expires_at = (datetime.now(timezone.utc) + timedelta(minutes=5)).isoformat()
+        cache.put_session({"id": "s1", "status": "active", "expires_at": expires_at})
+        cache.put_session({"id": "s2", "status": "active", "expires_at": expires_at})
+        mock_supabase.expire_ai_sessions = AsyncMock(return_value=_batch(["s1"]))
+        sweeper = SessionSweeper(interval_seconds=60, batch_size=10, max_batches=1, session_cache=cache)
+
+        await sweeper.sweep()
+
+        assert cache.get("s1") is None
+        assert cache.get("s2") is not None
+        assert sweeper.stats()["total_expired"] == 1
+
+    @pytest.mark.asyncio
+    async def test_pending_keepalives_flushed_first(self, mock_supabase):
+        calls = []
+        keepalive = MagicMock()
+        keepalive.flush = AsyncMock(side_effect=lambda: calls.append("flush"))
+        mock_supabase.expire_ai_sessions = AsyncMock(
+            side_effect=lambda batch_size: calls.append("expire") or _batch([])
+        )
+        sweeper = SessionSweeper(interval_seconds=60, batch_size=10, max_batches=1, keepalive=keepalive)
+
+        await sweeper.sweep()
+
+        assert calls == ["flush", "expire"]
+
+    @pytest.mark.asyncio
+    async def test_failed_keepalive_flush_skips_run(self, mock_supabase):
+        keepalive = MagicMock()
+        keepalive.flush = AsyncMock(side_effect=RuntimeError("database unavailable"))
+        mock_supabase.expire_ai_sessions = AsyncMock(return_value=_batch([]))
+        sweeper = SessionSweeper(interval_seconds=60, batch_size=10, max_batches=1, keepalive=keepalive)
+
+        with pytest.raises(RuntimeError):
+            await sweeper.sweep()
+
+        mock_supabase.expire_ai_sessions.assert_not_awaited()
@@ -0,0 +1,103 @@
+"""Unit tests for the shared Stripe client.
+
+Tests cover:
+1. No client is built without a usable secret key
+2. Requests go through the shared pool (verified against Stripe's CA
+   bundle) with the client's own key, leaving the global stripe.api_key
+   untouched
+3. Closing the pool resets it
+"""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+import stripe
+
+from app.config import Settings
+from app.services import stripe_client as stripe_client_module
+from app.services.http_pool import HTTPPool
+
+
+def _settings(**overrides) -> Settings:
+    return Settings(
+        supabase_url="http://localhost",
+        supabase_service_role_key="test",
+        http2_enabled=False,
+        **overrides,
+    )
+
+
+@pytest.fixture
+def stripe_settings():
+    settings = _settings(stripe_secret_key="sk_test_123", stripe_max_network_retries=0)
+    with patch("app.services.stripe_client.get_settings", return_value=settings), \
+            patch("app.services.http_pool.get_settings", return_value=settings):
+        stripe_client_module.close_stripe_client()
+        yield settings
+        stripe_client_module.close_stripe_client()
+
+
+class TestStripeClient:
+    """Tests for get_stripe_client."""
+
+    def test_unconfigured_key_builds_no_client(self):
+        settings = _settings(stripe_secret_key="sk_PLACEHOLDER")
+        with patch("app.services.stripe_client.get_settings", return_value=settings):
+            stripe_client_module.close_stripe_client()
+            assert stripe_client_module.get_stripe_client() is None
+
+    @pytest.mark.asyncio
+    async def test_requests_use_pool_and_client_key(self, stripe_settings):
+        seen: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200, json={
+                "id": "cs_test_1",
+                "object": "checkout.session",
+                "payment_status": "paid",
+                "metadata": {"service": "advisory"},
+            })
+
+        pool = HTTPPool()
+        transports = []
+
+        def transport_for(cafile=None, verify=True):
+            transports.append((cafile, verify))
+            return httpx.MockTransport(handler)
+
+        pool.transport_for = transport_for
+        with patch("app.services.stripe_client.get_http_pool", return_value=pool):
+            client = stripe_client_module.get_stripe_client()
+
+        session = await client.checkout.sessions.retrieve_async("cs_test_1")
+
+        assert session.payment_status == "paid"
+        # Stripe's CA bundle, as stripe's own HTTP clients use
+        assert transports == [(stripe.ca_bundle_path, True)]
+        assert seen[0].url.path == "/v1/checkout/sessions/cs_test_1"
+        assert seen[0].headers["authorization"] == "Bearer sk_test_123"
+        assert stripe.api_key is None
+        assert stripe_client_module.get_stripe_client() is client
+
+
+class TestHTTPPoolLifecycle:
+    """Tests for close_http_pool."""
+
+    @pytest.mark.asyncio
+    async def test_close_resets_pool_and_supabase_client(self, stripe_settings):
+        from app.services import http_pool
+        from app.services.supabase import close_supabase_service, get_supabase_client
+
+        with patch("app.services.supabase.get_settings", return_value=stripe_settings):
+            pool = http_pool.get_http_pool()
+            client = get_supabase_client()
+
+            close_supabase_service()
+            await http_pool.close_http_pool()
+
+            assert http_pool.get_http_pool() is not pool
+            assert get_supabase_client() is not client
+            close_supabase_service()
+            await http_pool.close_http_pool()
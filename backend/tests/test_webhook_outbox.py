@@ -0,0 +1,187 @@
+"""Unit tests for the webhook outbox workers.
+
+Tests cover:
+1. Claimed events run their handler and are marked processed
+2. A failed attempt is rescheduled with exponential backoff
+3. The last allowed attempt marks the event failed
+4. With the outbox disabled, the endpoint processes events inline
+5. A Stripe retry of a failed event is processed again
+6. Only handled events are remembered by the seen-event filter
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.webhook_outbox import WebhookOutbox
+
+
+def _row(event_type: str, attempts: int = 1) -> dict:
+    event = {"id": "evt_1", "type": event_type, "data": {"object": {}}}
+    return {
+        "stripe_event_id": "evt_1",
+        "event_type": event_type,
+        "payload": json.dumps(event),
+        "attempts": attempts,
+    }
+
+
+def _outbox(max_attempts: int = 5) -> WebhookOutbox:
+    return WebhookOutbox(
+        workers=1,
+        claim_batch_size=10,
+        poll_seconds=1.0,
+        lease_seconds=60,
+        max_attempts=max_attempts,
+        backoff_base_seconds=10.0,
+        backoff_max_seconds=3600.0,
+    )
+
+
+@pytest.fixture
+def mock_supabase():
+    supabase = MagicMock()
+    supabase.update_webhook_event = AsyncMock()
+    with patch("app.services.webhook_outbox.get_supabase_service", return_value=supabase):
+        yield supabase
+
+
+class TestWebhookOutbox:
+    """Tests for WebhookOutbox processing."""
+
+    @pytest.mark.asyncio
+    async def test_processes_claimed_events(self, mock_supabase):
+        mock_supabase.claim_webhook_events = AsyncMock(return_value=[
+            _row("payment_intent.succeeded"),
+            _row("checkout.session.completed"),
+        ])
+        payment_handler = AsyncMock()
+        checkout_handler = AsyncMock()
+        outbox = _outbox()
+        outbox.register("payment_intent.succeeded", payment_handler)
+        outbox.register("checkout.session.completed", checkout_handler, marks_processed=True)
+
+        assert await outbox.process_due() == 2
+
+        event, _ = payment_handler.await_args.args
+        assert event["type"] == "payment_intent.succeeded"
+        checkout_handler.assert_awaited_once()
+        # Only the handler that doesn't mark the event itself gets a status write
+        mock_supabase.update_webhook_event.assert_awaited_once_with("evt_1", status="processed", release_lease=True)
+        assert outbox.stats()["processed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_is_retried_with_backoff(self, mock_supabase):
+        mock_supabase.claim_webhook_events = AsyncMock(return_value=[_row("payment_intent.succeeded", attempts=3)])
+        outbox = _outbox()
+        outbox.register("payment_intent.succeeded", AsyncMock(side_effect=RuntimeError("db down")))
+
+        before = datetime.now(timezone.utc)
+        await outbox.process_due()
+
+        _, kwargs = mock_supabase.update_webhook_event.await_args
+        assert kwargs["status"] == "pending"
+        assert kwargs["error"] == "db down"
+        # 10s * 2**(3 - 1)
+        assert kwargs["retry_at"] - before >= timedelta(seconds=40)
+        assert kwargs["retry_at"] - before < timedelta(seconds=45)
+        assert outbox.stats()["retried"] == 1
+
+    @pytest.mark.asyncio
+    async def test_last_attempt_marks_failed(self, mock_supabase):
+        mock_supabase.claim_webhook_events = AsyncMock(return_value=[_row("payment_intent.succeeded", attempts=5)])
+        outbox = _outbox(max_attempts=5)
+        outbox.register("payment_intent.succeeded", AsyncMock(side_effect=RuntimeError("bad payload")))
+
+        await outbox.process_due()
+
+        mock_supabase.update_webhook_event.assert_awaited_once_with(
+            "evt_1", status="failed", error="bad payload", release_lease=True
+        )
+        assert outbox.stats()["failed"] == 1
+        assert outbox.backoff(20) == 3600.0
+
+
+class TestStripeWebhookEndpoint:
+    """Tests for the Stripe webhook endpoint with the outbox disabled."""
+
+    EVENT = {"id": "evt_1", "type": "payment_intent.succeeded", "data": {"object": {"id": "pi_1"}}}
+
+    @pytest.fixture
+    def supabase(self):
+        supabase = MagicMock()
+        supabase.create_webhook_event = AsyncMock()
+        supabase.retry_failed_webhook_event = AsyncMock(return_value=False)
+        supabase.update_webhook_event = AsyncMock()
+        supabase.get_payment_by_stripe_id = AsyncMock(return_value={"id": "payment-1"})
+        supabase.update_payment = AsyncMock()
+        return supabase
+
+    async def _deliver(self, supabase, outbox=None, seen_events=None):
+        from app.config import Settings
+        from app.routers import stripe_webhooks
+        from app.services.seen_events import SeenEventFilter
+
+        seen_events = seen_events if seen_events is not None else SeenEventFilter(10)
+        settings = Settings(supabase_url="http://localhost", supabase_service_role_key="test")
+        request = MagicMock()
+        request.body = AsyncMock(return_value=b"{}")
+        with patch.object(stripe_webhooks, "get_settings", return_value=settings), \
+                patch.object(stripe_webhooks, "get_supabase_service", return_value=supabase), \
+                patch.object(stripe_webhooks, "get_seen_event_filter", return_value=seen_events), \
+                patch.object(stripe_webhooks, "get_webhook_outbox", return_value=outbox or MagicMock()), \
+                patch.object(stripe_webhooks.stripe.Webhook, "construct_event", return_value=self.EVENT):
+            return await stripe_webhooks.stripe_webhook(request, stripe_signature="sig")
+
+    @pytest.mark.asyncio
+    async def test_disabled_outbox_processes_inline(self, supabase):
+        """Without the outbox the handler runs in the request, as before migration 009."""
+        outbox = MagicMock()
+
+        result = await self._deliver(supabase, outbox)
+
+        assert result == {"status": "success", "event_id": "evt_1"}
+        supabase.update_payment.assert_awaited_once_with("payment-1", {"status": "confirmed"})
+        supabase.update_webhook_event.assert_awaited_once_with("evt_1", status="processed")
+        outbox.notify.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_retry_of_failed_event_is_processed(self, supabase):
+        supabase.create_webhook_event.side_effect = Exception("duplicate key value")
+        supabase.retry_failed_webhook_event.return_value = True
+
+        result = await self._deliver(supabase)
+
+        assert result == {"status": "success", "event_id": "evt_1"}
+        supabase.update_payment.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_duplicate_of_processed_event_is_skipped(self, supabase):
+        supabase.create_webhook_event.side_effect = Exception("duplicate key value")
+
+        result = await self._deliver(supabase)
+
+        assert result == {"status": "already_processed", "event_id": "evt_1"}
+        supabase.update_payment.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_failed_event_is_not_remembered(self, supabase):
+        """A failure leaves the event out of the filter so Stripe's retry gets through."""
+        from fastapi import HTTPException
+        from app.services.seen_events import SeenEventFilter
+
+        seen_events = SeenEventFilter(10)
+        supabase.update_payment.side_effect = [RuntimeError("db down"), None]
+
+        with pytest.raises(HTTPException):
+            await self._deliver(supabase, seen_events=seen_events)
+        assert not seen_events.seen("evt_1")
+
+        supabase.create_webhook_event.side_effect = Exception("duplicate key value")
+        supabase.retry_failed_webhook_event.return_value = True
+        result = await self._deliver(supabase, seen_events=seen_events)
+
+        assert result == {"status": "success", "event_id": "evt_1"}
+        assert seen_events.seen("evt_1")
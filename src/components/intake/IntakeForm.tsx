@@ -1,4 +1,7 @@
 import React, { useState, useEffect } from 'react';
+import { AIQuestion } from './types';
+import ClarificationFlow from './components/ClarificationFlow';
+import { applyAnalysis, pollAnalysis } from './utils/analysisPolling';
 
 // API endpoint - use environment variable in production
 const API_URL = import.meta.env.VITE_API_URL || 'https://taotang-api.onrender.com';
@@ -16,6 +19,11 @@ interface IntakeResponse {
   gate_status: 'pass' | 'manual' | 'fail';
   routing_result: RoutingResult;
   message: string;
+  // AI clarification (inline, or from the background analysis poll)
+  needs_clarification?: boolean;
+  ai_session_id?: string;
+  first_question?: AIQuestion;
+  analysis_pending?: boolean;
 }
 
 interface FormData {
@@ -29,11 +37,14 @@ interface FormData {
   context_raw: string;
 }
 
+// Matches backend ai_max_questions
+const MAX_CLARIFICATION_QUESTIONS = 3;
+
 // Calendly URL - update with your actual Calendly link
 const BOOKING_URL = 'https://calendar.app.google/yochBqeYtLimcXc76';
 
 const IntakeForm: React.FC = () => {
-  const [step, setStep] = useState<'form' | 'submitting' | 'success'>('form');
+  const [step, setStep] = useState<'form' | 'submitting' | 'clarifying' | 'success'>('form');
   const [result, setResult] = useState<IntakeResponse | null>(null);
   const [error, setError] = useState<string | null>(null);
   const [formData, setFormData] = useState<FormData>({
@@ -88,15 +99,46 @@ const IntakeForm: React.FC = () => {
         throw new Error(errorData.detail || 'Submission failed');
       }
 
-      const data: IntakeResponse = await response.json();
+      let data: IntakeResponse = await response.json();
+      if (data.analysis_pending) {
+        // Routing is provisional until the background AI analysis finishes
+        data = applyAnalysis(data, await pollAnalysis(API_URL, data.inquiry_id));
+      }
       setResult(data);
-      setStep('success');
+      setStep(data.needs_clarification && data.ai_session_id && data.first_question ? 'clarifying' : 'success');
     } catch (err) {
       setError(err instanceof Error ? err.message : 'An error occurred. Please try again.');
       setStep('form');
     }
   };
 
+  // AI clarification questions before the final routing
+  if (step === 'clarifying' && result?.ai_session_id && result.first_question) {
+    return (
+      <section id="initiate" className="section-padding px-6 bg-[#F8F9FA]">
+        <ClarificationFlow
+          sessionId={result.ai_session_id}
+          initialQuestion={result.first_question}
+          maxQuestions={MAX_CLARIFICATION_QUESTIONS}
+          onComplete={(outcome) => {
+            setResult({ ...result, ...outcome, needs_clarification: false });
+            setStep('success');
+          }}
+          onError={() => {
+            // The backend routes failed sessions to manual review
+            setResult({
+              ...result,
+              routing_result: 'manual',
+              message: 'Thank you for your inquiry.',
+              needs_clarification: false,
+            });
+            setStep('success');
+          }}
+        />
+      </section>
+    );
+  }
+
   // Success state with routing-specific content
   if (step === 'success' && result) {
     return (
@@ -7,6 +7,7 @@ export * from './types';
 // Utilities
 export * from './utils/emailValidation';
 export * from './utils/gateLogic';
+export * from './utils/analysisPolling';
 
 // Individual components (if needed for customization)
 export { default as ProgressIndicator } from './components/ProgressIndicator';
@@ -115,6 +115,20 @@ export interface IntakeResponse {
   ai_session_id?: string;
   provisional_gate_status?: GateStatus;
   first_question?: AIQuestion;
+  // Async analysis mode: routing is provisional until analysis completes
+  analysis_pending?: boolean;
+}
+
+// Background analysis result (GET /api/intake/analysis/{inquiry_id})
+export interface AnalysisStatusResponse {
+  inquiry_id: string;
+  status: 'pending' | 'complete' | 'failed';
+  needs_clarification: boolean;
+  ai_session_id?: string;
+  first_question?: AIQuestion;
+  gate_status?: GateStatus;
+  routing_result?: RoutingResult;
+  message?: string;
 }
 
 // Gate evaluation result (client-side preview)
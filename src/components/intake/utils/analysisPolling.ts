@@ -0,0 +1,79 @@
+/**
+ * Polling for background AI analysis results.
+ * In async analysis mode POST /api/intake returns a provisional routing with
+ * analysis_pending=true; the result is served by
+ * GET /api/intake/analysis/{inquiry_id} (backend/app/routers/ai_clarify.py).
+ */
+
+import { AnalysisStatusResponse, IntakeResponse } from '../types';
+
+interface PollOptions {
+  intervalMs?: number;
+  timeoutMs?: number;
+}
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+/**
+ * Poll until the analysis completes or fails.
+ * Returns null on timeout; the provisional routing then stands.
+ */
+export async function pollAnalysis(
+  apiUrl: string,
+  inquiryId: string,
+  { intervalMs = 1000, timeoutMs = 20000 }: PollOptions = {}
+): Promise<AnalysisStatusResponse | null> {
+  const deadline = Date.now() + timeoutMs;
+
+  while (Date.now() < deadline) {
+    try {
+      const response = await fetch(`${apiUrl}/api/intake/analysis/${inquiryId}`);
+      // 404: another server is still analyzing (its result appears once recorded)
+      if (response.ok) {
+        const analysis: AnalysisStatusResponse = await response.json();
+        if (analysis.status !== 'pending') {
+          return analysis;
+        }
+      } else if (response.status !== 404) {
+        return null;
+      }
+    } catch (e) {
+      console.warn('Analysis poll failed:', e);
+    }
+    await sleep(intervalMs);
+  }
+  return null;
+}
+
+/** Fields of an intake response that a finished analysis can update. */
+type AnalysisTarget = Pick<
+  IntakeResponse,
+  'needs_clarification' | 'ai_session_id' | 'first_question' | 'analysis_pending'
+> & {
+  gate_status: string;
+  routing_result: string;
+  message: string;
+};
+
+/**
+ * Merge a finished analysis into the provisional intake response.
+ * A failed or timed-out analysis keeps the provisional routing.
+ */
+export function applyAnalysis<T extends AnalysisTarget>(
+  response: T,
+  analysis: AnalysisStatusResponse | null
+): T {
+  if (!analysis || analysis.status !== 'complete') {
+    return { ...response, analysis_pending: false };
+  }
+  return {
+    ...response,
+    analysis_pending: false,
+    needs_clarification: analysis.needs_clarification,
+    ai_session_id: analysis.ai_session_id,
+    first_question: analysis.first_question,
+    gate_status: (analysis.gate_status ?? response.gate_status) as T['gate_status'],
+    routing_result: (analysis.routing_result ?? response.routing_result) as T['routing_result'],
+    message: analysis.message ?? response.message,
+  };
+}